@@ -0,0 +1,30 @@
+from fastapi import APIRouter, status
+
+from app.core.serialization import dumps, json_response
+from app.core.warmup import readiness
+
+
+router = APIRouter(prefix="/health", tags=["health"], include_in_schema=False)
+
+
+@router.get("/live")
+async def live():
+    """
+    Liveness probe: the process is up and its event loop answers.
+    """
+
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready():
+    """
+    Readiness probe: 200 once the warm-up has completed, 503 before, with the
+    duration of every finished warm-up phase in milliseconds. Readiness is kept
+    per worker, so while workers are warming up the answer depends on which
+    worker accepted the request.
+    """
+
+    state = readiness()
+    return json_response(dumps(state),
+                         status_code=status.HTTP_200_OK if state["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE)
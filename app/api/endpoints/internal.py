@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+
+from app.core.response_cache import get_response_cache
+from app.db import database
+from app.db.pool_stats import get_pool_stats
+
+
+router = APIRouter(prefix="/internal", tags=["internal"], include_in_schema=False)
+
+
+@router.get("/stats")
+async def get_stats():
+    """
+    Return runtime counters of the in-process caches, the database connection pools
+    and the read replica routing.
+    """
+
+    return {
+        "responseCache": get_response_cache().stats(),
+        "pools": get_pool_stats(),
+        "replicas": database.async_replica_router.stats()
+    }
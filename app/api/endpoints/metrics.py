@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import render_metrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter(tags=["internal"], include_in_schema=False)
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Expose request, database, cache and snapshot metrics in the Prometheus text format.
+    """
+
+    return Response(content=render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
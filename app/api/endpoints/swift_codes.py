@@ -1,162 +1,832 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, not_
-from typing import List, Dict, Any
-
-from app.db.database import get_db
-from app.models.swift_code import SwiftCodeModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, select
+from typing import List, Dict, Any, Literal, Optional
+
+from app.core.conditional import (RECORD_VERSION_HEADER, conditional_headers, etag_matches, invalidate_versions,
+                                  is_not_modified, not_modified_response, record_version)
+from app.core.config import get_settings
+from app.core.json_stream import is_ndjson, iter_json_array, iter_ndjson
+from app.core.response_cache import (bank_key, cached_response, country_key, get_response_cache,
+                                     invalidation_keys, representation_headers)
+from app.core.search_index import apply_search_index_changes, refresh_search_index
+from app.core.serialization import (country_json, dumps, json_response, lookup_json, search_json, serialize_branch,
+                                    serialize_swift_code, swift_code_json, text_search_json)
+from app.core.snapshot import apply_snapshot_changes, refresh_snapshot
+from app.core.text_index import apply_text_index_changes, refresh_text_index
+from app.db.bulk_load import upsert
+from app.db.database import get_async_db, get_async_read_db
+from app.db.dataset_versions import bump_versions_async, record_scopes
+from app.db.delta_sync import HASHED_COLUMNS
+from app.models.swift_code import SwiftCodeModel, swift_codes
 from app.schemes.MessageResponse import MessageResponse
 from app.schemes.SwiftCodeBase import SwiftCodeBase
 from app.schemes.SwiftCodeBranch import SwiftCodeBranch
+from app.schemes.SwiftCodeBulkResponse import SwiftCodeBulkResponse
 from app.schemes.SwiftCodeCreate import SwiftCodeCreate
+from app.schemes.SwiftCodeDeleteRequest import SwiftCodeDeleteRequest
+from app.schemes.SwiftCodeDeleteResponse import SwiftCodeDeleteResponse
+from app.schemes.SwiftCodeLookupRequest import SwiftCodeLookupRequest
+from app.schemes.SwiftCodeLookupResponse import SwiftCodeLookupResponse
 from app.schemes.SwiftCodeResponse import SwiftCodeResponse
+from app.schemes.SwiftCodeSearchResponse import SwiftCodeSearchResponse
 from app.schemes.SwiftCodesByCountryResponse import SwiftCodesByCountryResponse
+from app.schemes.SwiftCodeTextSearchResponse import SwiftCodeTextSearchResponse
 from app.schemes.SwiftCodeWithBranches import SwiftCodeWithBranches
+from custom_exceptions.MalformedBodyError import MalformedBodyError
 
 
 router = APIRouter(prefix="/v1/swift-codes", tags=["swift-codes"])
 
 
+def _model_to_record(model: SwiftCodeModel) -> Dict[str, Any]:
+    """
+    Convert an ORM row into the plain record format used by the read snapshot.
+    """
+
+    return {
+        "swift_code": model.swift_code,
+        "address": model.address,
+        "bank_name": model.bank_name,
+        "country_ISO2": model.country_ISO2,
+        "country_name": model.country_name,
+        "is_headquarter": model.is_headquarter
+    }
+
+
+def _create_to_record(swift_code_record: SwiftCodeCreate) -> Dict[str, Any]:
+    """
+    Convert a validated create request into the plain record format.
+    """
+
+    return {
+        "swift_code": swift_code_record.swiftCode,
+        "address": swift_code_record.address,
+        "bank_name": swift_code_record.bankName,
+        "country_ISO2": swift_code_record.countryISO2,
+        "country_name": swift_code_record.countryName,
+        "is_headquarter": swift_code_record.isHeadquarter
+    }
+
+
+def _publish_changes(upserted: List[Dict[str, Any]] = (), deleted: List[Dict[str, Any]] = ()):
+    """
+    Bring the in-process read paths up to date after a write has committed:
+    the cached dataset versions, the response cache, the read snapshot, the
+    search index and the text index.
+    """
+
+    deleted_codes = [record["swift_code"] for record in deleted]
+    scopes = record_scopes([*upserted, *deleted])
+
+    invalidate_versions()
+    get_response_cache().invalidate(invalidation_keys([*upserted, *deleted]))
+    apply_snapshot_changes(upserted=upserted, deleted=deleted_codes, scopes=scopes)
+    apply_search_index_changes(upserted=upserted, deleted=deleted_codes, scopes=scopes)
+    apply_text_index_changes(upserted=upserted, deleted=deleted_codes, scopes=scopes)
+
+
+async def _fetch_swift_code_with_branches(db: AsyncSession, swift_code: str):
+    """
+    Fetch a SWIFT code record and, for headquarters, its branch records.
+
+    Codes ending with 'XXX' are fetched together with their whole bank in one
+    equality query on the indexed bank prefix. Other codes are fetched by primary
+    key and only go back for branches when the row is flagged as a headquarter.
+
+    Returns:
+        tuple: The record (or None) and the list of branch records.
+    """
+
+    swift_base = swift_code[:8]
+    bank_query = select(SwiftCodeModel).where(
+        SwiftCodeModel.bank_prefix == swift_base).order_by(SwiftCodeModel.swift_code)
+
+    if len(swift_code) == 11 and swift_code.endswith("XXX"):
+        bank = [_model_to_record(model)
+                for model in (await db.execute(bank_query)).scalars().all()]
+        result = next(
+            (record for record in bank if record["swift_code"] == swift_code), None)
+    else:
+        model = (await db.execute(select(SwiftCodeModel).where(
+            SwiftCodeModel.swift_code == swift_code))).scalars().first()
+        result = _model_to_record(model) if model else None
+        bank = None
+
+    if not result or not result["is_headquarter"]:
+        return result, []
+
+    if bank is None:
+        bank = [_model_to_record(model)
+                for model in (await db.execute(bank_query)).scalars().all()]
+
+    branches = [record for record in bank
+                if record["swift_code"] != swift_code and record["swift_code"] != f"{swift_base}XXX"]
+
+    return result, branches
+
+
+COUNTRY_COLUMNS = (SwiftCodeModel.address, SwiftCodeModel.bank_name, SwiftCodeModel.country_ISO2,
+                   SwiftCodeModel.country_name, SwiftCodeModel.is_headquarter, SwiftCodeModel.swift_code)
+
+
+# Registered before /{swift_code}, which would otherwise take "search" for a SWIFT code.
+@router.get("/search", response_model=SwiftCodeSearchResponse)
+async def search_swift_codes(
+        prefix: str = Query(..., min_length=1, max_length=11),
+        limit: int = Query(10, ge=1, le=get_settings().SEARCH_MAX_LIMIT),
+        country: Optional[str] = Query(None, min_length=2, max_length=2),
+        headquarter: Optional[bool] = None,
+        db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Return the SWIFT codes starting with a prefix, in code order, for autocompletion.
+
+    At most `limit` codes are returned. `country` keeps the codes of one country and
+    `headquarter` only headquarters (true) or only branches (false). Searches are
+    answered from the in-memory search index when it is enabled, and otherwise with
+    a prefix query on the primary key.
+    """
+
+    prefix = prefix.strip().upper()
+    country = country.strip().upper() if country else None
+    index = await refresh_search_index(db)
+
+    if index is not None:
+        results = index.search(prefix, limit, country, headquarter)
+    else:
+        query = select(*COUNTRY_COLUMNS).where(SwiftCodeModel.swift_code.startswith(prefix, autoescape=True))
+        if country:
+            query = query.where(SwiftCodeModel.country_ISO2 == country)
+        if headquarter is not None:
+            query = query.where(SwiftCodeModel.is_headquarter == headquarter)
+        results = (await db.execute(query.order_by(SwiftCodeModel.swift_code).limit(limit))).mappings().all()
+
+    return json_response(search_json(prefix, results))
+
+
+# Response field -> record field searched by /search/text.
+TEXT_SEARCH_FIELDS = {"bankName": "bank_name", "address": "address"}
+
+
+@router.get("/search/text", response_model=SwiftCodeTextSearchResponse)
+async def search_swift_codes_by_text(
+        q: str = Query(..., min_length=1, max_length=200),
+        limit: int = Query(10, ge=1, le=get_settings().TEXT_SEARCH_MAX_LIMIT),
+        field: Optional[Literal["bankName", "address"]] = None,
+        db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Return the SWIFT codes whose bank name or address best matches a free-text query.
+
+    Words are matched regardless of case and tolerate typos; results are ranked by
+    a score from 0 to 1, where 1 means every query word was found as is. `field`
+    restricts the search to the bank name or the address. Searches are answered from
+    the in-memory text index, which is first brought up to date with writes made by
+    other processes.
+
+    Raises:
+        HTTPException: 503 if the text index is disabled.
+    """
+
+    index = await refresh_text_index(db)
+    if index is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail="Text search is disabled.")
+
+    fields = (TEXT_SEARCH_FIELDS[field],) if field else tuple(TEXT_SEARCH_FIELDS.values())
+    return json_response(text_search_json(q, index.search(q, limit, fields)))
+
+
 @router.get("/{swift_code}", response_model=SwiftCodeResponse | SwiftCodeWithBranches)
-async def get_swift_code_by_id(swift_code: str, db: Session = Depends(get_db)):
+async def get_swift_code_by_id(swift_code: str, request: Request, db: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve details of a single SWIFT code.
-    If the SWIFT code is for a headquarter, it will include branch infromation
+    If the SWIFT code is for a headquarter, it will include branch infromation.
+    When the read snapshot is enabled the lookup is served from memory.
+
+    The response carries an ETag derived from the version of the code's country;
+    a matching If-None-Match returns 304 Not Modified without reading any rows.
+    Headquarter responses are kept in the response cache, keyed by bank prefix.
+    The version of the code itself, for If-Match on PUT, is sent in X-Record-Version.
+    Codes are matched regardless of case, as by the table's collation.
     """
 
-    result = db.query(SwiftCodeModel).filter(
-        SwiftCodeModel.swift_code == swift_code).first()
+    swift_code = swift_code.strip().upper()
+    cache = get_response_cache()
+    cacheable = len(swift_code) == 11 and swift_code.endswith("XXX")
+
+    headers = await conditional_headers(db, swift_code[4:6])
+    if is_not_modified(request, headers):
+        return not_modified_response(representation_headers(request, headers, cacheable and cache.compressed))
+
+    if cacheable:
+        entry = cache.get(bank_key(swift_code), headers["ETag"])
+        if entry is not None:
+            return cached_response(request, entry, headers)
+
+    snapshot = await refresh_snapshot(db)
+
+    if snapshot is not None:
+        result = snapshot.get(swift_code)
+        branches = snapshot.branches(
+            swift_code) if result and result["is_headquarter"] else []
+    else:
+        result, branches = await _fetch_swift_code_with_branches(db, swift_code)
 
     if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="No data found.")
 
-    response_dict = {
-        "address": result.address,
-        "bankName": result.bank_name,
-        "countryISO2": result.country_ISO2,
-        "countryName": result.country_name,
-        "isHeadquarter": result.is_headquarter,
-        "swiftCode": result.swift_code
-    }
+    body = swift_code_json(result, branches)
+    body_headers = {RECORD_VERSION_HEADER: record_version(result)}
+    if cacheable and result["is_headquarter"]:
+        return cached_response(request, cache.set(bank_key(swift_code), body, headers["ETag"], body_headers), headers)
 
-    if result.is_headquarter:
-        response_dict["branches"] = []
-        swift_base = result.swift_code[:8]
-        branches = db.query(SwiftCodeModel).filter(
-            and_(
-                SwiftCodeModel.swift_code.like(f"{swift_base}%"),
-                SwiftCodeModel.swift_code != result.swift_code,
-                not_(SwiftCodeModel.swift_code.like(f"{swift_base}XXX"))
-            )
-        ).all()
-
-        for branch in branches:
-            branch_data = {
-                "address": branch.address,
-                "bankName": branch.bank_name,
-                "countryISO2": branch.country_ISO2,
-                "isHeadquarter": branch.is_headquarter,
-                "swiftCode": branch.swift_code
-            }
-            response_dict["branches"].append(branch_data)
+    return json_response(body, headers={**headers, **body_headers})
 
-        return SwiftCodeWithBranches(**response_dict)
-    else:
-        return SwiftCodeResponse(**response_dict)
+
+STREAM_BATCH_SIZE = 1000
+
+
+def _country_query(country_code: str, cursor: Optional[str], limit: Optional[int]):
+    """
+    Build the keyset query listing a country's SWIFT codes in SWIFT code order,
+    served by the (country_ISO2, swift_code) index.
+    """
+
+    query = select(*COUNTRY_COLUMNS).where(
+        SwiftCodeModel.country_ISO2 == country_code)
+
+    if cursor:
+        query = query.where(SwiftCodeModel.swift_code > cursor)
+
+    query = query.order_by(SwiftCodeModel.swift_code)
+
+    if limit is not None:
+        query = query.limit(limit)
+
+    return query
+
+
+async def _stream_country(bind, country_code: str, country_name: str, cursor: Optional[str], limit: Optional[int]):
+    """
+    Write the country listing as a JSON document, one batch of rows at a time,
+    reading from a server-side cursor on a connection of its own.
+    """
+
+    yield b'{"countryISO2":' + dumps(country_code) + b',"countryName":' + dumps(country_name) + b',"swiftCodes":['
+
+    separator = b""
+    async with bind.connect() as conn:
+        result = await conn.stream(_country_query(country_code, cursor, limit).execution_options(
+            yield_per=STREAM_BATCH_SIZE))
+
+        async for rows in result.mappings().partitions(STREAM_BATCH_SIZE):
+            yield separator + dumps([serialize_branch(row) for row in rows])[1:-1]
+            separator = b","
+
+    yield b"]}"
 
 
 @router.get("/country/{countryISO2code}", response_model=SwiftCodesByCountryResponse)
-async def get_swift_codes_by_country_iso2_code(countryISO2code: str, db: Session = Depends(get_db)):
+async def get_swift_codes_by_country_iso2_code(
+        countryISO2code: str,
+        request: Request,
+        limit: Optional[int] = Query(
+            None, ge=1, le=get_settings().COUNTRY_MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        stream: bool = False,
+        db: AsyncSession = Depends(get_async_read_db)):
     """
     Return all SWIFT codes with details for a specific country (both headquarters and branches)
+
+    SWIFT codes are ordered by code. With `limit`, at most that many codes are returned and
+    the `X-Next-Cursor` header carries the cursor for the next page; pass it back as `cursor`.
+    With `stream=true`, the JSON document is written incrementally as rows are read.
+    Responses carry an ETag derived from the country's version; a matching
+    If-None-Match returns 304 Not Modified without reading any rows.
+    The full listing (no `limit`, `cursor` or `stream`) is kept in the response cache.
     """
 
     countryISO2code = countryISO2code.strip().upper()
 
-    results = db.query(SwiftCodeModel).filter(
-        SwiftCodeModel.country_ISO2 == countryISO2code).all()
+    cache = get_response_cache()
+    cacheable = not (limit or cursor or stream)
+
+    headers = await conditional_headers(db, countryISO2code)
+    if is_not_modified(request, headers):
+        return not_modified_response(representation_headers(request, headers, cacheable and cache.compressed))
 
-    if not results:
+    if cacheable:
+        entry = cache.get(country_key(countryISO2code), headers["ETag"])
+        if entry is not None:
+            return cached_response(request, entry, headers)
+
+    if stream:
+        country_name = (await db.execute(select(SwiftCodeModel.country_name).where(
+            SwiftCodeModel.country_ISO2 == countryISO2code).limit(1))).scalar()
+
+        if country_name is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                detail="No data found for the specified country code.")
+
+        return StreamingResponse(_stream_country(db.bind, countryISO2code, country_name, cursor, limit),
+                                 media_type="application/json", headers=headers)
+
+    results = (await db.execute(_country_query(
+        countryISO2code, cursor, limit + 1 if limit else None))).mappings().all()
+
+    if limit and len(results) > limit:
+        results = results[:limit]
+        headers["X-Next-Cursor"] = results[-1]["swift_code"]
+
+    if results:
+        country_name = results[0]["country_name"]
+    elif cursor:
+        country_name = (await db.execute(select(SwiftCodeModel.country_name).where(
+            SwiftCodeModel.country_ISO2 == countryISO2code).limit(1))).scalar()
+    else:
+        country_name = None
+
+    if country_name is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail="No data found for the specified country code.")
 
-    country_name = results[0].country_name if results else ""
+    body = country_json(countryISO2code, country_name, results)
+    if cacheable:
+        return cached_response(request, cache.set(country_key(countryISO2code), body, headers["ETag"]), headers)
+
+    return json_response(body, headers=headers)
 
-    swift_codes_list = []
-    for result in results:
-        swift_code_data = {
-            "address": result.address,
-            "bankName": result.bank_name,
-            "countryISO2": result.country_ISO2,
-            "isHeadquarter": result.is_headquarter,
-            "swiftCode": result.swift_code
-        }
-        swift_codes_list.append(swift_code_data)
 
-    response = {
-        "countryISO2": countryISO2code,
-        "countryName": country_name,
-        "swiftCodes": swift_codes_list
+async def _fetch_swift_codes(db: AsyncSession, swift_code_list: List[str], include_branches: bool):
+    """
+    Fetch many SWIFT code records with chunked `IN (...)` queries and, if requested,
+    the branches of every headquarter among them with one more query per chunk of bank prefixes.
+
+    Returns:
+        tuple: Records keyed by SWIFT code and branch records grouped by bank prefix.
+    """
+
+    chunk_size = get_settings().LOOKUP_CHUNK_SIZE
+    records: Dict[str, Dict[str, Any]] = {}
+
+    for start in range(0, len(swift_code_list), chunk_size):
+        chunk = swift_code_list[start:start + chunk_size]
+        models = (await db.execute(select(SwiftCodeModel).where(
+            SwiftCodeModel.swift_code.in_(chunk)))).scalars().all()
+        records.update((model.swift_code, _model_to_record(model))
+                       for model in models)
+
+    banks: Dict[str, List[Dict[str, Any]]] = {}
+    if include_branches:
+        prefixes = sorted({record["swift_code"][:8]
+                           for record in records.values() if record["is_headquarter"]})
+
+        for start in range(0, len(prefixes), chunk_size):
+            chunk = prefixes[start:start + chunk_size]
+            models = (await db.execute(select(SwiftCodeModel).where(
+                SwiftCodeModel.bank_prefix.in_(chunk)).order_by(SwiftCodeModel.swift_code))).scalars().all()
+            for model in models:
+                banks.setdefault(model.swift_code[:8], []).append(
+                    _model_to_record(model))
+
+    return records, banks
+
+
+@router.post("/lookup", response_model=SwiftCodeLookupResponse)
+async def lookup_swift_codes(lookup_request: SwiftCodeLookupRequest, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Look up many SWIFT codes in one request.
+    Returns the found records keyed by SWIFT code and the list of codes that were not found.
+    Headquarters include their branches when includeBranches is set.
+    """
+
+    swift_code_list = lookup_request.swiftCodes
+    snapshot = await refresh_snapshot(db)
+
+    found = {}
+    missing = []
+
+    if snapshot is not None:
+        for swift_code in swift_code_list:
+            record = snapshot.get(swift_code)
+            if record is None:
+                missing.append(swift_code)
+            elif lookup_request.includeBranches and record["is_headquarter"]:
+                found[swift_code] = serialize_swift_code(
+                    record, snapshot.branches(swift_code))
+            else:
+                found[swift_code] = serialize_swift_code(record)
+
+        return json_response(lookup_json(found, missing))
+
+    records, banks = await _fetch_swift_codes(
+        db, swift_code_list, lookup_request.includeBranches)
+
+    for swift_code in swift_code_list:
+        record = records.get(swift_code)
+        if record is None:
+            missing.append(swift_code)
+        elif lookup_request.includeBranches and record["is_headquarter"]:
+            swift_base = swift_code[:8]
+            branches = [branch for branch in banks.get(swift_base, [])
+                        if branch["swift_code"] != swift_code and branch["swift_code"] != f"{swift_base}XXX"]
+            found[swift_code] = serialize_swift_code(record, branches)
+        else:
+            found[swift_code] = serialize_swift_code(record)
+
+    return json_response(lookup_json(found, missing))
+
+
+BULK_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {"type": "array", "items": {"$ref": "#/components/schemas/SwiftCodeCreate"}}
+            },
+            "application/x-ndjson": {
+                "schema": {"type": "string", "description": "One SwiftCodeCreate object per line"}
+            }
+        }
     }
+}
+BULK_INSERT_ATTEMPTS = 3
+
 
-    return SwiftCodesByCountryResponse(**response)
+async def _create_batch(db: AsyncSession, batch: List[tuple]) -> List[Dict[str, Any]]:
+    """
+    Insert a batch of validated records in one transaction with a multi-row INSERT.
+
+    Codes that already exist are reported as conflicts. If a concurrent writer
+    inserts one of the codes between the existence check and the INSERT, the
+    transaction is rolled back and the batch is checked again.
+
+    Returns:
+        List[Dict[str, Any]]: The per-row results of the batch.
+    """
+
+    codes = [record["swift_code"] for _, record in batch]
+
+    for attempt in range(1, BULK_INSERT_ATTEMPTS + 1):
+        existing = {code.upper() for code in (await db.execute(select(SwiftCodeModel.swift_code).where(
+            SwiftCodeModel.swift_code.in_(codes)))).scalars()}
+        new_records = [record for _, record in batch
+                       if record["swift_code"].upper() not in existing]
+
+        try:
+            if new_records:
+                await db.execute(insert(swift_codes), new_records)
+                await bump_versions_async(db, record_scopes(new_records))
+            await db.commit()
+            break
+        except IntegrityError:
+            await db.rollback()
+            if attempt == BULK_INSERT_ATTEMPTS:
+                raise
+
+    _publish_changes(upserted=new_records)
+
+    return [{"index": index, "swiftCode": record["swift_code"],
+             "status": "conflict" if record["swift_code"].upper() in existing else "created"}
+            for index, record in batch]
+
+
+def _validate_bulk_row(index: int, value: Any, error: Optional[str], seen: set):
+    """
+    Validate one row of a bulk create request against the SwiftCodeCreate rules.
+
+    Returns:
+        tuple: (result, None) for an invalid or repeated row, (None, record) for a row to insert.
+    """
+
+    swift_code = value.get("swiftCode") if isinstance(value, dict) else None
+
+    if error is None:
+        try:
+            record = _create_to_record(SwiftCodeCreate.model_validate(value))
+        except ValidationError as e:
+            error = [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" if err["loc"] else err["msg"]
+                     for err in e.errors()]
+        else:
+            if record["swift_code"].upper() in seen:
+                return {"index": index, "swiftCode": record["swift_code"], "status": "conflict"}, None
+            seen.add(record["swift_code"].upper())
+            return None, record
+
+    return {"index": index, "swiftCode": swift_code, "status": "invalid",
+            "errors": error if isinstance(error, list) else [error]}, None
+
+
+@router.post("/bulk", response_model=SwiftCodeBulkResponse, openapi_extra=BULK_REQUEST_BODY)
+async def bulk_create_swift_code_records(request: Request, response: Response,
+                                         db: AsyncSession = Depends(get_async_db)):
+    """
+    Adds many SWIFT code entries in one request.
+
+    The body is either a JSON array or, with `Content-Type: application/x-ndjson`, one JSON
+    object per line. It is read as it arrives; rows are validated with the same rules as
+    single creates and inserted in transactions of BULK_TRANSACTION_SIZE rows. The response
+    reports every row as created, conflict (the code already exists or appears earlier in
+    the body) or invalid, with the validation errors. Reading stops at BULK_MAX_ROWS rows,
+    or at a row longer than BULK_MAX_ELEMENT_SIZE, with a single invalid result for the
+    rest of the body.
+
+    Batches are committed one by one, so if a batch fails the earlier ones stay created:
+    the response is then 500, with the results collected so far and the rows of the
+    failed batch reported as failed.
+    """
+
+    settings = get_settings()
+    chunks = request.stream()
+    parse = iter_ndjson if is_ndjson(request.headers.get("content-type")) else iter_json_array
+    rows = parse(chunks, max_element_size=settings.BULK_MAX_ELEMENT_SIZE)
+
+    results: List[Dict[str, Any]] = []
+    batch: List[tuple] = []
+    seen = set()
+    index = 0
+    failure = None
+
+    try:
+        try:
+            async for value, error in rows:
+                if index >= settings.BULK_MAX_ROWS:
+                    results.append({"index": index, "swiftCode": None, "status": "invalid", "errors": [
+                        f"At most {settings.BULK_MAX_ROWS} rows can be created in one request; "
+                        "the rest of the body was not read"]})
+                    break
+
+                result, record = _validate_bulk_row(index, value, error, seen)
+                if record is not None:
+                    batch.append((index, record))
+                else:
+                    results.append(result)
+
+                index += 1
+
+                if len(batch) >= settings.BULK_TRANSACTION_SIZE:
+                    results.extend(await _create_batch(db, batch))
+                    batch = []
+        except MalformedBodyError as e:
+            results.append({"index": index, "swiftCode": None,
+                            "status": "invalid", "errors": [e.message]})
+        finally:
+            await rows.aclose()
+
+        if batch:
+            results.extend(await _create_batch(db, batch))
+    except Exception as e:
+        await db.rollback()
+        failure = f"Database error occured: {str(e)}"
+        results.extend({"index": row_index, "swiftCode": record["swift_code"], "status": "failed",
+                        "errors": [failure]} for row_index, record in batch)
+
+    results.sort(key=lambda result: result["index"])
+    counts = {status_name: 0 for status_name in ("created", "conflict", "invalid", "failed")}
+    for result in results:
+        counts[result["status"]] += 1
+
+    bulk_response = json_response(dumps({"created": counts["created"], "conflicts": counts["conflict"],
+                                         "invalid": counts["invalid"], "failed": counts["failed"],
+                                         "results": results}),
+                                  status_code=status.HTTP_500_INTERNAL_SERVER_ERROR if failure else status.HTTP_200_OK)
+    # Returned as is, so the read-your-writes cookie set by get_async_db is copied over.
+    bulk_response.headers.raw.extend(response.headers.raw)
+    return bulk_response
 
 
 @router.post("", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
-async def create_swift_code_record(swift_code_record: SwiftCodeCreate, db: Session = Depends(get_db)):
+async def create_swift_code_record(swift_code_record: SwiftCodeCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Adds new SWIFT code entries to the database.
+    An existing SWIFT code is detected by the primary key conflict of the INSERT.
     """
 
-    existing_record = db.query(SwiftCodeModel).filter(
-        SwiftCodeModel.swift_code == swift_code_record.swiftCode).first()
+    record = _create_to_record(swift_code_record)
 
-    if existing_record:
+    try:
+        await db.execute(insert(swift_codes).values(record))
+        await bump_versions_async(db, record_scopes([record]))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_409_CONFLICT,
                             detail="SWIFT code already exists in the database")
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Database error occured: {str(e)}")
+
+    _publish_changes(upserted=[record])
+
+    return MessageResponse(message="SWIFT code record created successfully.")
+
+
+async def _check_if_match(db: AsyncSession, if_match: str, swift_code: str) -> bool:
+    """
+    Evaluate an If-Match header for a write to a SWIFT code, locking the row it was
+    checked against until the transaction ends.
+
+    `*` requires the SWIFT code to exist; otherwise one of the listed tags must equal
+    the current version of the code (as sent by GET in X-Record-Version). Writes to
+    other codes of the same country do not change it.
+    """
+
+    row = (await db.execute(select(*[swift_codes.c[column] for column in HASHED_COLUMNS]).where(
+        swift_codes.c.swift_code == swift_code).with_for_update())).mappings().first()
+
+    if row is None:
+        return False
+    return if_match.strip() == "*" or etag_matches(if_match, record_version(row), weak=False)
+
+
+@router.put("/{swift_code}", response_model=MessageResponse)
+async def upsert_swift_code_record(swift_code: str, swift_code_record: SwiftCodeCreate, request: Request,
+                                   response: Response, db: AsyncSession = Depends(get_async_db)):
+    """
+    Creates or replaces a SWIFT code entry with a single upsert statement.
+
+    With an `If-Match` header, the write only happens if the version of the code
+    (X-Record-Version, as returned by GET) is still current; otherwise 412 Precondition
+    Failed is returned. The new version is sent back in X-Record-Version.
+    """
+
+    if swift_code.strip().upper() != swift_code_record.swiftCode.upper():
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                            detail="SWIFT code in the path must match the request body")
+
+    record = _create_to_record(swift_code_record)
+    if_match = request.headers.get("if-match")
+
+    try:
+        if if_match is not None and not await _check_if_match(db, if_match, record["swift_code"]):
+            raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED,
+                                detail="SWIFT code was modified since the given ETag")
+
+        await db.execute(upsert(db.bind.dialect.name, record))
+        await bump_versions_async(db, record_scopes([record]))
+        await db.commit()
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Database error occured: {str(e)}")
+
+    _publish_changes(upserted=[record])
+    response.headers[RECORD_VERSION_HEADER] = record_version(record)
+
+    return MessageResponse(message="SWIFT code record saved successfully.")
+
+
+DELETED_COLUMNS = (swift_codes.c.swift_code, swift_codes.c.country_ISO2, swift_codes.c.is_headquarter)
+
+
+async def _lock_rows(db: AsyncSession, condition) -> List[Dict[str, Any]]:
+    """
+    Read and lock every row matching a condition, only as far as needed to report
+    them and to know which countries and banks deleting them touches.
+
+    Returns:
+        List[Dict[str, Any]]: SWIFT code, country and headquarter flag of the rows.
+    """
+
+    rows = (await db.execute(select(*DELETED_COLUMNS).where(condition).with_for_update())).mappings().all()
+
+    return [dict(row) for row in rows]
+
+
+async def _delete_rows(db: AsyncSession, condition) -> List[Dict[str, Any]]:
+    """
+    Delete every row matching a condition with one set-based DELETE, after
+    locking them with _lock_rows.
+
+    Returns:
+        List[Dict[str, Any]]: SWIFT code, country and headquarter flag of the deleted rows.
+    """
+
+    rows = await _lock_rows(db, condition)
+
+    if rows:
+        await db.execute(delete(swift_codes).where(condition))
+
+    return rows
+
+
+async def _commit_deletes(db: AsyncSession, deleted: List[Dict[str, Any]]):
+    """
+    Bump the dataset versions of the deleted rows, commit, and refresh the
+    in-process read paths once for the whole batch.
+    """
+
+    if deleted:
+        await bump_versions_async(db, record_scopes(deleted))
+    await db.commit()
+
+    if deleted:
+        _publish_changes(deleted=deleted)
+
+
+@router.post("/delete", response_model=SwiftCodeDeleteResponse)
+async def delete_swift_codes(delete_request: SwiftCodeDeleteRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Deletes a list of SWIFT codes in one transaction, with one DELETE statement per
+    LOOKUP_CHUNK_SIZE codes. Codes that do not exist are reported as missing.
+    """
+
+    swift_code_list = delete_request.swiftCodes
+    chunk_size = get_settings().LOOKUP_CHUNK_SIZE
 
     try:
-        new_record = SwiftCodeModel(
-            swift_code=swift_code_record.swiftCode,
-            address=swift_code_record.address,
-            bank_name=swift_code_record.bankName,
-            country_ISO2=swift_code_record.countryISO2,
-            country_name=swift_code_record.countryName,
-            is_headquarter=swift_code_record.isHeadquarter
-        )
-
-        db.add(new_record)
-        db.commit()
-
-        return MessageResponse(message="SWIFT code record created successfully.")
+        deleted = []
+        for start in range(0, len(swift_code_list), chunk_size):
+            deleted.extend(await _delete_rows(db, swift_codes.c.swift_code.in_(
+                swift_code_list[start:start + chunk_size])))
+
+        await _commit_deletes(db, deleted)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail=f"Database error occured: {str(e)}")
 
+    deleted_codes = {row["swift_code"].upper() for row in deleted}
+
+    return SwiftCodeDeleteResponse(
+        deleted=len(deleted),
+        swiftCodes=sorted(row["swift_code"] for row in deleted),
+        missing=[code for code in swift_code_list if code not in deleted_codes])
+
+
+@router.delete("/bank/{bank_prefix}", response_model=SwiftCodeDeleteResponse)
+async def delete_bank(bank_prefix: str, cascade: bool = False, db: AsyncSession = Depends(get_async_db)):
+    """
+    Deletes a whole bank, identified by the first 8 characters of its SWIFT codes.
+
+    Without `cascade`, only a bank without branches can be deleted; a bank that still
+    has branches is rejected with 409 Conflict. With `cascade=true`, the headquarter
+    and all branches are deleted in one statement.
+    """
+
+    bank_prefix = bank_prefix.strip().upper()[:8]
+    if len(bank_prefix) != 8:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                            detail="Bank prefix must be the first 8 characters of a SWIFT code.")
+
+    condition = swift_codes.c.bank_prefix == bank_prefix
+
+    try:
+        # The rows are only locked until the checks pass, so that a rejected
+        # request does not delete (and then roll back) the whole bank.
+        deleted = await _lock_rows(db, condition)
+
+        if not deleted:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                detail="No SWIFT codes found for the bank.")
+
+        branch_count = sum(1 for row in deleted if not row["is_headquarter"])
+        if branch_count and not cascade:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT,
+                                detail=f"Bank has {branch_count} branches; pass cascade=true to delete them too.")
+
+        await db.execute(delete(swift_codes).where(condition))
+        await _commit_deletes(db, deleted)
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Database error occured: {str(e)}")
+
+    return SwiftCodeDeleteResponse(deleted=len(deleted),
+                                   swiftCodes=sorted(row["swift_code"] for row in deleted))
+
 
 @router.delete("/{swift_code}", response_model=MessageResponse)
-async def delete_swift_code(swift_code: str, db: Session = Depends(get_db)):
+async def delete_swift_code(swift_code: str, db: AsyncSession = Depends(get_async_db)):
     """
     Deletes a SWIFT code record frmo the database.
     """
 
     try:
-        existsing_record = db.query(SwiftCodeModel).filter(
-            SwiftCodeModel.swift_code == swift_code).first()
+        deleted = await _delete_rows(db, swift_codes.c.swift_code == swift_code)
 
-        if not existsing_record:
+        if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="SWIFT code not found.")
 
-        db.delete(existsing_record)
-        db.commit()
+        await _commit_deletes(db, deleted)
 
         return MessageResponse(message="SWIFT code record deleted successfully")
     except HTTPException:
+        await db.rollback()
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail=f"Database error occured: {str(e)}")
@@ -0,0 +1,257 @@
+import argparse
+import csv
+import random
+import string
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List
+
+CSV_COLUMNS = ["COUNTRY ISO2 CODE", "SWIFT CODE", "CODE TYPE", "NAME",
+               "ADDRESS", "TOWN NAME", "COUNTRY NAME", "TIME ZONE"]
+
+# (ISO2, name, time zone, towns), roughly ordered by the size of the banking sector.
+COUNTRIES = [
+    ("US", "UNITED STATES", "America/New_York", ["NEW YORK", "CHICAGO", "SAN FRANCISCO", "MIAMI"]),
+    ("DE", "GERMANY", "Europe/Berlin", ["FRANKFURT AM MAIN", "BERLIN", "MUNICH", "HAMBURG"]),
+    ("GB", "UNITED KINGDOM", "Europe/London", ["LONDON", "MANCHESTER", "EDINBURGH"]),
+    ("FR", "FRANCE", "Europe/Paris", ["PARIS", "LYON", "MARSEILLE"]),
+    ("IT", "ITALY", "Europe/Rome", ["MILANO", "ROMA", "TORINO"]),
+    ("CN", "CHINA", "Asia/Shanghai", ["BEIJING", "SHANGHAI", "SHENZHEN"]),
+    ("JP", "JAPAN", "Asia/Tokyo", ["TOKYO", "OSAKA"]),
+    ("ES", "SPAIN", "Europe/Madrid", ["MADRID", "BARCELONA", "VALENCIA"]),
+    ("CH", "SWITZERLAND", "Europe/Zurich", ["ZURICH", "GENEVA", "BASEL"]),
+    ("PL", "POLAND", "Europe/Warsaw", ["WARSZAWA", "KRAKOW", "WROCLAW", "GDANSK"]),
+    ("NL", "NETHERLANDS", "Europe/Amsterdam", ["AMSTERDAM", "ROTTERDAM"]),
+    ("BR", "BRAZIL", "America/Sao_Paulo", ["SAO PAULO", "RIO DE JANEIRO"]),
+    ("IN", "INDIA", "Asia/Kolkata", ["MUMBAI", "NEW DELHI", "BANGALORE"]),
+    ("CA", "CANADA", "America/Toronto", ["TORONTO", "MONTREAL", "VANCOUVER"]),
+    ("AT", "AUSTRIA", "Europe/Vienna", ["WIEN", "GRAZ"]),
+    ("SE", "SWEDEN", "Europe/Stockholm", ["STOCKHOLM", "GOTEBORG"]),
+    ("AU", "AUSTRALIA", "Australia/Sydney", ["SYDNEY", "MELBOURNE"]),
+    ("TR", "TURKEY", "Europe/Istanbul", ["ISTANBUL", "ANKARA"]),
+    ("MX", "MEXICO", "America/Mexico_City", ["MEXICO CITY", "MONTERREY"]),
+    ("CZ", "CZECH REPUBLIC", "Europe/Prague", ["PRAHA", "BRNO"]),
+    ("PT", "PORTUGAL", "Europe/Lisbon", ["LISBOA", "PORTO"]),
+    ("BG", "BULGARIA", "Europe/Sofia", ["SOFIA", "VARNA"]),
+    ("LT", "LITHUANIA", "Europe/Vilnius", ["VILNIUS", "KAUNAS"]),
+    ("CL", "CHILE", "America/Santiago", ["SANTIAGO"]),
+    ("AL", "ALBANIA", "Europe/Tirane", ["TIRANA"]),
+    ("UY", "URUGUAY", "America/Montevideo", ["MONTEVIDEO"]),
+    ("MT", "MALTA", "Europe/Malta", ["VALLETTA"]),
+    ("MC", "MONACO", "Europe/Monaco", ["MONACO"]),
+]
+
+NAME_WORDS = ["UNITED", "NATIONAL", "COMMERCIAL", "SAVINGS", "COOPERATIVE", "INVESTMENT", "PRIVATE",
+              "FIRST", "CENTRAL", "MERCHANT", "TRUST", "CAPITAL", "HERITAGE", "NORTHERN", "SOUTHERN",
+              "ATLANTIC", "PACIFIC", "ALPINE", "METROPOLITAN", "AGRICULTURAL", "INDUSTRIAL", "MUTUAL"]
+NAME_SUFFIXES = ["BANK", "BANK AG", "BANK S.A.", "BANK PLC", "BANK N.V.", "BANK SPA", "CAPITAL LTD",
+                 "SECURITIES", "ASSET MANAGEMENT", "BANK LIMITED", "BANKING CORPORATION"]
+STREETS = ["MAIN STREET", "MARKET SQUARE", "BANK AVENUE", "CENTRAL BOULEVARD", "HIGH STREET",
+           "STATION ROAD", "RIVERSIDE", "CHURCH STREET", "PARK LANE", "KINGS ROAD"]
+
+ALPHANUMERIC = string.ascii_uppercase + string.digits
+MAX_BRANCHES = len(ALPHANUMERIC) ** 3 - 1  # every 3-character branch code except 'XXX'
+_XXX_INDEX = sum(ALPHANUMERIC.index("X") * 36 ** power for power in (2, 1, 0))
+
+
+def zipf_weights(count: int, exponent: float) -> List[float]:
+    """
+    Return the weights of ranks 1..count under a Zipf distribution. An exponent
+    of 0 gives equal weights; larger exponents concentrate the weight on the first ranks.
+    """
+
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def allocate(total: int, weights: List[float], cap: int) -> List[int]:
+    """
+    Split `total` into integer shares proportional to `weights`, none above `cap`.
+    The rounding remainder, and whatever capped shares cannot hold, is handed out
+    one unit at a time to the shares in order.
+
+    Raises:
+        ValueError: If the shares cannot hold the total.
+    """
+
+    if total > cap * len(weights):
+        raise ValueError(f"Cannot split {total} into {len(weights)} shares of at most {cap}")
+
+    scale = total / sum(weights)
+    shares = [min(cap, int(weight * scale)) for weight in weights]
+
+    remaining = total - sum(shares)
+    while remaining:
+        for index in range(len(shares)):
+            if remaining and shares[index] < cap:
+                shares[index] += 1
+                remaining -= 1
+
+    return shares
+
+
+def branch_code(index: int) -> str:
+    """
+    Return the index-th 3-character alphanumeric branch code, skipping 'XXX'.
+    """
+
+    if index >= _XXX_INDEX:
+        index += 1
+    return "".join(ALPHANUMERIC[(index // 36 ** power) % 36] for power in (2, 1, 0))
+
+
+def _corrupt(rng: random.Random, swift_code: str) -> str:
+    """
+    Return a SWIFT code broken in one of the ways the validator rejects.
+    """
+
+    corruption = rng.randrange(4)
+    if corruption == 0:
+        return swift_code[:7]
+    if corruption == 1:
+        return swift_code.lower()
+    if corruption == 2:
+        return f"{swift_code[:4]}{rng.choice(string.digits)}{swift_code[5:]}"
+    return f"{swift_code}0"
+
+
+def generate_bic_directory(rows: int, seed: int = 42, branch_ratio: float = 0.7, bank_skew: float = 1.1,
+                           country_skew: float = 1.0, invalid_rate: float = 0.0,
+                           duplicate_rate: float = 0.0) -> Iterator[Dict[str, Any]]:
+    """
+    Generate rows of a synthetic BIC directory in the format of the source SWIFT code sheet.
+
+    Every bank has a headquarter row (code ending in 'XXX') followed by its branches.
+    Branch counts follow a Zipf distribution over the banks, so a few banks get
+    thousands of branches while most get none, and banks are spread over countries
+    following another Zipf distribution. Rows are generated lazily, so any row count
+    can be written without holding the directory in memory. The output depends only
+    on the arguments.
+
+    Args:
+        rows (int): Number of rows to generate, including injected ones.
+        seed (int): Seed of the random generator.
+        branch_ratio (float): Fraction of the rows that are branches, from 0 to below 1.
+        bank_skew (float): Zipf exponent of the branch counts; 0 spreads branches evenly.
+        country_skew (float): Zipf exponent of the number of banks per country; 0 is uniform.
+        invalid_rate (float): Fraction of rows whose SWIFT code is made invalid.
+        duplicate_rate (float): Fraction of rows whose SWIFT code is replaced by the code
+            of an earlier row. The first row is never injected.
+
+    Returns:
+        Iterator[Dict[str, Any]]: One dictionary per CSV row, keyed by CSV_COLUMNS.
+
+    Raises:
+        ValueError: If a count, ratio or rate is out of range, or there are too few
+            banks for the branches.
+    """
+
+    if rows < 0:
+        raise ValueError("Row count must not be negative")
+    if not 0 <= branch_ratio < 1:
+        raise ValueError("Branch ratio must be at least 0 and below 1")
+    if not 0 <= invalid_rate + duplicate_rate < 1 or invalid_rate < 0 or duplicate_rate < 0:
+        raise ValueError("Invalid and duplicate rates must be non-negative and sum to less than 1")
+
+    rng = random.Random(seed)
+    banks = max(1, round(rows * (1 - branch_ratio))) if rows else 0
+    branches = allocate(rows - banks, zipf_weights(banks, bank_skew), MAX_BRANCHES) if banks else []
+    rng.shuffle(branches)
+
+    country_weights = list(accumulate(zipf_weights(len(COUNTRIES), country_skew)))
+    positions = rng.sample(range(1, rows), int(rows * invalid_rate) + int(rows * duplicate_rate)) if rows else []
+    injected = {index: "invalid" for index in positions[:int(rows * invalid_rate)]}
+    injected.update((index, "duplicate") for index in positions[int(rows * invalid_rate):])
+
+    def bank_rows() -> Iterator[Dict[str, Any]]:
+        prefixes = set()
+        for branch_count in branches:
+            country, country_name, time_zone, towns = rng.choices(COUNTRIES, cum_weights=country_weights)[0]
+            while True:
+                prefix = "".join(rng.choices(string.ascii_uppercase, k=4)) + country + \
+                    "".join(rng.choices(ALPHANUMERIC, k=2))
+                if prefix not in prefixes:
+                    prefixes.add(prefix)
+                    break
+
+            bank_name = f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)} {rng.choice(NAME_SUFFIXES)}"
+            for branch in range(-1, branch_count):
+                town = rng.choice(towns)
+                yield {
+                    "COUNTRY ISO2 CODE": country,
+                    "SWIFT CODE": prefix + ("XXX" if branch < 0 else branch_code(branch)),
+                    "CODE TYPE": "BIC11",
+                    "NAME": bank_name,
+                    "ADDRESS": f"{rng.randint(1, 400)} {rng.choice(STREETS)} {town}, {town}, "
+                               f"{rng.randint(10000, 99999)}",
+                    "TOWN NAME": town,
+                    "COUNTRY NAME": country_name,
+                    "TIME ZONE": time_zone
+                }
+
+    valid_codes: List[str] = []
+
+    for index, row in enumerate(bank_rows()):
+        kind = injected.get(index)
+        if kind == "invalid":
+            row["SWIFT CODE"] = _corrupt(rng, row["SWIFT CODE"])
+        elif kind == "duplicate":
+            row["SWIFT CODE"] = rng.choice(valid_codes)
+        elif len(valid_codes) < 1000:
+            valid_codes.append(row["SWIFT CODE"])
+        yield row
+
+
+def write_bic_directory(path: str, rows: int, **options) -> Dict[str, Any]:
+    """
+    Write a synthetic BIC directory to a CSV file.
+
+    Args:
+        path (str): Path of the CSV file to write.
+        rows (int): Number of rows to generate.
+        **options: Options of generate_bic_directory (seed, branch_ratio, bank_skew,
+            country_skew, invalid_rate, duplicate_rate).
+
+    Returns:
+        Dict[str, Any]: Number of rows, headquarters and banks, and the largest bank's branch count.
+    """
+
+    stats = {"path": path, "rows": 0, "headquarters": 0, "largest_bank_branches": 0}
+    branch_counts: Dict[str, int] = {}
+
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        for row in generate_bic_directory(rows, **options):
+            writer.writerow(row)
+            stats["rows"] += 1
+            code = row["SWIFT CODE"]
+            if code.endswith("XXX"):
+                stats["headquarters"] += 1
+            else:
+                branch_counts[code[:8]] = branch_counts.get(code[:8], 0) + 1
+
+    stats["largest_bank_branches"] = max(branch_counts.values(), default=0)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic BIC directory CSV for scale testing.")
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--output", required=True, help="path of the CSV file to write")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--branch-ratio", type=float, default=0.7,
+                        help="fraction of the rows that are branches")
+    parser.add_argument("--bank-skew", type=float, default=1.1,
+                        help="Zipf exponent of the branch counts per bank (0 = even)")
+    parser.add_argument("--country-skew", type=float, default=1.0,
+                        help="Zipf exponent of the banks per country (0 = uniform)")
+    parser.add_argument("--invalid-rate", type=float, default=0.0,
+                        help="fraction of rows with an invalid SWIFT code")
+    parser.add_argument("--duplicate-rate", type=float, default=0.0,
+                        help="fraction of rows repeating an earlier SWIFT code")
+    args = parser.parse_args()
+
+    stats = write_bic_directory(args.output, args.rows, seed=args.seed, branch_ratio=args.branch_ratio,
+                                bank_skew=args.bank_skew, country_skew=args.country_skew,
+                                invalid_rate=args.invalid_rate, duplicate_rate=args.duplicate_rate)
+    print(f"Wrote {stats['rows']} rows ({stats['headquarters']} headquarters, largest bank with "
+          f"{stats['largest_bank_branches']} branches) to {stats['path']}")
@@ -0,0 +1,170 @@
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.db.dataset_versions import GLOBAL_SCOPE
+from app.db.delta_sync import record_hash
+from app.models.dataset_version import dataset_versions
+
+GZIP_ETAG_SUFFIX = "-gzip"
+RECORD_VERSION_HEADER = "X-Record-Version"
+
+_versions: Dict[str, Tuple[int, datetime]] = {}
+_loaded_at: Optional[float] = None
+
+
+async def get_dataset_version(db, scope: str) -> Tuple[str, int, Optional[datetime]]:
+    """
+    Return the effective scope, version and last modification time for a country.
+
+    The whole version table (one row per country) is cached in memory for
+    DATASET_VERSION_TTL seconds, so most requests do not touch the database.
+    Writes made by another process become visible once the cache expires.
+    A country that was never written falls back to the global version.
+    """
+
+    return _effective_version(await _cached_versions(db), scope)
+
+
+async def get_dataset_versions(db) -> Dict[str, int]:
+    """
+    Return the version of every scope from the same cache as get_dataset_version.
+    """
+
+    return {scope: version for scope, (version, _) in (await _cached_versions(db)).items()}
+
+
+async def _cached_versions(db) -> Dict[str, Tuple[int, datetime]]:
+    global _versions, _loaded_at
+
+    now = time.monotonic()
+    if _loaded_at is None or now - _loaded_at >= get_settings().DATASET_VERSION_TTL:
+        _versions = _index_versions(await db.execute(select(dataset_versions)))
+        _loaded_at = now
+
+    return _versions
+
+
+def _index_versions(result) -> Dict[str, Tuple[int, datetime]]:
+    return {row["scope"]: (row["version"], row["updated_at"]) for row in result.mappings()}
+
+
+def _effective_version(versions: Dict[str, Tuple[int, datetime]], scope: str) -> Tuple[str, int, Optional[datetime]]:
+    for candidate in (scope.upper(), GLOBAL_SCOPE):
+        if candidate in versions:
+            version, updated_at = versions[candidate]
+            return candidate, version, updated_at
+
+    return GLOBAL_SCOPE, 0, None
+
+
+def invalidate_versions():
+    """
+    Drop the cached versions so that the next request reads them again.
+    Called after a write commits.
+    """
+
+    global _loaded_at
+
+    _loaded_at = None
+
+
+def validator_headers(scope: str, version: int, updated_at: Optional[datetime]) -> Dict[str, str]:
+    """
+    Build the ETag, Last-Modified and Cache-Control headers for a dataset version.
+
+    The ETag is strong: a given scope and version always serialize to the same
+    bytes for the same URL. The modification time is part of it so that tags
+    stay unique if the version table is ever recreated.
+    """
+
+    max_age = get_settings().CACHE_MAX_AGE
+    timestamp = 0 if updated_at is None else int(
+        updated_at.replace(tzinfo=timezone.utc).timestamp())
+
+    headers = {
+        "ETag": f'"{scope}.{version}.{timestamp}"',
+        "Cache-Control": f"public, max-age={max_age}" if max_age > 0 else "no-cache"
+    }
+    if updated_at is not None:
+        headers["Last-Modified"] = format_datetime(
+            updated_at.replace(tzinfo=timezone.utc), usegmt=True)
+
+    return headers
+
+
+def record_version(record: Mapping[str, Any]) -> str:
+    """
+    Return the version of a single SWIFT code: a quoted hash of its contents,
+    sent in X-Record-Version and compared with If-Match by conditional writes.
+
+    Unlike the ETag, which changes with any write to the country, it only
+    changes when the record itself does.
+    """
+
+    return f'"{record_hash(record)}"'
+
+
+async def conditional_headers(db, scope: str) -> Dict[str, str]:
+    """
+    Return the validator headers for the current version of a country.
+    """
+
+    return validator_headers(*await get_dataset_version(db, scope))
+
+
+def etag_matches(header_value: str, etag: str, weak: bool) -> bool:
+    """
+    Return True if any tag listed in an If-Match / If-None-Match header matches the ETag.
+
+    Weak comparison (If-None-Match) also accepts W/ tags; strong comparison
+    (If-Match) does not. Tags of the gzip-encoded representation match their
+    uncompressed counterpart.
+    """
+
+    for candidate in header_value.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate.endswith(f'{GZIP_ETAG_SUFFIX}"'):
+            candidate = candidate[:-len(GZIP_ETAG_SUFFIX) - 1] + '"'
+        if candidate == etag:
+            return True
+
+    return False
+
+
+def is_not_modified(request: Request, headers: Dict[str, str]) -> bool:
+    """
+    Evaluate If-None-Match, or If-Modified-Since when no If-None-Match is sent,
+    against the validator headers of the current representation.
+    """
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, headers["ETag"], weak=True)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    last_modified = headers.get("Last-Modified")
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    """
+    Build an empty 304 Not Modified response carrying the validator headers.
+    """
+
+    return Response(status_code=304, headers=headers)
@@ -6,6 +6,19 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _replica_hosts(hosts: str, default_port: str):
+    """
+    Parse a comma-separated list of `host` or `host:port` entries
+    """
+
+    parsed = []
+    for entry in hosts.split(","):
+        host, _, port = entry.strip().partition(":")
+        if host:
+            parsed.append((host, port or default_port))
+    return parsed
+
+
 class Settings(BaseSettings):
     """
     Application settings loaded from environment variables
@@ -22,6 +35,68 @@ class Settings(BaseSettings):
         "MYSQL_TEST_DATABASE", "test_swift_codes")
     PORT: str = os.getenv("PORT", "3306")
 
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv(
+        "DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+    WARMUP_CONNECTIONS: int = int(os.getenv("WARMUP_CONNECTIONS", os.getenv("DB_POOL_SIZE", "5")))
+    WARMUP_RETRY_SECONDS: float = float(os.getenv("WARMUP_RETRY_SECONDS", "5"))
+
+    MYSQL_REPLICA_HOSTS: str = os.getenv("MYSQL_REPLICA_HOSTS", "")
+    REPLICA_SELECTION: str = os.getenv("REPLICA_SELECTION", "round_robin")
+    READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+    READ_YOUR_WRITES_SECRET: str = os.getenv("READ_YOUR_WRITES_SECRET", "")
+
+    LOAD_BATCH_SIZE: int = int(os.getenv("LOAD_BATCH_SIZE", "5000"))
+    LOAD_MODE: str = os.getenv("LOAD_MODE", "executemany")
+
+    LOOKUP_MAX_CODES: int = int(os.getenv("LOOKUP_MAX_CODES", "5000"))
+    LOOKUP_CHUNK_SIZE: int = int(os.getenv("LOOKUP_CHUNK_SIZE", "1000"))
+
+    COUNTRY_MAX_PAGE_SIZE: int = int(os.getenv("COUNTRY_MAX_PAGE_SIZE", "10000"))
+
+    BULK_TRANSACTION_SIZE: int = int(os.getenv("BULK_TRANSACTION_SIZE", "1000"))
+    BULK_MAX_ROWS: int = int(os.getenv("BULK_MAX_ROWS", "100000"))
+    BULK_MAX_ELEMENT_SIZE: int = int(os.getenv("BULK_MAX_ELEMENT_SIZE", "65536"))
+    DELETE_MAX_CODES: int = int(os.getenv("DELETE_MAX_CODES", "5000"))
+
+    SNAPSHOT_ENABLED: bool = os.getenv(
+        "SNAPSHOT_ENABLED", "false").lower() in ("1", "true", "yes")
+    DIRECTORY_FILE: str = os.getenv("DIRECTORY_FILE", "")
+
+    SEARCH_INDEX_ENABLED: bool = os.getenv(
+        "SEARCH_INDEX_ENABLED", "true").lower() in ("1", "true", "yes")
+    SEARCH_MAX_LIMIT: int = int(os.getenv("SEARCH_MAX_LIMIT", "100"))
+
+    TEXT_INDEX_ENABLED: bool = os.getenv(
+        "TEXT_INDEX_ENABLED", "true").lower() in ("1", "true", "yes")
+    TEXT_SEARCH_MAX_LIMIT: int = int(os.getenv("TEXT_SEARCH_MAX_LIMIT", "50"))
+
+    DATASET_VERSION_TTL: float = float(os.getenv("DATASET_VERSION_TTL", "1.0"))
+    CACHE_MAX_AGE: int = int(os.getenv("CACHE_MAX_AGE", "0"))
+
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "none")
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+    RESPONSE_CACHE_MAX_BYTES: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    RESPONSE_CACHE_TTL: float = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+    RESPONSE_CACHE_GZIP: bool = os.getenv(
+        "RESPONSE_CACHE_GZIP", "false").lower() in ("1", "true", "yes")
+
+    METRICS_ENABLED: bool = os.getenv(
+        "METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    METRICS_DIR: str = os.getenv("METRICS_DIR", "")
+    METRICS_FLUSH_SECONDS: float = float(os.getenv("METRICS_FLUSH_SECONDS", "1.0"))
+    DB_DEBUG_HEADERS: bool = os.getenv(
+        "DB_DEBUG_HEADERS", "false").lower() in ("1", "true", "yes")
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "500"))
+
+    WEB_HOST: str = os.getenv("WEB_HOST", "0.0.0.0")
+    WEB_PORT: int = int(os.getenv("WEB_PORT", "8080"))
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "0"))
+
     @property
     def DATABASE_URL(self):
         """
@@ -30,6 +105,32 @@ class Settings(BaseSettings):
 
         return f"mysql+pymysql://{self.MYSQL_USER}:{self.MYSQL_PASSWORD}@{self.MYSQL_HOST}:{self.MYSQL_PORT}/{self.MYSQL_DATABASE}"
 
+    @property
+    def ASYNC_DATABASE_URL(self):
+        """
+        Construct database URL for the async (aiomysql) driver
+        """
+
+        return f"mysql+aiomysql://{self.MYSQL_USER}:{self.MYSQL_PASSWORD}@{self.MYSQL_HOST}:{self.MYSQL_PORT}/{self.MYSQL_DATABASE}"
+
+    @property
+    def REPLICA_DATABASE_URLS(self):
+        """
+        Construct database URLs for the read replicas listed in MYSQL_REPLICA_HOSTS
+        """
+
+        return [f"mysql+pymysql://{self.MYSQL_USER}:{self.MYSQL_PASSWORD}@{host}:{port}/{self.MYSQL_DATABASE}"
+                for host, port in _replica_hosts(self.MYSQL_REPLICA_HOSTS, self.MYSQL_PORT)]
+
+    @property
+    def ASYNC_REPLICA_DATABASE_URLS(self):
+        """
+        Construct async (aiomysql) database URLs for the read replicas listed in MYSQL_REPLICA_HOSTS
+        """
+
+        return [f"mysql+aiomysql://{self.MYSQL_USER}:{self.MYSQL_PASSWORD}@{host}:{port}/{self.MYSQL_DATABASE}"
+                for host, port in _replica_hosts(self.MYSQL_REPLICA_HOSTS, self.MYSQL_PORT)]
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,109 @@
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import select
+
+from app.db.dataset_versions import GLOBAL_SCOPE
+
+# Record fields compared when a country is synchronised with the database.
+RECORD_FIELDS = ("swift_code", "address", "bank_name", "country_ISO2", "country_name", "is_headquarter")
+
+Changes = Tuple[Set[str], List[Mapping[str, Any]], Dict[str, int]]
+
+
+def read_versions(conn) -> Dict[str, int]:
+    """
+    Read every dataset version on a synchronous connection. Loaders call it in
+    the same transaction as the rows they load, before them, so that anything
+    written after the rows were read is picked up by the next synchronisation.
+    """
+
+    from app.models.dataset_version import dataset_versions
+
+    return {row["scope"]: row["version"] for row in conn.execute(select(dataset_versions)).mappings()}
+
+
+def stale_scopes(reflected: Mapping[str, int], versions: Mapping[str, int]) -> Set[str]:
+    """
+    Return the countries whose version differs from the one a dataset reflects.
+
+    Every write bumps the global version once, so while it is unchanged no
+    country can have moved and the countries are not compared.
+    """
+
+    if reflected.get(GLOBAL_SCOPE, 0) == versions.get(GLOBAL_SCOPE, 0):
+        return set()
+
+    return {scope for scope, version in versions.items()
+            if scope != GLOBAL_SCOPE and reflected.get(scope, 0) != version}
+
+
+def applied_versions(reflected: Mapping[str, int], scopes: Iterable[str]) -> Dict[str, int]:
+    """
+    Return the versions a dataset reflects once it applied a write of its own
+    process, which bumped each of the given countries, and the global version, once.
+    """
+
+    versions = {scope: reflected.get(scope, 0) + 1 for scope in scopes}
+    if versions:
+        versions[GLOBAL_SCOPE] = reflected.get(GLOBAL_SCOPE, 0) + 1
+    return versions
+
+
+def country_changes(rows: Iterable[Mapping[str, Any]], indexed: Iterable[Mapping[str, Any]],
+                    get: Callable[[str], Optional[Mapping[str, Any]]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Compare the rows of some countries in the database with the records a
+    dataset holds for them.
+
+    Args:
+        rows: Every row stored with one of the countries.
+        indexed: Every record the dataset holds for one of the countries.
+        get: Returns the record the dataset holds for a SWIFT code, or None.
+
+    Returns:
+        tuple: The records to add or replace and the SWIFT codes to remove.
+    """
+
+    current = {row["swift_code"]: dict(row) for row in rows}
+    deleted = [record["swift_code"] for record in indexed if record["swift_code"] not in current]
+    upserted = [record for swift_code, record in current.items()
+                if (held := get(swift_code)) is None or any(held[field] != record[field] for field in RECORD_FIELDS)]
+
+    return upserted, deleted
+
+
+async def read_stale_countries(db, reflected: Mapping[str, int], columns) -> Optional[Changes]:
+    """
+    Read what changed in the database since the versions a dataset reflects,
+    e.g. because of loader runs or writes served by other workers.
+
+    Writes are detected through the cached dataset versions, so checking costs
+    no query while nothing changed. The countries whose version moved are read
+    again from the database, after their versions.
+
+    Args:
+        db (AsyncSession): Session to read the versions and rows from.
+        reflected (Mapping[str, int]): Versions the dataset reflects.
+        columns: Columns of swift_codes the dataset keeps.
+
+    Returns:
+        Optional[Changes]: The stale countries, every row stored with one of them and
+        their versions (plus the global one), or None when the dataset is up to date.
+    """
+
+    from app.core.conditional import get_dataset_version, get_dataset_versions
+    from app.models.dataset_version import dataset_versions
+    from app.models.swift_code import swift_codes
+
+    _, version, _ = await get_dataset_version(db, GLOBAL_SCOPE)
+    if reflected.get(GLOBAL_SCOPE, 0) == version or not stale_scopes(reflected, await get_dataset_versions(db)):
+        return None
+
+    result = await db.execute(select(dataset_versions))
+    versions = {row["scope"]: row["version"] for row in result.mappings()}
+    scopes = stale_scopes(reflected, versions)
+    if not scopes:
+        return None
+
+    rows = (await db.execute(select(*columns).where(swift_codes.c.country_ISO2.in_(scopes)))).mappings().all()
+    return scopes, rows, {scope: versions[scope] for scope in (*scopes, GLOBAL_SCOPE)}
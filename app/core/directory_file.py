@@ -0,0 +1,365 @@
+"""
+Compact binary SWIFT directory file, and a memory-mapped reader for it.
+
+compile_directory() turns the records returned by parse_swift_data into a
+single file. DirectoryFile maps that file and answers lookups by SWIFT code,
+code prefix (e.g. an 8-character bank prefix) and country with binary searches
+over the mapped bytes, so opening a file reads nothing but its header, and
+processes that map the same file share its pages in the page cache.
+
+compile_database() compiles the swift_codes table instead, together with the
+dataset versions it was read at. With DIRECTORY_FILE set to such a file, the
+warm-up builds the read snapshot from it (snapshot.load_snapshot_file) and
+reads again only the countries written since.
+
+Layout (little-endian):
+    header     magic, version, record count, country count and section offsets
+    keys       record count x 11-byte SWIFT codes in ascending byte order;
+               8-character codes are padded with spaces
+    records    record count x (bank name, address, country name heap offsets,
+               country index, headquarter flag), in key order
+    countries  country count x (ISO2 code, first and count of its entries in
+               the members section), sorted by ISO2 code
+    members    record count x record index, grouped by country, in key order
+    heap       deduplicated UTF-8 strings, each prefixed by its 2-byte length
+    versions   JSON object of the dataset versions the records reflect, or null
+               for a file compiled from a CSV file
+
+Usage:
+    python -m app.core.directory_file --input "data/Interns_2025_SWIFT_CODES - Sheet1.csv" --output swift_codes.bin
+    python -m app.core.directory_file --database --output swift_codes.bin
+"""
+
+import argparse
+import mmap
+import struct
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+import orjson
+
+from custom_exceptions.InvalidDirectoryFileError import InvalidDirectoryFileError
+
+MAGIC = b"SWIFTDIR"
+VERSION = 2
+KEY_SIZE = 11
+
+HEADER = struct.Struct("<8sIII8Q")
+RECORD = struct.Struct("<IIIHBx")
+COUNTRY = struct.Struct("<2s2xII")
+MEMBER = struct.Struct("<I")
+STRING_LENGTH = struct.Struct("<H")
+
+
+def _key(swift_code: str) -> bytes:
+    return swift_code.encode("ascii").ljust(KEY_SIZE)
+
+
+class _StringHeap:
+    """
+    Length-prefixed strings, each distinct string stored once.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets: Dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        offset = self.offsets.get(value)
+        if offset is None:
+            encoded = value.encode("utf-8")
+            if len(encoded) > 0xFFFF:
+                raise ValueError(f"String too long for the directory file: {value[:40]}...")
+            offset = self.offsets[value] = len(self.data)
+            self.data += STRING_LENGTH.pack(len(encoded)) + encoded
+        return offset
+
+
+def compile_directory(records: Iterable[Dict[str, Any]], path: str,
+                      versions: Optional[Mapping[str, int]] = None) -> Dict[str, int]:
+    """
+    Write SWIFT code records to a binary directory file.
+
+    Args:
+        records: Records as returned by parse_swift_data (swift_code, address, bank_name,
+            country_ISO2, country_name, is_headquarter), with unique SWIFT codes.
+        path (str): Path of the file to write.
+        versions (Optional[Mapping[str, int]]): Dataset versions the records reflect,
+            when they were read from the database.
+
+    Returns:
+        Dict[str, int]: Number of records and countries, and the size of the string heap and of the file in bytes.
+
+    Raises:
+        ValueError: If a SWIFT code appears twice or a country code is not 2 characters long.
+    """
+
+    ordered = sorted(records, key=lambda record: _key(record["swift_code"]))
+    countries = sorted({record["country_ISO2"] for record in ordered})
+    country_index = {country: index for index, country in enumerate(countries)}
+    for country in countries:
+        if len(country.encode("ascii")) != 2:
+            raise ValueError(f"Invalid country code: {country!r}")
+
+    heap = _StringHeap()
+    keys = bytearray()
+    packed_records = bytearray()
+    members: List[List[int]] = [[] for _ in countries]
+    previous = None
+
+    for index, record in enumerate(ordered):
+        key = _key(record["swift_code"])
+        if key == previous:
+            raise ValueError(f"Duplicate SWIFT code: {record['swift_code']}")
+        previous = key
+
+        country = country_index[record["country_ISO2"]]
+        keys += key
+        packed_records += RECORD.pack(heap.add(record["bank_name"]), heap.add(record["address"]),
+                                      heap.add(record["country_name"]), country,
+                                      1 if record["is_headquarter"] else 0)
+        members[country].append(index)
+
+    packed_countries = bytearray()
+    packed_members = bytearray()
+    for country, indexes in zip(countries, members):
+        packed_countries += COUNTRY.pack(country.encode("ascii"), len(packed_members) // MEMBER.size, len(indexes))
+        packed_members += b"".join(MEMBER.pack(index) for index in indexes)
+
+    packed_versions = orjson.dumps(dict(versions) if versions is not None else None)
+
+    sections = [keys, packed_records, packed_countries, packed_members, heap.data, packed_versions]
+    offsets = []
+    position = HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+
+    with open(path, "wb") as output:
+        output.write(HEADER.pack(MAGIC, VERSION, len(ordered), len(countries), *offsets,
+                                 len(heap.data), len(packed_versions)))
+        for section in sections:
+            output.write(section)
+
+    return {"records": len(ordered), "countries": len(countries), "heap_bytes": len(heap.data), "bytes": position}
+
+
+def compile_database(bind, path: str) -> Dict[str, int]:
+    """
+    Write the swift_codes table to a binary directory file, with the dataset
+    versions read first in the same transaction, as the snapshot loader does.
+
+    Args:
+        bind: SQLAlchemy engine or connection to read the table from.
+        path (str): Path of the file to write.
+
+    Returns:
+        Dict[str, int]: As compile_directory.
+    """
+
+    from sqlalchemy import select
+
+    from app.core.dataset_sync import RECORD_FIELDS, read_versions
+    from app.models.swift_code import swift_codes
+
+    with bind.connect() as conn:
+        versions = read_versions(conn)
+        rows = conn.execute(select(*(swift_codes.c[field] for field in RECORD_FIELDS))).mappings().all()
+
+    return compile_directory(rows, path, versions)
+
+
+class _Keys:
+    """
+    Sequence view of the key section, so that bisect can search it in place.
+    """
+
+    def __init__(self, buffer, offset: int, count: int):
+        self.buffer = buffer
+        self.offset = offset
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index: int) -> bytes:
+        start = self.offset + index * KEY_SIZE
+        return self.buffer[start:start + KEY_SIZE]
+
+
+class DirectoryFile:
+    """
+    Read-only, memory-mapped view of a file written by compile_directory.
+
+    Records are returned in the format of parse_swift_data. Lookups decode
+    only the records they return.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            try:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # An empty file cannot be mapped.
+                raise InvalidDirectoryFileError()
+
+        try:
+            (magic, version, self._count, self._country_count, keys, records,
+             countries, members, heap, versions, heap_size, versions_size) = HEADER.unpack_from(self._mmap, 0)
+        except struct.error:
+            self._mmap.close()
+            raise InvalidDirectoryFileError()
+
+        if magic != MAGIC or version != VERSION or versions + versions_size > len(self._mmap):
+            self._mmap.close()
+            raise InvalidDirectoryFileError(
+                f"File is not a compiled SWIFT directory (version {VERSION}): {path}")
+
+        # Dataset versions the records reflect, or None for a file compiled from a CSV file.
+        self.versions: Optional[Dict[str, int]] = orjson.loads(self._mmap[versions:versions + versions_size])
+
+        self._keys = _Keys(self._mmap, keys, self._count)
+        self._records = records
+        self._countries = countries
+        self._members = members
+        self._heap = heap
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._mmap.close()
+
+    def _string(self, offset: int) -> str:
+        start = self._heap + offset
+        (length,) = STRING_LENGTH.unpack_from(self._mmap, start)
+        return self._mmap[start + STRING_LENGTH.size:start + STRING_LENGTH.size + length].decode("utf-8")
+
+    def _country_code(self, index: int) -> str:
+        start = self._countries + index * COUNTRY.size
+        return self._mmap[start:start + 2].decode("ascii")
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """
+        Decode the record at a position in key order.
+        """
+
+        name, address, country_name, country, is_headquarter = RECORD.unpack_from(
+            self._mmap, self._records + index * RECORD.size)
+        return {
+            "swift_code": self._keys[index].decode("ascii").rstrip(),
+            "address": self._string(address),
+            "bank_name": self._string(name),
+            "country_ISO2": self._country_code(country),
+            "country_name": self._string(country_name),
+            "is_headquarter": bool(is_headquarter)
+        }
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Decode every record, in key order.
+        """
+
+        for index in range(self._count):
+            yield self.record(index)
+
+    def get(self, swift_code: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the record for a SWIFT code, or None if it is not in the file.
+        """
+
+        try:
+            key = _key(swift_code.upper())
+        except UnicodeEncodeError:
+            return None
+
+        index = bisect_left(self._keys, key)
+        if index < self._count and self._keys[index] == key:
+            return self.record(index)
+        return None
+
+    def prefix_range(self, prefix: str) -> range:
+        """
+        Return the positions, in key order, of the SWIFT codes starting with `prefix`.
+        """
+
+        try:
+            start = prefix.upper().encode("ascii")
+        except UnicodeEncodeError:
+            return range(0)
+
+        # No key contains 0xFF, so the prefix followed by it sorts after every key having that prefix.
+        return range(bisect_left(self._keys, start), bisect_left(self._keys, start + b"\xff"))
+
+    def with_prefix(self, prefix: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Return the records whose SWIFT code starts with `prefix`, in code order.
+        """
+
+        positions = self.prefix_range(prefix)
+        if limit is not None:
+            positions = positions[:limit]
+        return [self.record(index) for index in positions]
+
+    def bank(self, bank_prefix: str) -> List[Dict[str, Any]]:
+        """
+        Return the headquarter and branches sharing an 8-character bank prefix.
+        """
+
+        return self.with_prefix(bank_prefix[:8])
+
+    def countries(self) -> List[str]:
+        return [self._country_code(index) for index in range(self._country_count)]
+
+    def country(self, country_iso2: str) -> List[Dict[str, Any]]:
+        """
+        Return the records of a country, in code order.
+        """
+
+        low, high = 0, self._country_count
+        target = country_iso2.upper().encode("ascii", "replace")
+        while low < high:
+            middle = (low + high) // 2
+            code, _, _ = COUNTRY.unpack_from(self._mmap, self._countries + middle * COUNTRY.size)
+            if code < target:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == self._country_count:
+            return []
+        code, first, count = COUNTRY.unpack_from(self._mmap, self._countries + low * COUNTRY.size)
+        if code != target:
+            return []
+
+        start = self._members + first * MEMBER.size
+        return [self.record(MEMBER.unpack_from(self._mmap, start + offset * MEMBER.size)[0])
+                for offset in range(count)]
+
+
+if __name__ == "__main__":
+    from app.core.parser import parse_swift_data
+
+    parser = argparse.ArgumentParser(description="Compile a SWIFT codes CSV file, or the swift_codes table, "
+                                                 "into a binary directory file.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="path of the CSV file to compile")
+    source.add_argument("--database", action="store_true",
+                        help="compile the swift_codes table of DATABASE_URL, with its dataset versions")
+    parser.add_argument("--output", required=True, help="path of the binary file to write")
+    args = parser.parse_args()
+
+    if args.database:
+        from app.db.database import engine
+
+        stats = compile_database(engine, args.output)
+    else:
+        stats = compile_directory(parse_swift_data(args.input), args.output)
+    print(f"Wrote {stats['records']} records from {stats['countries']} countries "
+          f"({stats['bytes']} bytes, {stats['heap_bytes']} in strings) to {args.output}")
@@ -0,0 +1,59 @@
+import bisect
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram of observed values (seconds, by default), in the
+    cumulative format used by Prometheus.
+    """
+
+    __slots__ = ("buckets", "_counts", "_sum", "_lock")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def state(self) -> Tuple[List[int], float]:
+        """
+        Return the count per bucket (not cumulative, "+Inf" last) and the sum.
+        """
+
+        with self._lock:
+            return list(self._counts), self._sum
+
+    def merge(self, counts: Sequence[int], total: float):
+        """
+        Add the state of another histogram with the same buckets to this one.
+        """
+
+        with self._lock:
+            for index, count in enumerate(counts):
+                self._counts[index] += count
+            self._sum += total
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the count, the sum and the cumulative count per upper bound ("+Inf" last).
+        """
+
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+
+        cumulative, running = {}, 0
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], counts):
+            running += count
+            cumulative[bound] = running
+
+        return {"count": running, "sum": total, "buckets": cumulative}
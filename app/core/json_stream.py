@@ -0,0 +1,133 @@
+import codecs
+import json
+from typing import Any, AsyncIterator, Optional, Tuple
+
+import orjson
+
+from custom_exceptions.MalformedBodyError import MalformedBodyError
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl",
+                      "application/x-jsonlines")
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+def is_ndjson(content_type: Optional[str]) -> bool:
+    """
+    Return True if the Content-Type header names a newline-delimited JSON body.
+    """
+
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return media_type in NDJSON_MEDIA_TYPES
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes],
+                      max_element_size: Optional[int] = None) -> AsyncIterator[Tuple[Any, Optional[str]]]:
+    """
+    Decode a newline-delimited JSON body as it arrives.
+
+    Yields one (value, error) pair per non-empty line. A line that is not valid
+    JSON yields (None, error message) and does not stop the stream.
+
+    Raises:
+        MalformedBodyError: If a line is longer than max_element_size bytes, so
+            that a body without line breaks is never buffered whole.
+    """
+
+    buffer = b""
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if max_element_size is not None and len(line) > max_element_size:
+                raise MalformedBodyError(f"A line is longer than {max_element_size} bytes")
+            if line.strip():
+                yield _decode_line(line)
+        if max_element_size is not None and len(buffer) > max_element_size:
+            raise MalformedBodyError(f"A line is longer than {max_element_size} bytes")
+
+    if buffer.strip():
+        yield _decode_line(buffer)
+
+
+def _decode_line(line: bytes) -> Tuple[Any, Optional[str]]:
+    try:
+        return orjson.loads(line), None
+    except orjson.JSONDecodeError as e:
+        return None, f"Malformed JSON: {e}"
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes],
+                          max_element_size: Optional[int] = None) -> AsyncIterator[Tuple[Any, Optional[str]]]:
+    """
+    Decode the elements of a JSON array body as it arrives, without holding the whole body.
+
+    Yields one (value, None) pair per element. An element that cannot be decoded
+    yet is kept until the next chunk arrives, up to max_element_size characters.
+
+    Raises:
+        MalformedBodyError: If the body is not a well-formed JSON array, or an
+            element is longer than max_element_size characters. Elements decoded
+            before the error have already been yielded.
+    """
+
+    text = codecs.getincrementaldecoder("utf-8")()
+    iterator = chunks.__aiter__()
+    buffer, position, state, final = "", 0, "start", False
+
+    while True:
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position >= len(buffer):
+                break
+
+            char = buffer[position]
+            if state == "start":
+                if char != "[":
+                    raise MalformedBodyError("Expected a JSON array")
+                position, state = position + 1, "first"
+            elif state == "first" and char == "]":
+                position, state = position + 1, "end"
+            elif state in ("first", "value"):
+                try:
+                    value, end = _decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError as e:
+                    if final:
+                        raise MalformedBodyError(f"Malformed JSON array: {e}")
+                    break
+                if end == len(buffer) and not final:
+                    # A number at the end of the buffer may continue in the next chunk.
+                    break
+                yield value, None
+                position, state = end, "separator"
+            elif state == "separator":
+                if char not in ",]":
+                    raise MalformedBodyError(
+                        f"Expected ',' or ']' at position {position}")
+                position, state = position + 1, "value" if char == "," else "end"
+            else:
+                raise MalformedBodyError("Unexpected data after the JSON array")
+
+        if final:
+            break
+
+        if max_element_size is not None and len(buffer) - position > max_element_size:
+            # Malformed data would otherwise be buffered, and decoded again, up to the end of the body.
+            raise MalformedBodyError(f"An element of the JSON array is longer than {max_element_size} characters")
+
+        buffer, position = buffer[position:], 0
+        try:
+            chunk = await iterator.__anext__()
+        except StopAsyncIteration:
+            chunk, final = b"", True
+
+        try:
+            buffer += text.decode(chunk, final=final)
+        except UnicodeDecodeError as e:
+            raise MalformedBodyError(f"Request body is not valid UTF-8: {e}")
+
+    if state != "end":
+        raise MalformedBodyError("Unexpected end of the JSON array")
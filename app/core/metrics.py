@@ -0,0 +1,354 @@
+import asyncio
+import glob
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+
+from app.core.config import get_settings
+from app.core.histogram import LATENCY_BUCKETS, Histogram
+from app.db.instrumentation import end_request_stats, start_request_stats
+
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Monotonic counter with a fixed set of label names.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, labelvalues: tuple = (), amount: float = 1):
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def empty(self) -> "Counter":
+        return Counter(self.name, self.documentation, self.labelnames)
+
+    def state(self) -> list:
+        return [[list(labelvalues), value] for labelvalues, value in list(self._values.items())]
+
+    def merge(self, state: list):
+        for labelvalues, value in state:
+            self.inc(tuple(labelvalues), value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labelvalues, value in list(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}")
+        return lines
+
+
+class LabeledHistogram:
+    """
+    Histogram with a fixed set of label names; one Histogram per label combination.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = buckets
+        self._children: Dict[tuple, Histogram] = {}
+
+    def observe(self, labelvalues: tuple, value: float):
+        child = self._children.get(labelvalues)
+        if child is None:
+            child = self._children.setdefault(labelvalues, Histogram(self.buckets))
+        child.observe(value)
+
+    def empty(self) -> "LabeledHistogram":
+        return LabeledHistogram(self.name, self.documentation, self.labelnames, self.buckets)
+
+    def state(self) -> list:
+        return [[list(labelvalues), *child.state()] for labelvalues, child in list(self._children.items())]
+
+    def merge(self, state: list):
+        for labelvalues, counts, total in state:
+            labelvalues = tuple(labelvalues)
+            child = self._children.setdefault(labelvalues, Histogram(self.buckets))
+            child.merge(counts, total)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labelvalues, child in list(self._children.items()):
+            snapshot = child.snapshot()
+            for bound, count in snapshot["buckets"].items():
+                bucket_labels = _labels(self.labelnames, labelvalues, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+            labels = _labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_number(snapshot['sum'])}")
+            lines.append(f"{self.name}_count{labels} {snapshot['count']}")
+        return lines
+
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by route and status code.",
+                   ("method", "route", "status"))
+REQUEST_SECONDS = LabeledHistogram("http_request_duration_seconds", "HTTP request latency in seconds.",
+                                   ("method", "route"))
+REQUEST_DB_SECONDS = LabeledHistogram("http_request_db_seconds",
+                                      "Time spent executing SQL statements per HTTP request.",
+                                      ("method", "route"))
+REQUEST_DB_STATEMENTS = LabeledHistogram("http_request_db_statements",
+                                         "Number of SQL statements executed per HTTP request.",
+                                         ("method", "route"), buckets=STATEMENT_BUCKETS)
+
+METRICS = [REQUESTS, REQUEST_SECONDS, REQUEST_DB_SECONDS, REQUEST_DB_STATEMENTS]
+
+# Gauges computed at scrape time: (name, type, help, function returning samples).
+_collectors: List[Tuple[str, str, str, Callable[[], Iterable[Sample]]]] = []
+
+
+def register_collector(name: str, metric_type: str, documentation: str, collect: Callable[[], Iterable[Sample]]):
+    """
+    Register a metric whose samples are computed when /metrics is scraped.
+    """
+
+    _collectors.append((name, metric_type, documentation, collect))
+
+
+def _render_gauges(gauges: Iterable[Tuple[str, str, str, Iterable[Sample]]]) -> List[str]:
+    lines = []
+    for name, metric_type, documentation, samples in gauges:
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in samples:
+            names, values = tuple(labels), tuple(labels.values())
+            lines.append(f"{name}{_labels(names, values)} {_number(value)}")
+    return lines
+
+
+def render_metrics() -> str:
+    """
+    Render every metric in the Prometheus text exposition format.
+
+    With METRICS_DIR set, the metrics of every worker are rendered: see
+    render_all_workers().
+    """
+
+    directory = get_settings().METRICS_DIR
+    if directory:
+        return render_all_workers(directory)
+
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    lines.extend(_render_gauges((name, metric_type, documentation, collect())
+                                for name, metric_type, documentation, collect in _collectors))
+
+    return "\n".join(lines) + "\n"
+
+
+# Name of this process's file in METRICS_DIR, with the pid it was made for.
+_metrics_file: Optional[Tuple[int, str]] = None
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def write_metrics_file(directory: str):
+    """
+    Write the metrics of this process to its file in `directory`, replacing
+    the previous one atomically.
+
+    The file name includes the start of the process, so that a worker reusing
+    the pid of a dead one does not overwrite its counters.
+    """
+
+    global _metrics_file
+
+    pid = os.getpid()
+    if _metrics_file is None or _metrics_file[0] != pid:
+        _metrics_file = pid, f"{pid}-{time.time_ns()}.json"
+
+    state = {
+        "pid": pid,
+        "metrics": {metric.name: metric.state() for metric in METRICS},
+        "gauges": {name: list(collect()) for name, _, _, collect in _collectors}
+    }
+
+    path = os.path.join(directory, _metrics_file[1])
+    with open(f"{path}.tmp", "wb") as file:
+        file.write(orjson.dumps(state))
+    os.replace(f"{path}.tmp", path)
+
+
+def render_all_workers(directory: str) -> str:
+    """
+    Render the metrics of every worker sharing `directory`.
+
+    The scraping worker writes its own file first, then the files of all
+    workers are merged: counters and histograms are summed, including those of
+    workers that have exited, so that totals never go back. Gauges are
+    reported per live worker, with a `pid` label.
+    """
+
+    write_metrics_file(directory)
+
+    metrics = [metric.empty() for metric in METRICS]
+    gauges: Dict[str, List[Sample]] = {name: [] for name, _, _, _ in _collectors}
+
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        try:
+            with open(path, "rb") as file:
+                state = orjson.loads(file.read())
+        except (OSError, orjson.JSONDecodeError):
+            continue
+
+        for metric in metrics:
+            metric.merge(state["metrics"].get(metric.name, []))
+
+        if _process_alive(state["pid"]):
+            for name, samples in state["gauges"].items():
+                if name in gauges:
+                    gauges[name].extend(({**labels, "pid": str(state["pid"])}, value) for labels, value in samples)
+
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    lines.extend(_render_gauges((name, metric_type, documentation, gauges[name])
+                                for name, metric_type, documentation, _ in _collectors))
+
+    return "\n".join(lines) + "\n"
+
+
+def clear_metrics_dir(directory: str):
+    """
+    Remove the files left in `directory` by workers of a previous run.
+    """
+
+    for path in glob.glob(os.path.join(directory, "*.json*")):
+        os.remove(path)
+
+
+async def flush_metrics(directory: str, interval: float):
+    """
+    Write the metrics of this process to `directory` every `interval` seconds,
+    so that the worker answering a scrape can include them.
+    """
+
+    while True:
+        write_metrics_file(directory)
+        await asyncio.sleep(interval)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the count, status, latency, SQL time and SQL statement
+    count of every HTTP request. Requests are labelled with the route template
+    (e.g. /v1/swift-codes/{swift_code}), so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        db_stats, token = start_request_stats(scope)
+        status_code = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status_code[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            end_request_stats(token)
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "unmatched"))
+
+            REQUESTS.inc((*labels, str(status_code[0])))
+            REQUEST_SECONDS.observe(labels, time.perf_counter() - started)
+            REQUEST_DB_SECONDS.observe(labels, db_stats.seconds)
+            REQUEST_DB_STATEMENTS.observe(labels, db_stats.statements)
+
+
+def _response_cache_samples() -> Iterable[Sample]:
+    from app.core.response_cache import get_response_cache
+
+    stats = get_response_cache().stats()
+    for key in ("hits", "misses", "evictions", "expirations", "invalidations", "entries", "bytes"):
+        if key in stats:
+            yield {"stat": key}, stats[key]
+
+
+def _snapshot_samples() -> Iterable[Sample]:
+    from app.core.snapshot import get_snapshot
+
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        yield {}, len(snapshot)
+
+
+def _search_index_samples() -> Iterable[Sample]:
+    from app.core.search_index import get_search_index
+
+    index = get_search_index()
+    if index is not None:
+        yield {}, len(index)
+
+
+def _text_index_samples() -> Iterable[Sample]:
+    from app.core.text_index import get_text_index
+
+    index = get_text_index()
+    if index is not None:
+        yield {}, len(index)
+
+
+def _pool_samples() -> Iterable[Sample]:
+    from app.db.pool_stats import get_pool_stats
+
+    for pool, stats in get_pool_stats().items():
+        for key in ("checkouts", "connects", "invalidations", "timeouts", "overflowCheckouts",
+                    "inUse", "idle", "overflow"):
+            if key in stats:
+                yield {"pool": pool, "stat": key}, stats[key]
+
+
+register_collector("swift_codes_response_cache", "gauge",
+                   "Response cache counters and size.", _response_cache_samples)
+register_collector("swift_codes_snapshot_records", "gauge",
+                   "SWIFT codes held by the read snapshot.", _snapshot_samples)
+register_collector("swift_codes_search_index_records", "gauge",
+                   "SWIFT codes held by the prefix search index.", _search_index_samples)
+register_collector("swift_codes_text_index_records", "gauge",
+                   "SWIFT codes held by the bank name and address text index.", _text_index_samples)
+register_collector("swift_codes_db_pool", "gauge",
+                   "Connection pool counters and current usage.", _pool_samples)
@@ -1,5 +1,5 @@
 import pandas as pd
-from typing import List, Dict, Any
+from typing import Iterator, List, Dict, Any
 import os
 
 from app.utils.validators import is_valid_swift_code
@@ -12,31 +12,18 @@ from custom_exceptions.InvalidSwiftCodeError import InvalidSwiftCodeError
 from custom_exceptions.DuplicateSwiftCodeError import DuplicateSwiftCodeError
 
 
-def parse_swift_data(file_path: str) -> List[Dict[str, Any]]:
-    """
-    Parse and validate SWIFT code data from a CSV file.
+NEEDED_COLUMNS = [
+    'SWIFT CODE',
+    'COUNTRY ISO2 CODE',
+    'COUNTRY NAME',
+    'NAME',
+    'ADDRESS',
+]
 
-    This function reads a CSV file containing SWIFT code information,
-    validates its structure and content, and transforms it into a standardized format.
-    It applies business rules such as determining headquarter status based on the
-    SWIFT code ending with 'XXX' and standardizing country codes to uppercase.
 
-    Args:
-        file_path (str): Path to the CSV file containing SWIFT code data.
-
-    Returns:
-        List[Dict[str, Any]]: A list of dictionaries, each representing a SWIFT code entry
-        with standardized field names and formatted values.
-
-    Raises:
-        InvalidStringInputError: If the file path is empty, not a string, or contains only whitespace.
-        FileNotFoundError: If the file does not exist at the specified path.
-        InvalidFileExtensionError: If the file is not a CSV file.
-        pd.errors.ParserError: If the CSV file cannot be parsed due to formatting issues.
-        pd.errors.EmptyDataError: If the CSV file is empty.
-        MissingColumnError: If any required columns are missing from the CSV file.
-        InvalidSwiftCodeError: If any SWIFT codes in the file are not valid.
-        DuplicateSwiftCodeError: If the file contains duplicate SWIFT codes.
+def _validate_file_path(file_path: str):
+    """
+    Check that the path is a non-empty string pointing to an existing CSV file.
     """
 
     if not file_path or not isinstance(file_path, str) or not file_path.strip():
@@ -48,32 +35,31 @@ def parse_swift_data(file_path: str) -> List[Dict[str, Any]]:
     if not file_path.lower().endswith('.csv'):
         raise InvalidFileExtensionError
 
-    try:
-        df = pd.read_csv(file_path)
-    except pd.errors.ParserError:
-        raise pd.errors.ParserError
-    except pd.errors.EmptyDataError:
-        raise pd.errors.EmptyDataError
 
-    needed_columns = [
-        'SWIFT CODE',
-        'COUNTRY ISO2 CODE',
-        'COUNTRY NAME',
-        'NAME',
-        'ADDRESS',
-    ]
+def _validate_columns(df: pd.DataFrame):
+    """
+    Check that all required columns are present.
+    """
 
-    for column_name in needed_columns:
+    for column_name in NEEDED_COLUMNS:
         if column_name not in df.columns:
             raise MissingColumnError(column_name)
 
+
+def _validate_swift_codes(df: pd.DataFrame):
+    """
+    Check that every SWIFT code in the frame is valid.
+    """
+
     invalid_swift_code = df[~df['SWIFT CODE'].apply(is_valid_swift_code)]
     if not invalid_swift_code.empty:
         raise InvalidSwiftCodeError
 
-    duplicate_swift_code_exists = df['SWIFT CODE'].duplicated().any()
-    if duplicate_swift_code_exists:
-        raise DuplicateSwiftCodeError
+
+def _normalize(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Apply the formatting rules to a validated frame and return it as records.
+    """
 
     df.columns = df.columns.str.strip()
 
@@ -100,9 +86,110 @@ def parse_swift_data(file_path: str) -> List[Dict[str, Any]]:
     result_df = df[['swift_code', 'address', 'bank_name',
                     'country_ISO2', 'country_name', 'is_headquarter']]
 
-    result = result_df.to_dict(orient="records")
+    return result_df.to_dict(orient="records")
+
+
+def parse_swift_data(file_path: str) -> List[Dict[str, Any]]:
+    """
+    Parse and validate SWIFT code data from a CSV file.
+
+    This function reads a CSV file containing SWIFT code information,
+    validates its structure and content, and transforms it into a standardized format.
+    It applies business rules such as determining headquarter status based on the
+    SWIFT code ending with 'XXX' and standardizing country codes to uppercase.
+
+    Args:
+        file_path (str): Path to the CSV file containing SWIFT code data.
+
+    Returns:
+        List[Dict[str, Any]]: A list of dictionaries, each representing a SWIFT code entry
+        with standardized field names and formatted values.
+
+    Raises:
+        InvalidStringInputError: If the file path is empty, not a string, or contains only whitespace.
+        FileNotFoundError: If the file does not exist at the specified path.
+        InvalidFileExtensionError: If the file is not a CSV file.
+        pd.errors.ParserError: If the CSV file cannot be parsed due to formatting issues.
+        pd.errors.EmptyDataError: If the CSV file is empty.
+        MissingColumnError: If any required columns are missing from the CSV file.
+        InvalidSwiftCodeError: If any SWIFT codes in the file are not valid.
+        DuplicateSwiftCodeError: If the file contains duplicate SWIFT codes.
+    """
+
+    _validate_file_path(file_path)
+
+    try:
+        df = pd.read_csv(file_path)
+    except pd.errors.ParserError:
+        raise pd.errors.ParserError
+    except pd.errors.EmptyDataError:
+        raise pd.errors.EmptyDataError
+
+    _validate_columns(df)
+    _validate_swift_codes(df)
+
+    duplicate_swift_code_exists = df['SWIFT CODE'].duplicated().any()
+    if duplicate_swift_code_exists:
+        raise DuplicateSwiftCodeError
+
+    return _normalize(df)
+
+
+def iter_parse_swift_data(file_path: str, chunksize: int = 10000) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Parse and validate SWIFT code data from a CSV file in chunks.
+
+    Works like parse_swift_data, but reads the file `chunksize` rows at a time and
+    yields each chunk as soon as it is validated and normalized, so memory use does
+    not grow with the file size. Duplicate detection spans chunks; only the set of
+    SWIFT codes seen so far is kept in memory. All cells are read as strings so that
+    column types do not change from one chunk to the next.
+
+    Because chunks are yielded as they are read, an error in a later chunk is raised
+    after the earlier chunks have already been returned.
+
+    Args:
+        file_path (str): Path to the CSV file containing SWIFT code data.
+        chunksize (int): Number of rows read and yielded per chunk.
+
+    Yields:
+        List[Dict[str, Any]]: Records in the same format as parse_swift_data returns.
+
+    Raises:
+        InvalidStringInputError: If the file path is empty, not a string, or contains only whitespace.
+        FileNotFoundError: If the file does not exist at the specified path.
+        InvalidFileExtensionError: If the file is not a CSV file.
+        pd.errors.ParserError: If the CSV file cannot be parsed due to formatting issues.
+        pd.errors.EmptyDataError: If the CSV file is empty.
+        MissingColumnError: If any required columns are missing from the CSV file.
+        InvalidSwiftCodeError: If any SWIFT codes in the file are not valid.
+        DuplicateSwiftCodeError: If the file contains duplicate SWIFT codes.
+    """
+
+    _validate_file_path(file_path)
+
+    try:
+        reader = pd.read_csv(file_path, chunksize=chunksize, dtype=str)
+    except pd.errors.ParserError:
+        raise pd.errors.ParserError
+    except pd.errors.EmptyDataError:
+        raise pd.errors.EmptyDataError
+
+    seen_swift_codes = set()
+
+    with reader:
+        for chunk in reader:
+            _validate_columns(chunk)
+            _validate_swift_codes(chunk)
+
+            swift_codes = chunk['SWIFT CODE']
+            if swift_codes.duplicated().any() or not seen_swift_codes.isdisjoint(swift_codes):
+                raise DuplicateSwiftCodeError
+            seen_swift_codes.update(swift_codes)
 
-    return result
+            records = _normalize(chunk)
+            if records:
+                yield records
 
 
 if __name__ == "__main__":
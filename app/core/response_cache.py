@@ -0,0 +1,261 @@
+import abc
+import gzip
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Mapping, NamedTuple, Optional
+
+from fastapi import Request, Response
+
+from app.core.conditional import GZIP_ETAG_SUFFIX
+from app.core.config import get_settings
+from app.core.serialization import json_response
+from app.db.dataset_versions import record_scopes
+
+
+class CachedResponse(NamedTuple):
+    """
+    Pre-serialized response body, its gzip-compressed form (if enabled), the
+    ETag of the dataset version it was built from and headers that belong to
+    the body itself (e.g. the version of the record it describes).
+    """
+
+    body: bytes
+    gzipped: Optional[bytes]
+    etag: str
+    headers: Optional[Dict[str, str]] = None
+
+
+def country_key(country_code: str) -> str:
+    return f"country:{country_code.upper()}"
+
+
+def bank_key(swift_code: str) -> str:
+    return f"bank:{swift_code[:8].upper()}"
+
+
+def invalidation_keys(records: Iterable[Mapping[str, Any]]) -> set:
+    """
+    Return the cache keys affected by writing the given records: the country
+    listings they appear in and the headquarter entry of their bank.
+    """
+
+    records = list(records)
+    keys = {country_key(scope) for scope in record_scopes(records)}
+    keys.update(bank_key(record["swift_code"]) for record in records)
+    return keys
+
+
+class ResponseCache(abc.ABC):
+    """
+    Interface of a response cache backend.
+
+    Entries are looked up together with the ETag of the current dataset version;
+    an entry built from another version is treated as a miss. This keeps the
+    cache correct after writes made by other processes, which cannot
+    invalidate it directly.
+    """
+
+    compressed = False
+
+    @abc.abstractmethod
+    def get(self, key: str, etag: str) -> Optional[CachedResponse]:
+        ...
+
+    @abc.abstractmethod
+    def set(self, key: str, body: bytes, etag: str, headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+        ...
+
+    @abc.abstractmethod
+    def invalidate(self, keys: Iterable[str]):
+        ...
+
+    @abc.abstractmethod
+    def clear(self):
+        ...
+
+    @abc.abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+
+class NullResponseCache(ResponseCache):
+    """
+    Backend used when caching is disabled: stores nothing.
+    """
+
+    def get(self, key: str, etag: str) -> Optional[CachedResponse]:
+        return None
+
+    def set(self, key: str, body: bytes, etag: str, headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+        return CachedResponse(body, None, etag, headers)
+
+    def invalidate(self, keys: Iterable[str]):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "none"}
+
+
+class LRUResponseCache(ResponseCache):
+    """
+    In-process cache bounded by entry count and total size, with a TTL per entry.
+    The least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 256 * 1024 * 1024,
+                 ttl: float = 300.0, compress: bool = False):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.compressed = compress
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0,
+                          "expirations": 0, "invalidations": 0}
+
+    @staticmethod
+    def _entry_size(entry: CachedResponse) -> int:
+        return len(entry.body) + len(entry.gzipped or b"")
+
+    def _remove(self, key: str) -> bool:
+        item = self._entries.pop(key, None)
+        if item is None:
+            return False
+        self._size -= self._entry_size(item[0])
+        return True
+
+    def get(self, key: str, etag: str) -> Optional[CachedResponse]:
+        with self._lock:
+            item = self._entries.get(key)
+
+            if item is not None and item[1] <= time.monotonic():
+                self._remove(key)
+                self._counters["expirations"] += 1
+                item = None
+
+            if item is None or item[0].etag != etag:
+                self._counters["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return item[0]
+
+    def set(self, key: str, body: bytes, etag: str, headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+        entry = CachedResponse(body, gzip.compress(body) if self.compressed else None, etag, headers)
+        size = self._entry_size(entry)
+
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return entry
+
+            self._entries[key] = (entry, time.monotonic() + self.ttl)
+            self._size += size
+
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+        return entry
+
+    def invalidate(self, keys: Iterable[str]):
+        with self._lock:
+            for key in keys:
+                if self._remove(key):
+                    self._counters["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"backend": "lru", "entries": len(self._entries), "bytes": self._size,
+                    "maxEntries": self.max_entries, "maxBytes": self.max_bytes, **self._counters}
+
+
+BACKENDS = {
+    "none": lambda settings: NullResponseCache(),
+    "lru": lambda settings: LRUResponseCache(
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+        ttl=settings.RESPONSE_CACHE_TTL,
+        compress=settings.RESPONSE_CACHE_GZIP),
+}
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Return the active response cache, creating the backend named by
+    RESPONSE_CACHE_BACKEND on first use.
+    """
+
+    global _cache
+
+    if _cache is None:
+        settings = get_settings()
+        try:
+            factory = BACKENDS[settings.RESPONSE_CACHE_BACKEND]
+        except KeyError:
+            raise ValueError(f"Unknown response cache backend: {settings.RESPONSE_CACHE_BACKEND}. "
+                             f"Expected one of {tuple(BACKENDS)}")
+        _cache = factory(settings)
+
+    return _cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]):
+    """
+    Replace the active response cache. Passing None recreates it from the settings on next use.
+    """
+
+    global _cache
+
+    _cache = cache
+
+
+def _accepts_gzip(request: Request) -> bool:
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def representation_headers(request: Request, headers: Dict[str, str], compressed: bool) -> Dict[str, str]:
+    """
+    Adjust the validator headers for content negotiation when the cache stores
+    gzip-compressed bodies: responses vary on Accept-Encoding and the gzip
+    representation gets its own ETag.
+    """
+
+    if not compressed:
+        return headers
+
+    headers = {**headers, "Vary": "Accept-Encoding"}
+    if _accepts_gzip(request):
+        headers["ETag"] = headers["ETag"][:-1] + f'{GZIP_ETAG_SUFFIX}"'
+    return headers
+
+
+def cached_response(request: Request, entry: CachedResponse, headers: Dict[str, str]) -> Response:
+    """
+    Build the response for a cache entry, sending the pre-compressed body to
+    clients that accept gzip.
+    """
+
+    headers = representation_headers(request, {**headers, **(entry.headers or {})}, entry.gzipped is not None)
+    if headers["ETag"].endswith(f'{GZIP_ETAG_SUFFIX}"'):
+        return json_response(entry.gzipped, headers={**headers, "Content-Encoding": "gzip"})
+
+    return json_response(entry.body, headers=headers)
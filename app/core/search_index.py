@@ -0,0 +1,356 @@
+import heapq
+import threading
+from bisect import bisect_left
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.dataset_sync import applied_versions, country_changes, read_stale_countries, read_versions
+
+# Codes per chunk of a partition. A write copies only the chunks it changes.
+CHUNK_SIZE = 1024
+# Above this many changed codes a partition is rebuilt with one merge instead
+# of one insertion or deletion per code.
+MERGE_THRESHOLD = 1024
+
+PartitionKey = Tuple[Optional[str], Optional[bool]]
+
+
+def _partition_keys(record: Dict[str, Any]) -> Tuple[PartitionKey, ...]:
+    """
+    The partitions a record belongs to: every combination of "any" or its own
+    value for the country and headquarter filters.
+    """
+
+    country, headquarter = record["country_ISO2"], bool(record["is_headquarter"])
+    return (None, None), (country, None), (None, headquarter), (country, headquarter)
+
+
+class _Partition:
+    """
+    Sorted SWIFT codes and their records, split into chunks of about CHUNK_SIZE
+    codes with the last code of every chunk kept in `maxes`.
+
+    copy() duplicates only the lists of chunks, and insert() / remove() replace
+    the chunk they change with a modified copy, so a changed partition shares
+    all its other chunks with the one it was copied from.
+    """
+
+    __slots__ = ("maxes", "codes", "records", "count")
+
+    def __init__(self, codes: List[str] = (), records: List[Dict[str, Any]] = ()):
+        self.codes = [codes[start:start + CHUNK_SIZE] for start in range(0, len(codes), CHUNK_SIZE)]
+        self.records = [records[start:start + CHUNK_SIZE] for start in range(0, len(records), CHUNK_SIZE)]
+        self.maxes = [chunk[-1] for chunk in self.codes]
+        self.count = len(codes)
+
+    def __len__(self):
+        return self.count
+
+    def copy(self) -> "_Partition":
+        partition = _Partition()
+        partition.maxes, partition.codes, partition.records = list(self.maxes), list(self.codes), list(self.records)
+        partition.count = self.count
+        return partition
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for codes, records in zip(self.codes, self.records):
+            yield from zip(codes, records)
+
+    def get(self, swift_code: str) -> Optional[Dict[str, Any]]:
+        chunk = bisect_left(self.maxes, swift_code)
+        if chunk == len(self.maxes):
+            return None
+        position = bisect_left(self.codes[chunk], swift_code)
+        if self.codes[chunk][position] == swift_code:
+            return self.records[chunk][position]
+        return None
+
+    def search(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        results = []
+        chunk = bisect_left(self.maxes, prefix)
+        position = bisect_left(self.codes[chunk], prefix) if chunk < len(self.maxes) else 0
+
+        while chunk < len(self.maxes) and len(results) < limit:
+            codes, records = self.codes[chunk], self.records[chunk]
+            end = min(len(codes), position + limit - len(results))
+            for index in range(position, end):
+                if not codes[index].startswith(prefix):
+                    return results
+                results.append(records[index])
+            chunk, position = chunk + 1, 0
+
+        return results
+
+    def insert(self, swift_code: str, record: Dict[str, Any]):
+        if not self.maxes:
+            self.maxes, self.codes, self.records = [swift_code], [[swift_code]], [[record]]
+            self.count = 1
+            return
+
+        chunk = min(bisect_left(self.maxes, swift_code), len(self.maxes) - 1)
+        codes, records = list(self.codes[chunk]), list(self.records[chunk])
+        position = bisect_left(codes, swift_code)
+        codes.insert(position, swift_code)
+        records.insert(position, record)
+        self.count += 1
+
+        if len(codes) > 2 * CHUNK_SIZE:
+            half = len(codes) // 2
+            self.codes[chunk:chunk + 1] = [codes[:half], codes[half:]]
+            self.records[chunk:chunk + 1] = [records[:half], records[half:]]
+            self.maxes[chunk:chunk + 1] = [codes[half - 1], codes[-1]]
+        else:
+            self.codes[chunk], self.records[chunk], self.maxes[chunk] = codes, records, codes[-1]
+
+    def remove(self, swift_code: str):
+        chunk = bisect_left(self.maxes, swift_code)
+        if chunk == len(self.maxes):
+            return
+
+        codes, records = list(self.codes[chunk]), list(self.records[chunk])
+        position = bisect_left(codes, swift_code)
+        if codes[position] != swift_code:
+            return
+        del codes[position]
+        del records[position]
+        self.count -= 1
+
+        if codes:
+            self.codes[chunk], self.records[chunk], self.maxes[chunk] = codes, records, codes[-1]
+        else:
+            del self.codes[chunk], self.records[chunk], self.maxes[chunk]
+
+
+class SwiftCodeIndex:
+    """
+    Immutable prefix search index over SWIFT codes.
+
+    Codes are kept in sorted arrays, one per combination of the country and
+    headquarter filters, so that a prefix search with any filters is a binary
+    search followed by a scan of at most `limit` codes. Like the read snapshot,
+    an index is never modified in place; writes produce a new index which is
+    then swapped in atomically. The arrays are chunked, so a new index shares
+    every chunk that a write did not change with the previous one. `versions`
+    holds the dataset versions the index reflects, so that writes made by
+    other processes can be detected and synchronised.
+    """
+
+    __slots__ = ("partitions", "versions")
+
+    def __init__(self, records: Dict[str, Dict[str, Any]], partitions: Optional[Dict[PartitionKey, _Partition]] = None,
+                 versions: Optional[Mapping[str, int]] = None):
+        self.versions = dict(versions or {})
+
+        if partitions is None:
+            grouped: Dict[PartitionKey, Tuple[List[str], List[Dict[str, Any]]]] = {}
+            for swift_code in sorted(records):
+                record = records[swift_code]
+                for key in _partition_keys(record):
+                    codes, partition_records = grouped.setdefault(key, ([], []))
+                    codes.append(swift_code)
+                    partition_records.append(record)
+            partitions = {key: _Partition(codes, partition_records)
+                          for key, (codes, partition_records) in grouped.items()}
+
+        self.partitions = partitions
+
+    def __len__(self):
+        partition = self.partitions.get((None, None))
+        return len(partition) if partition is not None else 0
+
+    def get(self, swift_code: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the record of a SWIFT code, or None if it is not indexed.
+        """
+
+        partition = self.partitions.get((None, None))
+        return partition.get(swift_code) if partition is not None else None
+
+    def search(self, prefix: str, limit: int, country: Optional[str] = None,
+               headquarter: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Return at most `limit` records whose SWIFT code starts with `prefix`, in code order.
+
+        Args:
+            prefix (str): Upper-case start of the SWIFT code.
+            limit (int): Maximum number of records to return.
+            country (Optional[str]): Only return codes of this upper-case ISO2 country code.
+            headquarter (Optional[bool]): Only return headquarters (True) or branches (False).
+        """
+
+        partition = self.partitions.get((country, headquarter))
+        if partition is None:
+            return []
+        return partition.search(prefix, limit)
+
+    def with_changes(self, upserted: Iterable[Dict[str, Any]] = (), deleted: Iterable[str] = (),
+                     versions: Optional[Mapping[str, int]] = None) -> "SwiftCodeIndex":
+        """
+        Return a new index with the given records added or replaced, the given
+        SWIFT codes removed and the given dataset versions recorded. The
+        current index is left untouched.
+        """
+
+        changes: Dict[str, Optional[Dict[str, Any]]] = {swift_code: None for swift_code in deleted}
+        changes.update((record["swift_code"], dict(record)) for record in upserted)
+
+        removed: Dict[PartitionKey, set] = {}
+        added: Dict[PartitionKey, Dict[str, Dict[str, Any]]] = {}
+        for swift_code, record in changes.items():
+            previous = self.get(swift_code)
+            if previous is not None:
+                for key in _partition_keys(previous):
+                    removed.setdefault(key, set()).add(swift_code)
+            if record is not None:
+                for key in _partition_keys(record):
+                    added.setdefault(key, {})[swift_code] = record
+
+        partitions = dict(self.partitions)
+        for key in removed.keys() | added.keys():
+            gone, new = removed.get(key, set()), added.get(key, {})
+            partition = partitions.get(key) or _Partition()
+
+            if len(gone) + len(new) > MERGE_THRESHOLD:
+                kept = ((code, record) for code, record in partition.items() if code not in gone)
+                merged = list(heapq.merge(kept, sorted(new.items()), key=itemgetter(0)))
+                partition = _Partition([code for code, _ in merged], [record for _, record in merged])
+            else:
+                partition = partition.copy()
+                for swift_code in gone:
+                    partition.remove(swift_code)
+                for swift_code, record in new.items():
+                    partition.insert(swift_code, record)
+
+            if partition:
+                partitions[key] = partition
+            else:
+                partitions.pop(key, None)
+
+        return SwiftCodeIndex({}, partitions, {**self.versions, **(versions or {})})
+
+    def synchronized(self, scopes: Iterable[str], rows: Iterable[Mapping[str, Any]],
+                     versions: Mapping[str, int]) -> "SwiftCodeIndex":
+        """
+        Return a new index in which the records of some countries are replaced
+        by their rows in the database.
+
+        Args:
+            scopes (Iterable[str]): ISO2 codes of the countries to synchronise.
+            rows (Iterable[Mapping[str, Any]]): Every row stored with one of these countries.
+            versions (Mapping[str, int]): Dataset versions when the rows were read.
+        """
+
+        held = [record for scope in scopes for _, record in self.partitions.get((scope, None), _Partition()).items()]
+        upserted, deleted = country_changes(rows, held, self.get)
+
+        return self.with_changes(upserted, deleted, versions)
+
+
+_index: Optional[SwiftCodeIndex] = None
+_write_lock = threading.Lock()
+
+
+def get_search_index() -> Optional[SwiftCodeIndex]:
+    """
+    Return the active search index, or None when it is disabled or not built yet.
+    """
+
+    return _index
+
+
+def load_search_index(bind) -> SwiftCodeIndex:
+    """
+    Build the search index and make it the active one. The records and dataset
+    versions of the read snapshot are reused when it is loaded; otherwise they
+    are read from the swift_codes table, the versions first.
+
+    Args:
+        bind: SQLAlchemy engine or connection to read the table from.
+
+    Returns:
+        SwiftCodeIndex: The freshly built index.
+    """
+
+    global _index
+
+    from app.core.snapshot import get_snapshot
+    from app.models.swift_code import swift_codes
+
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        records, versions = dict(snapshot.items()), snapshot.versions
+    else:
+        with bind.connect() as conn:
+            versions = read_versions(conn)
+            rows = conn.execute(select(swift_codes)).mappings()
+            records = {row["swift_code"]: dict(row) for row in rows}
+
+    index = SwiftCodeIndex(records, versions=versions)
+    with _write_lock:
+        _index = index
+
+    return index
+
+
+def apply_search_index_changes(upserted: Iterable[Dict[str, Any]] = (), deleted: Iterable[str] = (),
+                               scopes: Iterable[str] = ()):
+    """
+    Apply committed writes to the active search index, if there is one.
+
+    Args:
+        upserted: Records added or replaced by the write.
+        deleted: SWIFT codes removed by the write.
+        scopes: Countries whose dataset version the write incremented, once each.
+    """
+
+    global _index
+
+    with _write_lock:
+        if _index is not None:
+            _index = _index.with_changes(upserted, deleted, applied_versions(_index.versions, scopes))
+
+
+async def refresh_search_index(db) -> Optional[SwiftCodeIndex]:
+    """
+    Bring the active search index up to date with writes made by other
+    processes, such as loader runs and other workers, and return it.
+
+    Args:
+        db (AsyncSession): Session to read the versions and rows from.
+
+    Returns:
+        Optional[SwiftCodeIndex]: The up-to-date index, or None when there is no index.
+    """
+
+    global _index
+
+    from app.models.swift_code import swift_codes
+
+    index = _index
+    if index is None:
+        return None
+
+    changes = await read_stale_countries(db, index.versions, [swift_codes])
+    if changes is None:
+        return index
+
+    synchronized = index.synchronized(*changes)
+    with _write_lock:
+        # A write applied while the rows were read may be missing from them;
+        # the next search synchronises again in that case.
+        if _index is index:
+            _index = synchronized
+        return _index
+
+
+def clear_search_index():
+    """
+    Drop the active search index so that searches go back to the database.
+    """
+
+    global _index
+
+    with _write_lock:
+        _index = None
@@ -0,0 +1,129 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Type
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.schemes.SwiftCodeBranch import SwiftCodeBranch
+from app.schemes.SwiftCodeResponse import SwiftCodeResponse
+
+# Response field name -> record (database column) name.
+RECORD_FIELDS = {
+    "address": "address",
+    "bankName": "bank_name",
+    "countryISO2": "country_ISO2",
+    "countryName": "country_name",
+    "isHeadquarter": "is_headquarter",
+    "swiftCode": "swift_code",
+}
+
+
+def _compile(scheme: Type[BaseModel]) -> Tuple[Tuple[str, str, bool], ...]:
+    """
+    Derive a serialization plan from a response scheme: the JSON keys in
+    declaration order, the record key each one is read from, and whether the
+    field is a string (None is written as an empty string).
+    """
+
+    return tuple((name, RECORD_FIELDS[name], field.annotation is str)
+                 for name, field in scheme.model_fields.items() if name in RECORD_FIELDS)
+
+
+SWIFT_CODE_PLAN = _compile(SwiftCodeResponse)
+BRANCH_PLAN = _compile(SwiftCodeBranch)
+
+
+def _serialize(plan, record: Mapping[str, Any]) -> Dict[str, Any]:
+    data = {}
+    for key, source, is_string in plan:
+        value = record[source]
+        data[key] = "" if value is None and is_string else value
+    return data
+
+
+def serialize_swift_code(record: Mapping[str, Any], branches: Optional[Iterable[Mapping[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Serialize a record the way SwiftCodeResponse / SwiftCodeWithBranches would.
+    Headquarters get their branches attached when a branch list is given.
+    """
+
+    data = _serialize(SWIFT_CODE_PLAN, record)
+    if record["is_headquarter"] and branches is not None:
+        data["branches"] = [_serialize(BRANCH_PLAN, branch)
+                            for branch in branches]
+    return data
+
+
+def serialize_branch(record: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Serialize a record the way SwiftCodeBranch would.
+    """
+
+    return _serialize(BRANCH_PLAN, record)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode already serialized content as JSON bytes.
+    """
+
+    return orjson.dumps(content)
+
+
+def json_response(content: bytes, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Wrap pre-encoded JSON bytes in a response, bypassing response_model validation.
+    """
+
+    return Response(content=content, status_code=status_code,
+                    headers=headers, media_type="application/json")
+
+
+def swift_code_json(record: Mapping[str, Any], branches: Optional[Iterable[Mapping[str, Any]]] = None) -> bytes:
+    """
+    Encode a single SWIFT code (with its branches for headquarters) as JSON bytes.
+    """
+
+    return orjson.dumps(serialize_swift_code(record, branches))
+
+
+def country_json(country_code: str, country_name: str, records: Iterable[Mapping[str, Any]]) -> bytes:
+    """
+    Encode a country listing as JSON bytes, matching SwiftCodesByCountryResponse.
+    """
+
+    return orjson.dumps({
+        "countryISO2": country_code,
+        "countryName": country_name,
+        "swiftCodes": [_serialize(BRANCH_PLAN, record) for record in records]
+    })
+
+
+def search_json(prefix: str, records: Iterable[Mapping[str, Any]]) -> bytes:
+    """
+    Encode prefix search results as JSON bytes, matching SwiftCodeSearchResponse.
+    """
+
+    return orjson.dumps({
+        "prefix": prefix,
+        "swiftCodes": [_serialize(BRANCH_PLAN, record) for record in records]
+    })
+
+
+def text_search_json(query: str, matches: Iterable[Tuple[float, Mapping[str, Any]]]) -> bytes:
+    """
+    Encode text search results as JSON bytes, matching SwiftCodeTextSearchResponse.
+    """
+
+    return orjson.dumps({
+        "query": query,
+        "swiftCodes": [{**_serialize(BRANCH_PLAN, record), "score": score} for score, record in matches]
+    })
+
+
+def lookup_json(found: Dict[str, Dict[str, Any]], missing: List[str]) -> bytes:
+    """
+    Encode a batch lookup result as JSON bytes, matching SwiftCodeLookupResponse.
+    """
+
+    return orjson.dumps({"found": found, "missing": missing})
@@ -0,0 +1,309 @@
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.dataset_sync import applied_versions, country_changes, read_stale_countries, read_versions, stale_scopes
+from app.db.dataset_versions import GLOBAL_SCOPE
+from custom_exceptions.InvalidDirectoryFileError import InvalidDirectoryFileError
+
+
+# Number of shards the records are split into by bank prefix.
+SHARDS = 1024
+
+Shard = Tuple[Dict[str, Dict[str, Any]], Dict[str, tuple]]
+
+
+def _shard_number(swift_code: str) -> int:
+    return hash(swift_code[:8]) % SHARDS
+
+
+class SwiftCodeSnapshot:
+    """
+    Immutable in-memory copy of the swift_codes table.
+
+    Records are split into SHARDS shards by their 8-character bank prefix. Each
+    shard holds a dictionary keyed by the full SWIFT code and a secondary index
+    keyed by the bank prefix, so that a headquarter and its branches can be
+    resolved without touching the database.
+    A snapshot is never modified in place; writes produce a new snapshot which
+    is then swapped in atomically, and which shares every shard the write did
+    not touch with the previous one. `versions` holds the dataset versions the
+    snapshot reflects, so that writes made by other processes can be detected
+    and synchronised.
+    """
+
+    __slots__ = ("shards", "count", "versions")
+
+    def __init__(self, codes: Mapping[str, Dict[str, Any]], versions: Optional[Mapping[str, int]] = None):
+        self.versions = dict(versions or {})
+        self.count = len(codes)
+
+        grouped: List[Tuple[Dict[str, Dict[str, Any]], Dict[str, List[str]]]] = [({}, {}) for _ in range(SHARDS)]
+        for swift_code, record in codes.items():
+            shard_codes, banks = grouped[_shard_number(swift_code)]
+            shard_codes[swift_code] = record
+            banks.setdefault(swift_code[:8], []).append(swift_code)
+
+        self.shards: List[Shard] = [
+            (shard_codes, {prefix: tuple(sorted(members)) for prefix, members in banks.items()})
+            for shard_codes, banks in grouped]
+
+    def __len__(self):
+        return self.count
+
+    def get(self, swift_code: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the record for a SWIFT code, or None if it does not exist.
+        """
+
+        return self.shards[_shard_number(swift_code)][0].get(swift_code)
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over the SWIFT codes and their records, in no particular order.
+        """
+
+        for shard_codes, _ in self.shards:
+            yield from shard_codes.items()
+
+    def branches(self, headquarter_code: str) -> List[Dict[str, Any]]:
+        """
+        Return the branch records that belong to a headquarter SWIFT code.
+
+        Mirrors the database query: every code sharing the 8-character bank
+        prefix, excluding the headquarter itself and any other 'XXX' code.
+        """
+
+        swift_base = headquarter_code[:8]
+        headquarter_alias = f"{swift_base}XXX"
+        shard_codes, banks = self.shards[_shard_number(swift_base)]
+
+        return [shard_codes[code] for code in banks.get(swift_base, ())
+                if code != headquarter_code and code != headquarter_alias]
+
+    def with_changes(self, upserted: Iterable[Dict[str, Any]] = (), deleted: Iterable[str] = (),
+                     versions: Optional[Mapping[str, int]] = None) -> "SwiftCodeSnapshot":
+        """
+        Return a new snapshot with the given records added or replaced, the
+        given SWIFT codes removed and the given dataset versions recorded. The
+        current snapshot is left untouched.
+
+        Only the shards of the banks the write touches are copied; every other
+        shard is shared with the current snapshot.
+        """
+
+        shards = list(self.shards)
+        copied = set()
+        count = self.count
+        touched: Dict[str, set] = {}
+
+        def writable(swift_code: str) -> Shard:
+            number = _shard_number(swift_code)
+            if number not in copied:
+                shard_codes, banks = shards[number]
+                shards[number] = (dict(shard_codes), dict(banks))
+                copied.add(number)
+            return shards[number]
+
+        for swift_code in deleted:
+            shard_codes, _ = writable(swift_code)
+            if shard_codes.pop(swift_code, None) is not None:
+                count -= 1
+                touched.setdefault(swift_code[:8], set())
+
+        for record in upserted:
+            swift_code = record["swift_code"]
+            shard_codes, _ = writable(swift_code)
+            if swift_code not in shard_codes:
+                count += 1
+            shard_codes[swift_code] = dict(record)
+            touched.setdefault(swift_code[:8], set()).add(swift_code)
+
+        for prefix, added in touched.items():
+            shard_codes, banks = writable(prefix)
+            members = {code for code in banks.get(prefix, ()) if code in shard_codes}
+            members.update(added)
+            if members:
+                banks[prefix] = tuple(sorted(members))
+            else:
+                banks.pop(prefix, None)
+
+        snapshot = SwiftCodeSnapshot.__new__(SwiftCodeSnapshot)
+        snapshot.shards, snapshot.count = shards, count
+        snapshot.versions = {**self.versions, **(versions or {})}
+        return snapshot
+
+    def synchronized(self, scopes: Iterable[str], rows: Iterable[Mapping[str, Any]],
+                     versions: Mapping[str, int]) -> "SwiftCodeSnapshot":
+        """
+        Return a new snapshot in which the records of some countries are
+        replaced by their rows in the database.
+
+        Args:
+            scopes (Iterable[str]): ISO2 codes of the countries to synchronise.
+            rows (Iterable[Mapping[str, Any]]): Every row stored with one of these countries.
+            versions (Mapping[str, int]): Dataset versions when the rows were read.
+        """
+
+        scopes = set(scopes)
+        held = [record for _, record in self.items() if record["country_ISO2"] in scopes]
+        upserted, deleted = country_changes(rows, held, self.get)
+
+        return self.with_changes(upserted, deleted, versions)
+
+
+_snapshot: Optional[SwiftCodeSnapshot] = None
+_write_lock = threading.Lock()
+
+
+def get_snapshot() -> Optional[SwiftCodeSnapshot]:
+    """
+    Return the active snapshot, or None when the snapshot is disabled or not loaded yet.
+    """
+
+    return _snapshot
+
+
+def load_snapshot(bind) -> SwiftCodeSnapshot:
+    """
+    Build a snapshot from the swift_codes table and make it the active one.
+
+    The dataset versions are read first, in the same transaction as the rows,
+    so that anything written after them is picked up by refresh_snapshot.
+
+    Args:
+        bind: SQLAlchemy engine or connection to read the table from.
+
+    Returns:
+        SwiftCodeSnapshot: The freshly loaded snapshot.
+    """
+
+    global _snapshot
+
+    from app.models.swift_code import swift_codes
+
+    with bind.connect() as conn:
+        versions = read_versions(conn)
+        rows = conn.execute(select(swift_codes)).mappings()
+        codes = {row["swift_code"]: dict(row) for row in rows}
+
+    snapshot = SwiftCodeSnapshot(codes, versions=versions)
+    with _write_lock:
+        _snapshot = snapshot
+
+    return snapshot
+
+
+def load_snapshot_file(path: str, bind) -> SwiftCodeSnapshot:
+    """
+    Build a snapshot from a directory file compiled by compile_database and
+    make it the active one.
+
+    The file records the dataset versions it was compiled at. The countries
+    whose version moved since then are read again from the database, so the
+    snapshot is as current as one loaded by load_snapshot, while the rest of
+    the table is not read at all.
+
+    Args:
+        path (str): Path of the directory file.
+        bind: SQLAlchemy engine or connection to read the versions and the changed countries from.
+
+    Returns:
+        SwiftCodeSnapshot: The freshly loaded snapshot.
+
+    Raises:
+        InvalidDirectoryFileError: If the file is not a directory file, or was compiled
+            from a CSV file and so cannot tell which rows changed since.
+    """
+
+    global _snapshot
+
+    from app.core.directory_file import DirectoryFile
+    from app.models.swift_code import swift_codes
+
+    with DirectoryFile(path) as directory:
+        if directory.versions is None:
+            raise InvalidDirectoryFileError(
+                f"Directory file has no dataset versions; compile it with --database: {path}")
+        snapshot = SwiftCodeSnapshot({record["swift_code"]: record for record in directory.records()},
+                                     versions=directory.versions)
+
+    with bind.connect() as conn:
+        versions = read_versions(conn)
+        if snapshot.versions.get(GLOBAL_SCOPE, 0) != versions.get(GLOBAL_SCOPE, 0):
+            scopes = stale_scopes(snapshot.versions, versions)
+            rows = []
+            if scopes:
+                rows = conn.execute(select(swift_codes).where(swift_codes.c.country_ISO2.in_(scopes))).mappings().all()
+            snapshot = snapshot.synchronized(scopes, rows, {scope: versions[scope] for scope in (*scopes, GLOBAL_SCOPE)})
+
+    with _write_lock:
+        _snapshot = snapshot
+
+    return snapshot
+
+
+def apply_snapshot_changes(upserted: Iterable[Dict[str, Any]] = (), deleted: Iterable[str] = (),
+                           scopes: Iterable[str] = ()):
+    """
+    Apply committed writes to the active snapshot, if there is one.
+
+    Writers are serialized so that concurrent commits cannot lose each other's
+    changes; readers keep using the previous snapshot until the swap.
+
+    Args:
+        upserted: Records added or replaced by the write.
+        deleted: SWIFT codes removed by the write.
+        scopes: Countries whose dataset version the write incremented, once each.
+    """
+
+    global _snapshot
+
+    with _write_lock:
+        if _snapshot is not None:
+            _snapshot = _snapshot.with_changes(upserted, deleted, applied_versions(_snapshot.versions, scopes))
+
+
+async def refresh_snapshot(db) -> Optional[SwiftCodeSnapshot]:
+    """
+    Bring the active snapshot up to date with writes made by other processes,
+    such as loader runs and other workers, and return it.
+
+    Args:
+        db (AsyncSession): Session to read the versions and rows from.
+
+    Returns:
+        Optional[SwiftCodeSnapshot]: The up-to-date snapshot, or None when there is no snapshot.
+    """
+
+    global _snapshot
+
+    from app.models.swift_code import swift_codes
+
+    snapshot = _snapshot
+    if snapshot is None:
+        return None
+
+    changes = await read_stale_countries(db, snapshot.versions, [swift_codes])
+    if changes is None:
+        return snapshot
+
+    synchronized = snapshot.synchronized(*changes)
+    with _write_lock:
+        # A write applied while the rows were read may be missing from them;
+        # the next request synchronises again in that case.
+        if _snapshot is snapshot:
+            _snapshot = synchronized
+        return _snapshot
+
+
+def clear_snapshot():
+    """
+    Drop the active snapshot so that lookups go back to the database.
+    """
+
+    global _snapshot
+
+    with _write_lock:
+        _snapshot = None
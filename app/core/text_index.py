@@ -0,0 +1,570 @@
+import heapq
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+
+from app.core.dataset_sync import (RECORD_FIELDS, applied_versions, country_changes, read_stale_countries,
+                                   read_versions, stale_scopes)
+
+# Record fields that are searched, in the order of their field numbers.
+FIELDS = ("bank_name", "address")
+# Postings of the stored country, used to find the documents of a country when
+# it is synchronised with the database. Never searched.
+COUNTRY_FIELD = len(FIELDS)
+
+# Shards of the code and posting maps. A write copies only the shards it changes.
+SHARDS = 1024
+# Documents per chunk of the document table. A write copies only the chunks it changes.
+CHUNK_SIZE = 1024
+# Share of removed documents, against live ones, past which a write rebuilds the
+# index so that the document table and posting lists stop growing.
+COMPACTION_RATIO = 0.25
+# Removed documents below which an index is never rebuilt.
+MIN_COMPACTION = 1024
+# Minimum trigram similarity for an indexed word to match a query word.
+SIMILARITY_THRESHOLD = 0.5
+# Most similar indexed words a query word is expanded to.
+MAX_EXPANSIONS = 16
+# Shorter words, and words with digits, are only matched exactly.
+MIN_FUZZY_LENGTH = 3
+
+_WORD = re.compile(r"[^\W_]+")
+
+Match = Tuple[float, Dict[str, Any]]
+
+
+def words(text: Optional[str]) -> Set[str]:
+    """
+    Split a text into its distinct upper-case words.
+    """
+
+    return set(_WORD.findall(text.upper())) if text else set()
+
+
+def trigrams(word: str) -> Set[str]:
+    """
+    Return the trigrams of a word, padded so that its first letters count more
+    than its last ones: "BANK" gives $$B, $BA, BAN, ANK and NK$.
+    """
+
+    padded = f"$${word}$"
+    return {padded[start:start + 3] for start in range(len(padded) - 2)}
+
+
+def _is_fuzzy(word: str) -> bool:
+    return len(word) >= MIN_FUZZY_LENGTH and word.isalpha()
+
+
+def _best_similarity(matches: List[Tuple[float, List[array]]], doc_id: int) -> Optional[float]:
+    """
+    Return the similarity of the first of the matches, most similar first,
+    whose posting lists contain a document, or None if none does.
+    """
+
+    for similarity, posting_lists in matches:
+        for doc_ids in posting_lists:
+            position = bisect_left(doc_ids, doc_id)
+            if position < len(doc_ids) and doc_ids[position] == doc_id:
+                return similarity
+    return None
+
+
+class _ShardedMap:
+    """
+    A dictionary split into SHARDS smaller ones by key hash.
+
+    copy() duplicates only the list of shards, and the first write to a shard
+    after that replaces it with a modified copy, so a copy shares every shard
+    it has not written to with the map it was copied from.
+    """
+
+    __slots__ = ("shards", "owned", "count")
+
+    def __init__(self):
+        self.shards = [{} for _ in range(SHARDS)]
+        self.owned = set(range(SHARDS))
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def copy(self) -> "_ShardedMap":
+        copied = _ShardedMap.__new__(_ShardedMap)
+        copied.shards, copied.owned, copied.count = list(self.shards), set(), self.count
+        return copied
+
+    def get(self, key, default=None):
+        return self.shards[hash(key) % SHARDS].get(key, default)
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        for shard in self.shards:
+            yield from shard.items()
+
+    def _writable(self, key) -> dict:
+        number = hash(key) % SHARDS
+        if number not in self.owned:
+            self.shards[number] = dict(self.shards[number])
+            self.owned.add(number)
+        return self.shards[number]
+
+    def set(self, key, value):
+        shard = self._writable(key)
+        if key not in shard:
+            self.count += 1
+        shard[key] = value
+
+    def pop(self, key):
+        shard = self._writable(key)
+        if key in shard:
+            self.count -= 1
+            del shard[key]
+
+
+class _Documents:
+    """
+    Records by document id, in chunks of CHUNK_SIZE. Ids are handed out in
+    increasing order and never reused, so appending to a posting list keeps it
+    sorted; a removed document leaves a tombstone (None), counted in
+    `tombstones`, until the index is rebuilt. Like _ShardedMap, a copy shares
+    every chunk it has not written to.
+    """
+
+    __slots__ = ("chunks", "owned", "next_id", "tombstones")
+
+    def __init__(self):
+        self.chunks: List[List[Optional[Dict[str, Any]]]] = []
+        self.owned: Set[int] = set()
+        self.next_id = 0
+        self.tombstones = 0
+
+    def copy(self) -> "_Documents":
+        copied = _Documents()
+        copied.chunks, copied.next_id, copied.tombstones = list(self.chunks), self.next_id, self.tombstones
+        return copied
+
+    def get(self, doc_id: int) -> Optional[Dict[str, Any]]:
+        chunk, position = divmod(doc_id, CHUNK_SIZE)
+        return self.chunks[chunk][position]
+
+    def _writable(self, chunk: int) -> list:
+        if chunk not in self.owned:
+            self.chunks[chunk] = list(self.chunks[chunk])
+            self.owned.add(chunk)
+        return self.chunks[chunk]
+
+    def append(self, record: Dict[str, Any]) -> int:
+        doc_id = self.next_id
+        chunk, position = divmod(doc_id, CHUNK_SIZE)
+        if position == 0:
+            self.chunks.append([])
+            self.owned.add(chunk)
+        self._writable(chunk).append(record)
+        self.next_id += 1
+        return doc_id
+
+    def replace(self, doc_id: int, record: Optional[Dict[str, Any]]):
+        chunk, position = divmod(doc_id, CHUNK_SIZE)
+        self._writable(chunk)[position] = record
+
+    def remove(self, doc_id: int):
+        self.replace(doc_id, None)
+        self.tombstones += 1
+
+
+class TextIndex:
+    """
+    Immutable n-gram index for fuzzy searches over bank names and addresses.
+
+    Every record is a document whose bank name and address are split into
+    words, with a sorted posting list of document ids per field and word. A
+    query word matches the indexed words that share enough trigrams with it,
+    which makes searches tolerant to typos, and a document must match every
+    query word that matches anything. Documents are ranked by the similarity of
+    their best matching words.
+
+    Like the search index, a text index is never modified in place; writes
+    produce a new index which is then swapped in atomically. The new index
+    shares every shard, chunk and posting list that a write did not change.
+    `versions` holds the dataset versions of the countries the index reflects,
+    so that loads made by other processes can be detected and synchronised.
+    """
+
+    __slots__ = ("codes", "documents", "postings", "grams", "versions")
+
+    def __init__(self, records: Optional[Mapping[str, Dict[str, Any]]] = None, versions: Optional[Mapping[str, int]] = None):
+        self.codes = _ShardedMap()
+        self.documents = _Documents()
+        self.versions = dict(versions or {})
+
+        postings: Dict[Tuple[int, str], array] = {}
+        for swift_code in sorted(records or {}):
+            record = records[swift_code]
+            doc_id = self.documents.append(record)
+            self.codes.set(swift_code, doc_id)
+            for key in self._posting_keys(record):
+                doc_ids = postings.get(key)
+                if doc_ids is None:
+                    doc_ids = postings[key] = array("I")
+                doc_ids.append(doc_id)
+
+        self.postings = _ShardedMap()
+        grams: Dict[str, Set[str]] = {}
+        for key, doc_ids in postings.items():
+            self.postings.set(key, doc_ids)
+            field_number, word = key
+            if field_number != COUNTRY_FIELD and _is_fuzzy(word):
+                for gram in trigrams(word):
+                    grams.setdefault(gram, set()).add(word)
+        self.grams = {gram: frozenset(gram_words) for gram, gram_words in grams.items()}
+
+    def __len__(self):
+        return len(self.codes)
+
+    @staticmethod
+    def _posting_keys(record: Mapping[str, Any]) -> Iterator[Tuple[int, str]]:
+        for field_number, field in enumerate(FIELDS):
+            for word in words(record[field]):
+                yield field_number, word
+        yield COUNTRY_FIELD, record["country_ISO2"]
+
+    def get(self, swift_code: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the record of a SWIFT code, or None if it is not indexed.
+        """
+
+        doc_id = self.codes.get(swift_code)
+        return self.documents.get(doc_id) if doc_id is not None else None
+
+    def country_records(self, country: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the records stored with a country ISO2 code.
+        """
+
+        for doc_id in self.postings.get((COUNTRY_FIELD, country), ()):
+            yield self.documents.get(doc_id)
+
+    def _expand(self, word: str, field_numbers: Sequence[int]) -> List[Tuple[float, List[array]]]:
+        """
+        Find the indexed words matching a query word, with their similarity and
+        posting lists in the searched fields, most similar first.
+        """
+
+        similarities = {word: 1.0}
+        if _is_fuzzy(word):
+            query_grams = trigrams(word)
+            shared = Counter()
+            for gram in query_grams:
+                shared.update(self.grams.get(gram, ()))
+            for candidate, count in shared.items():
+                similarity = 2 * count / (len(query_grams) + len(trigrams(candidate)))
+                if similarity >= SIMILARITY_THRESHOLD and candidate != word:
+                    similarities[candidate] = similarity
+
+        matches = []
+        for candidate, similarity in sorted(similarities.items(), key=lambda item: (-item[1], item[0])):
+            posting_lists = [doc_ids for field_number in field_numbers
+                             if (doc_ids := self.postings.get((field_number, candidate))) is not None]
+            if posting_lists:
+                matches.append((similarity, posting_lists))
+                if len(matches) == MAX_EXPANSIONS:
+                    break
+        return matches
+
+    def search(self, query: str, limit: int, fields: Sequence[str] = FIELDS) -> List[Match]:
+        """
+        Return at most `limit` records matching a free-text query, best first,
+        with their scores.
+
+        A score is the mean similarity of the query words to the best matching
+        word of the record, from 0 to 1, where 1 means that every query word was
+        found as is. Query words that match no indexed word lower the score of
+        every result; if no query word matches anything there are no results.
+        Records with equal scores come in index order.
+
+        Args:
+            query (str): Words to look for; case does not matter.
+            limit (int): Maximum number of records to return.
+            fields (Sequence[str]): Record fields to search, by default the bank name and the address.
+        """
+
+        query_words = list(dict.fromkeys(_WORD.findall(query.upper())))
+        field_numbers = [FIELDS.index(field) for field in fields]
+        expansions = [matches for matches in (self._expand(word, field_numbers) for word in query_words) if matches]
+        if not expansions:
+            return []
+
+        # Candidates come from the query word with the fewest postings; every other
+        # matched query word is then checked per candidate with a binary search.
+        expansions.sort(key=lambda matches: sum(len(doc_ids) for _, lists in matches for doc_ids in lists))
+        pivot, others = expansions[0], expansions[1:]
+        best_others = sum(matches[0][0] for matches in others)
+
+        results: List[Tuple[float, int, int]] = []
+        seen: Set[int] = set()
+        for similarity, posting_lists in pivot:
+            bound = (similarity + best_others) / len(query_words) - 1e-9
+            if len(results) == limit and results[0][0] >= bound:
+                break
+
+            for doc_ids in posting_lists:
+                for doc_id in doc_ids:
+                    if doc_id in seen:
+                        continue
+                    seen.add(doc_id)
+
+                    score = similarity
+                    for matches in others:
+                        other_similarity = _best_similarity(matches, doc_id)
+                        if other_similarity is None:
+                            break
+                        score += other_similarity
+                    else:
+                        heapq.heappush(results, (score / len(query_words), -len(seen), doc_id))
+                        if len(results) > limit:
+                            heapq.heappop(results)
+                        # Nothing later in this pivot word can score higher than what is kept.
+                        if len(results) == limit and results[0][0] >= bound:
+                            break
+                else:
+                    continue
+                break
+
+        return [(round(score, 4), self.documents.get(doc_id))
+                for score, _, doc_id in sorted(results, reverse=True)]
+
+    def stale_scopes(self, versions: Mapping[str, int]) -> Set[str]:
+        """
+        Return the countries whose dataset version differs from the one the index reflects.
+        """
+
+        return stale_scopes(self.versions, versions)
+
+    def with_changes(self, upserted: Iterable[Dict[str, Any]] = (), deleted: Iterable[str] = (),
+                     versions: Optional[Mapping[str, int]] = None) -> "TextIndex":
+        """
+        Return a new index with the given records added or replaced, the given
+        SWIFT codes removed and the given dataset versions recorded. The current
+        index is left untouched.
+
+        Once the removed documents pass COMPACTION_RATIO of the live ones, the
+        new index is rebuilt from its records instead of sharing the old parts.
+        """
+
+        changes: Dict[str, Optional[Dict[str, Any]]] = {swift_code: None for swift_code in deleted}
+        changes.update((record["swift_code"], dict(record)) for record in upserted)
+
+        index = TextIndex.__new__(TextIndex)
+        index.codes, index.documents, index.postings = self.codes.copy(), self.documents.copy(), self.postings.copy()
+        index.grams = self.grams
+        index.versions = {**self.versions, **(versions or {})}
+
+        copied: Set[Tuple[int, str]] = set()
+        grams: Dict[str, frozenset] = {}
+
+        def in_vocabulary(word: str) -> bool:
+            return any(index.postings.get((field_number, word)) is not None for field_number in range(len(FIELDS)))
+
+        def update_grams(word: str, add: bool):
+            if not grams:
+                grams.update(index.grams)
+                index.grams = grams
+            for gram in trigrams(word):
+                gram_words = grams.get(gram, frozenset())
+                gram_words = gram_words | {word} if add else gram_words - {word}
+                if gram_words:
+                    grams[gram] = gram_words
+                else:
+                    grams.pop(gram, None)
+
+        for swift_code, record in changes.items():
+            doc_id = index.codes.get(swift_code)
+            previous = index.documents.get(doc_id) if doc_id is not None else None
+
+            if previous is not None and record is not None and \
+                    all(previous[field] == record[field] for field in (*FIELDS, "country_ISO2")):
+                index.documents.replace(doc_id, record)
+                continue
+
+            if previous is not None:
+                for key in self._posting_keys(previous):
+                    doc_ids = index.postings.get(key)
+                    if doc_ids is None:
+                        continue
+                    if key not in copied:
+                        doc_ids = array("I", doc_ids)
+                        index.postings.set(key, doc_ids)
+                        copied.add(key)
+                    position = bisect_left(doc_ids, doc_id)
+                    if position < len(doc_ids) and doc_ids[position] == doc_id:
+                        del doc_ids[position]
+                    if not doc_ids:
+                        index.postings.pop(key)
+                        field_number, word = key
+                        if field_number != COUNTRY_FIELD and _is_fuzzy(word) and not in_vocabulary(word):
+                            update_grams(word, add=False)
+                index.documents.remove(doc_id)
+                index.codes.pop(swift_code)
+
+            if record is not None:
+                doc_id = index.documents.append(record)
+                index.codes.set(swift_code, doc_id)
+                for key in self._posting_keys(record):
+                    field_number, word = key
+                    doc_ids = index.postings.get(key)
+                    if doc_ids is None:
+                        if field_number != COUNTRY_FIELD and _is_fuzzy(word) and not in_vocabulary(word):
+                            update_grams(word, add=True)
+                        doc_ids = array("I")
+                    elif key not in copied:
+                        doc_ids = array("I", doc_ids)
+                    index.postings.set(key, doc_ids)
+                    copied.add(key)
+                    # New documents get the highest id, so appending keeps the list sorted.
+                    doc_ids.append(doc_id)
+
+        if index.documents.tombstones > max(MIN_COMPACTION, COMPACTION_RATIO * len(index.codes)):
+            # Removed documents are only dropped by a rebuild, which takes as long as
+            # building the index but happens once per COMPACTION_RATIO of it rewritten.
+            index = TextIndex({swift_code: index.documents.get(doc_id) for swift_code, doc_id in index.codes.items()},
+                              index.versions)
+
+        return index
+
+    def synchronized(self, scopes: Iterable[str], rows: Iterable[Mapping[str, Any]],
+                     versions: Mapping[str, int]) -> "TextIndex":
+        """
+        Return a new index in which the records of some countries are replaced
+        by their rows in the database.
+
+        Args:
+            scopes (Iterable[str]): ISO2 codes of the countries to synchronise.
+            rows (Iterable[Mapping[str, Any]]): Every row stored with one of these countries.
+            versions (Mapping[str, int]): Dataset versions when the rows were read.
+        """
+
+        held = [record for scope in scopes for record in self.country_records(scope)]
+        upserted, deleted = country_changes(rows, held, self.get)
+
+        return self.with_changes(upserted, deleted, versions)
+
+
+_index: Optional[TextIndex] = None
+_write_lock = threading.Lock()
+
+
+def get_text_index() -> Optional[TextIndex]:
+    """
+    Return the active text index, or None when it is disabled or not built yet.
+    """
+
+    return _index
+
+
+def load_text_index(bind) -> TextIndex:
+    """
+    Build the text index from the swift_codes table and make it the active one.
+
+    The dataset versions are read first, in the same transaction as the rows,
+    so that anything written after them is picked up by refresh_text_index.
+    Records equal to those of the read snapshot share its dictionaries.
+
+    Args:
+        bind: SQLAlchemy engine or connection to read the table from.
+
+    Returns:
+        TextIndex: The freshly built index.
+    """
+
+    global _index
+
+    from app.core.snapshot import get_snapshot
+    from app.models.swift_code import swift_codes
+
+    snapshot = get_snapshot()
+    columns = [swift_codes.c[field] for field in RECORD_FIELDS]
+
+    with bind.connect() as conn:
+        versions = read_versions(conn)
+        records = {}
+        for row in conn.execute(select(*columns)).mappings():
+            record = dict(row)
+            shared = snapshot.get(record["swift_code"]) if snapshot is not None else None
+            if shared is not None and all(shared[field] == record[field] for field in RECORD_FIELDS):
+                record = shared
+            records[record["swift_code"]] = record
+
+    index = TextIndex(records, versions)
+    with _write_lock:
+        _index = index
+
+    return index
+
+
+def apply_text_index_changes(upserted: Iterable[Dict[str, Any]] = (), deleted: Iterable[str] = (),
+                             scopes: Iterable[str] = ()):
+    """
+    Apply committed writes to the active text index, if there is one.
+
+    Args:
+        upserted: Records added or replaced by the write.
+        deleted: SWIFT codes removed by the write.
+        scopes: Countries whose dataset version the write incremented, once each.
+    """
+
+    global _index
+
+    with _write_lock:
+        if _index is not None:
+            _index = _index.with_changes(upserted, deleted, applied_versions(_index.versions, scopes))
+
+
+async def refresh_text_index(db) -> Optional[TextIndex]:
+    """
+    Bring the active text index up to date with writes made by other processes,
+    such as loader runs and other workers, and return it.
+
+    Only the records that differ from the rows of the stale countries are
+    changed in the index.
+
+    Args:
+        db (AsyncSession): Session to read the versions and rows from.
+
+    Returns:
+        Optional[TextIndex]: The up-to-date index, or None when there is no index.
+    """
+
+    global _index
+
+    from app.models.swift_code import swift_codes
+
+    index = _index
+    if index is None:
+        return None
+
+    changes = await read_stale_countries(db, index.versions, [swift_codes.c[field] for field in RECORD_FIELDS])
+    if changes is None:
+        return index
+
+    synchronized = index.synchronized(*changes)
+    with _write_lock:
+        # A write applied while the rows were read may be missing from them;
+        # the next search synchronises again in that case.
+        if _index is index:
+            _index = synchronized
+        return _index
+
+
+def clear_text_index():
+    """
+    Drop the active text index, which disables text searches.
+    """
+
+    global _index
+
+    with _write_lock:
+        _index = None
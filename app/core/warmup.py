@@ -0,0 +1,197 @@
+import asyncio
+import importlib
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import get_settings
+from app.core.search_index import get_search_index, load_search_index
+from app.core.snapshot import get_snapshot, load_snapshot, load_snapshot_file
+from app.core.text_index import get_text_index, load_text_index
+from app.db import database
+
+# Modules that the request path only imports on first use. The dialect of the
+# primary database is added at run time; it is needed by the upserts.
+SERVING_MODULES = ("anyio._backends._asyncio",)
+
+Phase = Tuple[str, Callable[[], Awaitable[Any]]]
+
+_ready = False
+_phases: Dict[str, float] = {}
+_error: Optional[str] = None
+
+
+def is_ready() -> bool:
+    """
+    Return True once the warm-up has completed.
+    """
+
+    return _ready
+
+
+def readiness() -> Dict[str, Any]:
+    """
+    Return the warm-up state: whether it completed, the milliseconds taken by
+    every finished phase and the last error of a phase being retried.
+    """
+
+    state = {"ready": _ready, "phases": {name: round(seconds * 1000, 1) for name, seconds in _phases.items()}}
+    if _error is not None:
+        state["error"] = _error
+    return state
+
+
+def reset_readiness():
+    """
+    Forget the warm-up state, so that the service reports not ready again.
+    """
+
+    global _ready, _error
+
+    _ready, _error = False, None
+    _phases.clear()
+
+
+def import_serving_modules() -> List[str]:
+    """
+    Import the modules that requests would otherwise import on first use.
+
+    Returns:
+        List[str]: Names of the modules that could be imported.
+    """
+
+    imported = []
+    for name in (*SERVING_MODULES, f"sqlalchemy.dialects.{database.engine.dialect.name}"):
+        try:
+            importlib.import_module(name)
+            imported.append(name)
+        except ImportError:
+            pass
+    return imported
+
+
+async def open_connections(engine, count: int) -> int:
+    """
+    Open `count` connections of an async engine at once and return them to
+    its pool, which keeps them open for the first requests.
+
+    Returns:
+        int: Number of connections opened.
+    """
+
+    connections = []
+    try:
+        for _ in range(count):
+            connection = await engine.connect()
+            connections.append(connection)
+            await connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            await connection.close()
+    return len(connections)
+
+
+def _phases_to_run(app, connections: bool = True) -> List[Phase]:
+    """
+    The warm-up phases, in order. Datasets that are disabled, and phases that
+    already completed, e.g. in the launcher before forking, are left out.
+
+    Args:
+        app (FastAPI): The application whose OpenAPI schema is built.
+        connections (bool): Whether to open the pooled connections, which only
+            the process serving requests should do.
+    """
+
+    settings = get_settings()
+    # The pool keeps at most DB_POOL_SIZE connections open once they are returned.
+    count = min(settings.WARMUP_CONNECTIONS, settings.DB_POOL_SIZE)
+
+    async def open_pools():
+        for engine in (database.async_engine, *database.async_replica_engines):
+            await open_connections(engine, count)
+
+    phases: List[Phase] = [
+        ("imports", lambda: asyncio.to_thread(import_serving_modules)),
+        ("database", lambda: asyncio.to_thread(database.init_db))
+    ]
+    if connections:
+        phases.append(("connections", open_pools))
+    if settings.SNAPSHOT_ENABLED and get_snapshot() is None:
+        if settings.DIRECTORY_FILE:
+            phases.append(("snapshot", lambda: asyncio.to_thread(load_snapshot_file, settings.DIRECTORY_FILE,
+                                                                 database.engine)))
+        else:
+            phases.append(("snapshot", lambda: asyncio.to_thread(load_snapshot, database.engine)))
+    if settings.SEARCH_INDEX_ENABLED and get_search_index() is None:
+        phases.append(("search_index", lambda: asyncio.to_thread(load_search_index, database.engine)))
+    if settings.TEXT_INDEX_ENABLED and get_text_index() is None:
+        phases.append(("text_index", lambda: asyncio.to_thread(load_text_index, database.engine)))
+    phases.append(("openapi", lambda: asyncio.to_thread(app.openapi)))
+    return [(name, run) for name, run in phases if name not in _phases]
+
+
+async def run_phases(phases: List[Phase]):
+    """
+    Run startup phases in order and log the duration of every one. A phase
+    that fails, e.g. because the database is not up yet, is retried every
+    WARMUP_RETRY_SECONDS seconds, with its error reported by readiness().
+    """
+
+    global _error
+
+    for name, run in phases:
+        phase_started = time.perf_counter()
+        while True:
+            try:
+                await run()
+                break
+            except Exception as e:
+                _error = f"{name}: {e}"
+                print(f"Startup phase {name} failed, retrying in {get_settings().WARMUP_RETRY_SECONDS} s: {e}")
+                await asyncio.sleep(get_settings().WARMUP_RETRY_SECONDS)
+
+        _phases[name] = time.perf_counter() - phase_started
+        _error = None
+        print(f"Startup phase {name} took {_phases[name] * 1000:.1f} ms")
+
+
+async def warm_up(app):
+    """
+    Prepare the service for traffic, then mark it ready.
+
+    The phases import the modules used on first request, create the tables,
+    open WARMUP_CONNECTIONS pooled connections to the primary and to every
+    replica, load the read snapshot (from DIRECTORY_FILE, if set) and the
+    indexes, and build the OpenAPI
+    schema. Blocking work runs in a thread, so the event loop keeps answering
+    /health/live meanwhile.
+
+    Args:
+        app (FastAPI): The application whose OpenAPI schema is built.
+    """
+
+    global _ready
+
+    started = time.perf_counter()
+    await run_phases(_phases_to_run(app))
+
+    _ready = True
+    print(f"Warm-up finished in {(time.perf_counter() - started) * 1000:.1f} ms; ready for traffic.")
+
+
+def preload(app):
+    """
+    Run every warm-up phase but the pooled connections in the current process,
+    with the same retries and timing logs as warm_up().
+
+    Meant for the launcher, before it forks the workers: they inherit what the
+    phases loaded and only open their connections. Readiness stays per worker.
+
+    Args:
+        app (FastAPI): The application whose OpenAPI schema is built.
+    """
+
+    started = time.perf_counter()
+    asyncio.run(run_phases(_phases_to_run(app, connections=False)))
+    print(f"Preload finished in {(time.perf_counter() - started) * 1000:.1f} ms.")
@@ -0,0 +1,198 @@
+import csv
+import os
+import tempfile
+import time
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import create_engine, insert, text
+
+from app.db.dataset_versions import bump_versions, record_scopes
+from app.models.swift_code import swift_codes
+
+EXECUTEMANY = "executemany"
+LOAD_DATA = "load_data"
+LOAD_MODES = (EXECUTEMANY, LOAD_DATA)
+
+LOAD_DATA_COLUMNS = ["swift_code", "address", "bank_name", "country_ISO2",
+                     "country_name", "is_headquarter", "bank_prefix", "branch_code"]
+
+
+def create_loader_engine(database_url: str, mode: str = EXECUTEMANY):
+    """
+    Create an engine suitable for bulk loading.
+
+    LOAD DATA LOCAL INFILE has to be enabled when the connection is opened,
+    so the load_data mode gets an engine with local_infile turned on.
+    """
+
+    if mode == LOAD_DATA:
+        return create_engine(database_url, connect_args={"local_infile": True})
+    return create_engine(database_url)
+
+
+def insert_ignore(dialect_name: str):
+    """
+    Build an INSERT statement for swift_codes that skips rows whose SWIFT code already exists.
+    """
+
+    statement = insert(swift_codes)
+    if dialect_name == "sqlite":
+        return statement.prefix_with("OR IGNORE")
+    return statement.prefix_with("IGNORE")
+
+
+UPSERT_COLUMNS = ["address", "bank_name", "country_ISO2", "country_name", "is_headquarter"]
+
+
+def upsert(dialect_name: str, record: Dict[str, Any]):
+    """
+    Build a single INSERT statement for swift_codes that updates the existing row
+    when the SWIFT code is already present: ON DUPLICATE KEY UPDATE on MySQL,
+    ON CONFLICT DO UPDATE elsewhere.
+    """
+
+    if dialect_name == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        statement = mysql_insert(swift_codes).values(record)
+        return statement.on_duplicate_key_update(
+            {column: statement.inserted[column] for column in UPSERT_COLUMNS})
+
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+    statement = sqlite_insert(swift_codes).values(record)
+    return statement.on_conflict_do_update(
+        index_elements=[swift_codes.c.swift_code],
+        set_={column: statement.excluded[column] for column in UPSERT_COLUMNS})
+
+
+def batched(records: Iterable[Dict[str, Any]], batch_size: int) -> Iterable[List[Dict[str, Any]]]:
+    """
+    Split an iterable of records into lists of at most batch_size records.
+    """
+
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _execute_many(conn, batch: List[Dict[str, Any]]) -> int:
+    """
+    Insert a batch with a single executemany call, which the MySQL driver
+    rewrites into multi-row INSERT statements.
+    """
+
+    result = conn.execute(insert_ignore(conn.dialect.name), batch)
+    return max(result.rowcount, 0)
+
+
+def _load_data_infile(conn, batch: List[Dict[str, Any]]) -> int:
+    """
+    Write a batch to a temporary CSV file and load it with LOAD DATA LOCAL INFILE.
+    """
+
+    handle, path = tempfile.mkstemp(suffix=".csv", prefix="swift_codes_")
+    try:
+        with os.fdopen(handle, "w", newline="", encoding="utf-8") as csv_file:
+            writer = csv.writer(csv_file, quoting=csv.QUOTE_ALL, lineterminator="\n")
+            for record in batch:
+                swift_code = record["swift_code"]
+                writer.writerow([
+                    swift_code,
+                    record["address"],
+                    record["bank_name"],
+                    record["country_ISO2"],
+                    record["country_name"],
+                    1 if record["is_headquarter"] else 0,
+                    swift_code[:8],
+                    swift_code[8:11]
+                ])
+
+        statement = text(
+            f"LOAD DATA LOCAL INFILE :path IGNORE INTO TABLE {swift_codes.name} "
+            "CHARACTER SET utf8mb4 "
+            "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+            "LINES TERMINATED BY '\\n' "
+            f"({', '.join(LOAD_DATA_COLUMNS)})"
+        )
+        result = conn.execute(statement, {"path": path})
+        return max(result.rowcount, 0)
+    finally:
+        os.remove(path)
+
+
+def bulk_load(engine, records: Iterable[Dict[str, Any]], batch_size: int = 5000,
+              mode: str = EXECUTEMANY, on_batch: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Insert parsed SWIFT code records into the swift_codes table in batches.
+
+    Every batch is committed in its own transaction, together with a bump of the
+    dataset versions of the countries it inserted into. Existing SWIFT codes are
+    skipped, so re-running a partially completed load is safe.
+
+    Args:
+        engine (SQLAlchemy Engine): Database engine to load into.
+        records (Iterable[Dict[str, Any]]): Records in the format returned by parse_swift_data.
+            Any iterable works, so records can be streamed.
+        batch_size (int): Number of records sent per batch.
+        mode (str): "executemany" for multi-row INSERT IGNORE statements, or
+            "load_data" for LOAD DATA LOCAL INFILE from a temporary file (MySQL only).
+        on_batch (Callable): Optional callback receiving the statistics of each finished batch.
+
+    Returns:
+        Dict[str, Any]: Load statistics: rows read, rows inserted, elapsed seconds,
+        rows per second and the per-batch timings.
+
+    Raises:
+        ValueError: If the batch size or the mode is invalid.
+        SQLAlchemyError: If a batch fails to load.
+    """
+
+    if batch_size < 1:
+        raise ValueError("Batch size must be a positive integer")
+
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Unknown load mode: {mode}. Expected one of {LOAD_MODES}")
+
+    load_batch = _load_data_infile if mode == LOAD_DATA else _execute_many
+
+    stats = {"mode": mode, "batch_size": batch_size, "rows": 0,
+             "inserted": 0, "seconds": 0.0, "rows_per_second": 0.0, "batches": []}
+    started = time.perf_counter()
+
+    for number, batch in enumerate(batched(records, batch_size), start=1):
+        batch_started = time.perf_counter()
+        with engine.begin() as conn:
+            inserted = load_batch(conn, batch)
+            if inserted:
+                bump_versions(conn, record_scopes(batch))
+        seconds = time.perf_counter() - batch_started
+
+        batch_stats = {"batch": number, "rows": len(batch), "inserted": inserted,
+                       "seconds": seconds, "rows_per_second": len(batch) / seconds if seconds else 0.0}
+        stats["batches"].append(batch_stats)
+        stats["rows"] += len(batch)
+        stats["inserted"] += inserted
+
+        if on_batch is not None:
+            on_batch(batch_stats)
+
+    stats["seconds"] = time.perf_counter() - started
+    if stats["seconds"]:
+        stats["rows_per_second"] = stats["rows"] / stats["seconds"]
+
+    return stats
+
+
+def print_batch(batch_stats: Dict[str, Any]):
+    """
+    Print the timing of a single loaded batch.
+    """
+
+    print(f"Batch {batch_stats['batch']}: {batch_stats['rows']} rows "
+          f"({batch_stats['inserted']} inserted) in {batch_stats['seconds']:.3f}s "
+          f"({batch_stats['rows_per_second']:.0f} rows/s)")
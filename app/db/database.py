@@ -1,29 +1,162 @@
-from sqlalchemy import create_engine, MetaData
+import math
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event, MetaData
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from app.core.config import get_settings
+from app.db.instrumentation import instrument_engine
+from app.db.replicas import READ_YOUR_WRITES_COOKIE, ReplicaRouter
+from app.db.pool_stats import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_pool
 
 settings = get_settings()
 
-engine = create_engine(settings.DATABASE_URL)
+
+def pool_options(settings) -> dict:
+    """
+    Connection pool arguments for create_engine / create_async_engine, taken from the settings.
+    """
+
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING
+    }
+
+
+engine = create_engine(settings.DATABASE_URL, poolclass=InstrumentedQueuePool, **pool_options(settings))
+async_engine = create_async_engine(settings.ASYNC_DATABASE_URL, poolclass=InstrumentedAsyncQueuePool,
+                                   **pool_options(settings))
+instrument_pool(engine, "sync")
+instrument_pool(async_engine, "async")
+instrument_engine(engine)
+instrument_engine(async_engine)
 
 SessionLocal = sessionmaker(autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False)
+
+replica_engines, async_replica_engines = [], []
+for index, (url, async_url) in enumerate(zip(settings.REPLICA_DATABASE_URLS, settings.ASYNC_REPLICA_DATABASE_URLS)):
+    replica_engines.append(create_engine(url, poolclass=InstrumentedQueuePool, **pool_options(settings)))
+    async_replica_engines.append(create_async_engine(async_url, poolclass=InstrumentedAsyncQueuePool,
+                                                     **pool_options(settings)))
+    instrument_pool(replica_engines[-1], f"sync-replica-{index}")
+    instrument_pool(async_replica_engines[-1], f"async-replica-{index}")
+    instrument_engine(replica_engines[-1])
+    instrument_engine(async_replica_engines[-1])
+
+replica_router = ReplicaRouter(
+    SessionLocal, [sessionmaker(autoflush=False, bind=replica) for replica in replica_engines],
+    strategy=settings.REPLICA_SELECTION, sticky_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    secret=settings.READ_YOUR_WRITES_SECRET.encode())
+async_replica_router = ReplicaRouter(
+    AsyncSessionLocal, [async_sessionmaker(replica, autoflush=False, expire_on_commit=False)
+                        for replica in async_replica_engines],
+    strategy=settings.REPLICA_SELECTION, sticky_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    secret=settings.READ_YOUR_WRITES_SECRET.encode())
+
+if replica_engines and not settings.READ_YOUR_WRITES_SECRET:
+    print("READ_YOUR_WRITES_SECRET is not set: read-your-writes cookies are signed with a random key, "
+          "which API processes not forked from this one do not share.")
 
 Base = declarative_base()
 metadata = MetaData()
 
 
+def set_replica_routers(sync_router: ReplicaRouter = None, async_router: ReplicaRouter = None):
+    """
+    Replace the routers used by the session dependencies, e.g. to point them at test databases.
+    """
+
+    global replica_router, async_replica_router
+
+    if sync_router is not None:
+        replica_router = sync_router
+    if async_router is not None:
+        async_replica_router = async_router
+
+
 def get_db():
     """
-    Dependency function to get a database session.
-    Used with FastAPI Depends to manage session lifecycle.
+    Dependency function to get a synchronous read-write database session on the primary.
+    Kept for scripts and loaders that run outside the event loop.
     """
 
-    db = SessionLocal()
+    target = replica_router.acquire(replica_router.primary)
+    db = target.sessions()
     try:
         yield db
     finally:
         db.close()
+        replica_router.release(target)
+
+
+def get_read_db():
+    """
+    Dependency function to get a synchronous read-only database session,
+    on a read replica when replicas are configured.
+    """
+
+    target = replica_router.acquire(replica_router.choose_read())
+    db = target.sessions()
+    try:
+        yield db
+    finally:
+        db.close()
+        replica_router.release(target)
+
+
+async def get_async_db(response: Response):
+    """
+    Dependency function to get an asynchronous read-write database session on the primary.
+    Used with FastAPI Depends by the endpoints that write, so that database
+    round trips do not block the event loop. Once the session commits, the
+    response sets the client's read-your-writes cookie, which sends its
+    following reads to the primary for READ_YOUR_WRITES_SECONDS; requests
+    that write nothing, e.g. conflicts, leave the client's reads where they were.
+    """
+
+    router = async_replica_router
+
+    def set_cookie(session):
+        token = router.write_token()
+        if token is None:
+            return
+        # A later commit of the same request, e.g. a bulk batch, restarts the window.
+        prefix = f"{READ_YOUR_WRITES_COOKIE}=".encode()
+        response.raw_headers[:] = [(name, value) for name, value in response.raw_headers
+                                   if name != b"set-cookie" or not value.startswith(prefix)]
+        response.set_cookie(READ_YOUR_WRITES_COOKIE, token, max_age=math.ceil(router.sticky_seconds),
+                            httponly=True, samesite="lax")
+
+    target = router.acquire(router.primary)
+    try:
+        async with target.sessions() as db:
+            event.listen(db.sync_session, "after_commit", set_cookie)
+            yield db
+    finally:
+        router.release(target)
+
+
+async def get_async_read_db(request: Request):
+    """
+    Dependency function to get an asynchronous read-only database session.
+    Used by the endpoints that only read; the session is opened on a read
+    replica when replicas are configured, unless the client's read-your-writes
+    cookie shows that it wrote recently.
+    """
+
+    router = async_replica_router
+    target = router.acquire(router.choose_read(request.cookies.get(READ_YOUR_WRITES_COOKIE)))
+    try:
+        async with target.sessions() as db:
+            yield db
+    finally:
+        router.release(target)
 
 
 def init_db():
@@ -33,6 +166,8 @@ def init_db():
     """
 
     from app.models.swift_code import SwiftCodeModel
+    from app.models.dataset_version import DatasetVersionModel
+    from app.models.sync_state import SyncStateModel
     Base.metadata.create_all(bind=engine)
 
 
@@ -0,0 +1,67 @@
+from datetime import datetime, timezone
+from typing import Any, Iterable, Mapping, Set
+
+from sqlalchemy import insert, update
+
+from app.models.dataset_version import dataset_versions
+
+GLOBAL_SCOPE = "*"
+
+
+def record_scopes(records: Iterable[Mapping[str, Any]]) -> Set[str]:
+    """
+    Return the country scopes touched by writing the given records.
+
+    Both the stored country and the country part of the SWIFT code are included,
+    because the country listing filters on the former and single-code lookups
+    are versioned by the latter.
+    """
+
+    scopes = set()
+    for record in records:
+        scopes.add(record["country_ISO2"].upper())
+        scopes.add(record["swift_code"][4:6].upper())
+    return scopes
+
+
+def _bump_statements(dialect_name: str, scopes: Iterable[str]):
+    """
+    Build the statements that increment the version of every scope plus the global one.
+
+    Missing rows are created first with INSERT IGNORE, so the increment is a single
+    UPDATE that is safe against concurrent writers. Scopes are sorted to take row
+    locks in a consistent order.
+    """
+
+    scopes = sorted(set(scopes) | {GLOBAL_SCOPE})
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+    insert_missing = insert(dataset_versions).prefix_with(
+        "OR IGNORE" if dialect_name == "sqlite" else "IGNORE").values(
+        [{"scope": scope, "version": 0, "updated_at": now} for scope in scopes])
+
+    increment = update(dataset_versions).where(
+        dataset_versions.c.scope.in_(scopes)).values(
+        version=dataset_versions.c.version + 1, updated_at=now)
+
+    return insert_missing, increment
+
+
+def bump_versions(conn, scopes: Iterable[str]):
+    """
+    Increment the dataset versions on a synchronous connection, inside the
+    caller's transaction.
+    """
+
+    for statement in _bump_statements(conn.dialect.name, scopes):
+        conn.execute(statement)
+
+
+async def bump_versions_async(db, scopes: Iterable[str]):
+    """
+    Increment the dataset versions on an async session, inside the caller's transaction.
+    """
+
+    for statement in _bump_statements(db.bind.dialect.name, scopes):
+        await db.execute(statement)
+
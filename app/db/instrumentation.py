@@ -0,0 +1,153 @@
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from sqlalchemy import event
+
+from app.core.config import get_settings
+
+
+class RequestDbStats:
+    """
+    Number of SQL statements and time spent executing them during one request.
+    """
+
+    __slots__ = ("statements", "seconds", "request")
+
+    def __init__(self, request: str = ""):
+        self.statements = 0
+        self.seconds = 0.0
+        self.request = request
+
+
+_current: ContextVar[Optional[RequestDbStats]] = ContextVar("request_db_stats", default=None)
+
+# Statements running longer than this are printed to the slow-query log; 0 disables it.
+slow_query_seconds = get_settings().SLOW_QUERY_MS / 1000
+
+
+def start_request_stats(scope=None):
+    """
+    Start attributing statements to the request in the current context. When
+    another middleware already started it, its stats object is shared.
+
+    Args:
+        scope: ASGI scope of the request, used to name it in the slow-query log
+
+    Returns:
+        tuple: The stats object and the token to pass to end_request_stats().
+    """
+
+    stats = _current.get()
+    if stats is not None:
+        return stats, None
+
+    stats = RequestDbStats(f"{scope['method']} {scope['path']}" if scope else "")
+    return stats, _current.set(stats)
+
+
+def end_request_stats(token):
+    if token is not None:
+        _current.reset(token)
+
+
+def current_request_stats() -> Optional[RequestDbStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's execution context, which is discarded with it
+    # whether the statement succeeds or fails.
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _record_statement(context, statement: str, parameters: Any, executemany: bool):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += seconds
+
+    if slow_query_seconds and seconds >= slow_query_seconds:
+        request = f" [{stats.request}]" if stats is not None and stats.request else ""
+        print(f"Slow query ({seconds * 1000:.1f} ms){request}: {' '.join(statement.split())} "
+              f"parameters={redact_parameters(parameters, executemany)}")
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_statement(context, statement, parameters, executemany)
+
+
+def _handle_error(exception_context):
+    # Failed statements, such as INSERTs rejected by a key conflict, took database time too.
+    context = exception_context.execution_context
+    if context is not None:
+        _record_statement(context, exception_context.statement or "", exception_context.parameters,
+                          context.executemany)
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> str:
+    """
+    Describe statement parameters without their values, which may hold client data:
+    each value is replaced by its type name, and executemany batches by their size.
+    """
+
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: <{type(value).__name__}>" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(f"<{type(value).__name__}>" for value in parameters) + ")"
+    return "<redacted>"
+
+
+def instrument_engine(engine):
+    """
+    Time every statement executed by an engine (sync or async), including the
+    ones that fail, and attribute it to the request being served. SQLAlchemy runs async statements in a greenlet that
+    shares the request's context, so the attribution also works for the async engine.
+    """
+
+    engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryHeadersMiddleware:
+    """
+    ASGI middleware adding the number of SQL statements a request executed
+    (X-DB-Queries) and the time they took in milliseconds (X-DB-Time) to its
+    response headers. Headers are sent before a streamed body, so statements run
+    while streaming are not included.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = start_request_stats(scope)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-db-queries", str(stats.statements).encode()),
+                    (b"x-db-time", f"{stats.seconds * 1000:.3f}".encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            end_request_stats(token)
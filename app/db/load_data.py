@@ -1,39 +1,102 @@
-from sqlalchemy.dialects.mysql import insert
+import argparse
+import pandas as pd
 from sqlalchemy.exc import SQLAlchemyError
-from app.db.database import engine, init_db
-from app.models.swift_code import swift_codes
-from app.core.parser import parse_swift_data
+from app.core.config import get_settings
+from app.db.bulk_load import LOAD_MODES, bulk_load, create_loader_engine, print_batch
+from app.db.database import init_db
+from app.db.delta_sync import delta_sync
+from app.core.parser import iter_parse_swift_data
+from custom_exceptions.SwiftParserError import SwiftParserError
 
 PATH_TO_CSV = "data/Interns_2025_SWIFT_CODES - Sheet1.csv"
 
 
-def load_data():
+def load_data(engine=None, path: str = PATH_TO_CSV, batch_size: int = None, mode: str = None,
+              delta: bool = False, force: bool = False):
     """
     Load SWIFT code data from CSV into the database.
+
+    The file is parsed in chunks of `batch_size` rows and every chunk is loaded
+    as soon as it is validated, so memory use stays flat for large files. A parse
+    error in a later chunk stops the load after the earlier batches were committed;
+    rerunning the load on the corrected file is safe because existing codes are skipped.
+
+    Args:
+        engine (SQLAlchemy Engine): Engine to load into. Defaults to a loader engine
+            built from the application settings.
+        path (str): Path to the CSV file.
+        batch_size (int): Records per batch. Defaults to LOAD_BATCH_SIZE.
+        mode (str): "executemany" or "load_data". Defaults to LOAD_MODE.
+        delta (bool): Apply only inserts, updates and deletes against the current table
+            instead of inserting new codes. See app/db/delta_sync.py.
+        force (bool): In delta mode, diff the file even if it is unchanged since the last sync.
+
+    Returns:
+        bool: True if data was loaded successfully, False otherwise
     """
-    init_db()
+
+    settings = get_settings()
+    batch_size = batch_size or settings.LOAD_BATCH_SIZE
+    mode = mode or settings.LOAD_MODE
+
+    if engine is None:
+        engine = create_loader_engine(settings.DATABASE_URL, mode)
+        init_db()
+
+    if delta:
+        return _sync_data(engine, path, batch_size, force)
+
+    records = (record
+               for chunk in iter_parse_swift_data(path, chunksize=batch_size)
+               for record in chunk)
 
     try:
-        parsed_data = parse_swift_data(PATH_TO_CSV)
-        print(f"Successfully parsed {len(parsed_data)} records.")
-    except Exception as e:
+        stats = bulk_load(engine, records, batch_size=batch_size,
+                          mode=mode, on_batch=print_batch)
+        print(f"Successfully parsed {stats['rows']} records and inserted {stats['inserted']} "
+              f"in {stats['seconds']:.2f}s ({stats['rows_per_second']:.0f} rows/s).")
+        return True
+    except (SwiftParserError, pd.errors.ParserError, pd.errors.EmptyDataError) as e:
         print(f"Parse error occured: {e}")
         return False
+    except (SQLAlchemyError, ValueError) as e:
+        print(f"Database error occured: {e}")
+        return False
+
+
+def _sync_data(engine, path: str, batch_size: int, force: bool):
+    """
+    Run a delta sync and print its outcome.
+    """
 
     try:
-        with engine.begin() as conn:
-            inserted_count = 0
-            for record in parsed_data:
-                statement = insert(swift_codes).values(
-                    record).prefix_with("IGNORE")
-                conn.execute(statement)
-                inserted_count += 1
-            print(f"Successfully inserted {inserted_count} records.")
-        return True
+        stats = delta_sync(engine, path, batch_size=batch_size, force=force)
+    except (SwiftParserError, pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        print(f"Parse error occured: {e}")
+        return False
     except SQLAlchemyError as e:
         print(f"Database error occured: {e}")
         return False
 
+    if stats["skipped"]:
+        print(f"File unchanged since the last sync of '{stats['source']}', nothing to do.")
+    else:
+        print(f"Synchronized {stats['rows']} records in {stats['seconds']:.2f}s: "
+              f"{stats['inserted']} inserted, {stats['updated']} updated, "
+              f"{stats['deleted']} deleted, {stats['unchanged']} unchanged.")
+    return True
+
 
 if __name__ == "__main__":
-    load_data()
+    parser = argparse.ArgumentParser(description="Load SWIFT codes from CSV into the database.")
+    parser.add_argument("--path", default=PATH_TO_CSV)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--mode", choices=LOAD_MODES, default=None)
+    parser.add_argument("--delta", action="store_true",
+                        help="apply only the differences between the file and the table")
+    parser.add_argument("--force", action="store_true",
+                        help="with --delta, diff the file even if it is unchanged")
+    args = parser.parse_args()
+
+    load_data(path=args.path, batch_size=args.batch_size, mode=args.mode,
+              delta=args.delta, force=args.force)
@@ -0,0 +1,126 @@
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.histogram import Histogram
+
+
+class PoolStats:
+    """
+    Counters for one connection pool, fed by SQLAlchemy pool events and by the
+    timed checkout of the instrumented pool classes.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.overflow_checkouts = 0
+        self.max_in_use = 0
+        self.wait = Histogram()
+
+    def on_checkin(self, *args):
+        self.checkins += 1
+
+    def on_connect(self, *args):
+        self.connects += 1
+
+    def on_invalidate(self, *args):
+        self.invalidations += 1
+
+    def on_checkout(self, pool):
+        self.checkouts += 1
+        in_use = pool.checkedout()
+        self.max_in_use = max(self.max_in_use, in_use)
+        if in_use > pool.size():
+            self.overflow_checkouts += 1
+
+    def snapshot(self, pool) -> Dict[str, Any]:
+        stats = {
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "overflowCheckouts": self.overflow_checkouts,
+            "maxInUse": self.max_in_use,
+            "waitSeconds": self.wait.snapshot()
+        }
+
+        if isinstance(pool, QueuePool):
+            stats.update({"size": pool.size(), "inUse": pool.checkedout(),
+                          "idle": pool.checkedin(), "overflow": max(pool.overflow(), 0)})
+
+        return stats
+
+
+class _TimedCheckoutMixin:
+    """
+    Measures how long each checkout waits for a connection. SQLAlchemy has no
+    event before a checkout starts, so the pool's connect() is timed instead.
+    The stats survive pool re-creation (engine.dispose()).
+    """
+
+    stats: Optional[PoolStats] = None
+
+    def connect(self):
+        if self.stats is None:
+            return super().connect()
+
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.wait.observe(time.perf_counter() - started)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+_pools: Dict[str, Any] = {}
+
+
+def instrument_pool(engine, name: str) -> PoolStats:
+    """
+    Attach pool event listeners to an engine (sync or async) and register it
+    under `name` for get_pool_stats().
+    """
+
+    engine = getattr(engine, "sync_engine", engine)
+    stats = PoolStats()
+    engine.pool.stats = stats
+
+    event.listen(engine.pool, "checkout", lambda *args: stats.on_checkout(engine.pool))
+    event.listen(engine.pool, "checkin", stats.on_checkin)
+    event.listen(engine.pool, "connect", stats.on_connect)
+    event.listen(engine.pool, "invalidate", stats.on_invalidate)
+
+    _pools[name] = engine
+    return stats
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Return the statistics of every instrumented pool, keyed by name.
+    """
+
+    return {name: engine.pool.stats.snapshot(engine.pool) for name, engine in _pools.items()
+            if getattr(engine.pool, "stats", None) is not None}
@@ -0,0 +1,125 @@
+import hashlib
+import hmac
+import itertools
+import secrets
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+ROUND_ROBIN = "round_robin"
+LEAST_CONNECTIONS = "least_connections"
+STRATEGIES = (ROUND_ROBIN, LEAST_CONNECTIONS)
+
+# Cookie carrying the read-your-writes token of a client.
+READ_YOUR_WRITES_COOKIE = "read_your_writes"
+
+
+class DatabaseTarget:
+    """
+    A database that sessions can be opened on: a session factory (sync or async)
+    and the number of sessions currently open on it through the router.
+    """
+
+    def __init__(self, name: str, sessions: Callable):
+        self.name = name
+        self.sessions = sessions
+        self.in_flight = 0
+        self.checkouts = 0
+
+
+class ReplicaRouter:
+    """
+    Routes read-only sessions to read replicas and read-write sessions to the primary.
+
+    Replicas are chosen round-robin or by the fewest sessions in flight. After a
+    client writes, its reads go to the primary for `sticky_seconds`, so it reads
+    its own writes even if the replicas lag behind. The window is carried by the
+    client: a write hands out a token holding its end, signed with `secret`, which
+    the client sends back with its reads. Any process sharing the secret honours
+    it, and clients cannot extend it. Without replicas every session goes to the primary.
+    """
+
+    def __init__(self, primary: Callable, replicas: Sequence[Callable] = (), strategy: str = ROUND_ROBIN,
+                 sticky_seconds: float = 5.0, secret: bytes = b"", clock: Callable[[], float] = time.time):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown replica selection strategy: {strategy}. Expected one of {STRATEGIES}")
+
+        self.primary = DatabaseTarget("primary", primary)
+        self.replicas = [DatabaseTarget(f"replica-{index}", sessions)
+                         for index, sessions in enumerate(replicas)]
+        self.strategy = strategy
+        self.sticky_seconds = sticky_seconds
+        self.secret = secret or secrets.token_bytes(32)
+        self.clock = clock
+
+        self._next = itertools.cycle(self.replicas) if self.replicas else None
+        self._lock = threading.Lock()
+        self.sticky_reads = 0
+
+    def _signature(self, expires: str) -> bytes:
+        return hmac.new(self.secret, expires.encode(), hashlib.sha256).hexdigest().encode()
+
+    def write_token(self) -> Optional[str]:
+        """
+        Return the token that sends a client's reads to the primary for the next
+        `sticky_seconds`, or None when reads never leave the primary.
+        """
+
+        if not self.replicas or self.sticky_seconds <= 0:
+            return None
+
+        expires = f"{self.clock() + self.sticky_seconds:.3f}"
+        return f"{expires}.{self._signature(expires).decode()}"
+
+    def is_sticky(self, token: Optional[str]) -> bool:
+        """
+        Return True if a token is validly signed and its window has not ended.
+        """
+
+        if not token:
+            return False
+
+        expires, _, signature = token.rpartition(".")
+        if not hmac.compare_digest(signature.encode(), self._signature(expires)):
+            return False
+        try:
+            return float(expires) > self.clock()
+        except ValueError:
+            return False
+
+    def choose_read(self, token: Optional[str] = None) -> DatabaseTarget:
+        """
+        Return the database a read-only session should use, given the client's
+        read-your-writes token if it sent one.
+        """
+
+        if not self.replicas:
+            return self.primary
+
+        if self.is_sticky(token):
+            self.sticky_reads += 1
+            return self.primary
+
+        if self.strategy == LEAST_CONNECTIONS:
+            return min(self.replicas, key=lambda replica: replica.in_flight)
+
+        with self._lock:
+            return next(self._next)
+
+    def acquire(self, target: DatabaseTarget) -> DatabaseTarget:
+        target.in_flight += 1
+        target.checkouts += 1
+        return target
+
+    def release(self, target: DatabaseTarget):
+        target.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.strategy,
+            "stickySeconds": self.sticky_seconds,
+            "stickyReads": self.sticky_reads,
+            "targets": {target.name: {"inFlight": target.in_flight, "checkouts": target.checkouts}
+                        for target in [self.primary, *self.replicas]}
+        }
+
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from app.db.database import Base, metadata
+
+
+class DatasetVersionModel(Base):
+    """
+    SQLAlchemy model for swift_codes_versions table.
+
+    Holds a counter per country (ISO2 code) and one global counter (scope '*')
+    that every write to swift_codes increments. The API derives its ETag and
+    Last-Modified headers from these rows.
+    """
+
+    __tablename__ = "swift_codes_versions"
+
+    scope = Column(String(2), primary_key=True, nullable=False)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        """
+        String representation of a dataset version
+        """
+
+        return f"<DatasetVersion {self.scope} ({self.version})"
+
+
+dataset_versions = metadata.tables.get("swift_codes_versions")
+
+if dataset_versions is None:
+    from sqlalchemy import Table
+
+    dataset_versions = Table(
+        "swift_codes_versions", metadata,
+        Column("scope", String(2), primary_key=True),
+        Column("version", Integer, nullable=False, default=0),
+        Column("updated_at", DateTime, nullable=False)
+    )
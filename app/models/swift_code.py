@@ -3,23 +3,52 @@ from sqlalchemy.sql import expression
 from app.db.database import Base, metadata
 
 
+def default_bank_prefix(context):
+    """
+    Column default deriving the 8-character bank prefix from the SWIFT code being inserted.
+    """
+
+    return context.get_current_parameters()["swift_code"][:8]
+
+
+def default_branch_code(context):
+    """
+    Column default deriving the 3-character branch code from the SWIFT code being inserted.
+    Empty for 8-character codes.
+    """
+
+    return context.get_current_parameters()["swift_code"][8:11]
+
+
 class SwiftCodeModel(Base):
     """
     SQLAlchemy model for swift_codes table.
 
     Represents a SWIFT/BIC11 code entry for a bank branch or headquarters.
+    The bank prefix and branch code are derived from the SWIFT code on insert,
+    so a headquarter and its branches can be fetched with one indexed equality query.
+    The composite (country_ISO2, swift_code) index serves country listings in
+    SWIFT code order, which keyset pagination relies on.
     """
 
     __tablename__ = "swift_codes"
+    __table_args__ = (
+        Index("ix_swift_codes_country_ISO2_swift_code",
+              "country_ISO2", "swift_code"),
+    )
 
     swift_code = Column(String(11), primary_key=True,
                         unique=True, nullable=False, index=True)
     address = Column(String(255), nullable=True)
     bank_name = Column(String(255), nullable=True)
-    country_ISO2 = Column(String(2), nullable=True, index=True)
+    country_ISO2 = Column(String(2), nullable=True)
     country_name = Column(String(255), nullable=True)
     is_headquarter = Column(
         Boolean, server_default=expression.false(), nullable=False)
+    bank_prefix = Column(String(8), nullable=False,
+                         index=True, default=default_bank_prefix)
+    branch_code = Column(String(3), nullable=False,
+                         server_default="", default=default_branch_code)
 
     def __repr__(self):
         """
@@ -43,8 +72,14 @@ if swift_codes is None:
         Column("country_ISO2", String(2), nullable=True),
         Column("country_name", String(255), nullable=True),
         Column("is_headquarter", Boolean, server_default=expression.false(),
-               nullable=False)
+               nullable=False),
+        Column("bank_prefix", String(8), nullable=False,
+               default=default_bank_prefix),
+        Column("branch_code", String(3), nullable=False, server_default="",
+               default=default_branch_code)
     )
 
     Index("idx_swift_code", swift_codes.c.swift_code)
-    Index("idx_country_iso2", swift_codes.c.country_ISO2)
+    Index("idx_country_iso2_swift_code",
+          swift_codes.c.country_ISO2, swift_codes.c.swift_code)
+    Index("idx_bank_prefix", swift_codes.c.bank_prefix)
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+from app.db.database import Base, metadata
+
+
+class SyncStateModel(Base):
+    """
+    SQLAlchemy model for swift_codes_sync_state table.
+
+    Remembers the fingerprint of the last file synchronized from each source,
+    so that an unchanged file can skip all database work.
+    """
+
+    __tablename__ = "swift_codes_sync_state"
+
+    source = Column(String(255), primary_key=True, nullable=False)
+    fingerprint = Column(String(64), nullable=False)
+    row_count = Column(Integer, nullable=False)
+    synced_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        """
+        String representation of a sync state
+        """
+
+        return f"<SyncState {self.source} ({self.fingerprint})"
+
+
+sync_state = metadata.tables.get("swift_codes_sync_state")
+
+if sync_state is None:
+    from sqlalchemy import Table
+
+    sync_state = Table(
+        "swift_codes_sync_state", metadata,
+        Column("source", String(255), primary_key=True),
+        Column("fingerprint", String(64), nullable=False),
+        Column("row_count", Integer, nullable=False),
+        Column("synced_at", DateTime, nullable=False, server_default=func.now())
+    )
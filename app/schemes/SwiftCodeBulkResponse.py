@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import List
+from app.schemes.SwiftCodeBulkResult import SwiftCodeBulkResult
+
+
+class SwiftCodeBulkResponse(BaseModel):
+    """
+    Scheme for the response of a bulk create request
+    """
+
+    created: int
+    conflicts: int
+    invalid: int
+    failed: int = 0
+    results: List[SwiftCodeBulkResult]
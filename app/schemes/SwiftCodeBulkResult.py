@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+
+class SwiftCodeBulkResult(BaseModel):
+    """
+    Scheme for the outcome of a single row of a bulk create request
+    """
+
+    index: int
+    swiftCode: Optional[str] = None
+    status: Literal["created", "conflict", "invalid", "failed"]
+    errors: Optional[List[str]] = None
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class SwiftCodeDeleteResponse(BaseModel):
+    """
+    Scheme for the response of a bulk or whole-bank delete
+    """
+
+    deleted: int
+    swiftCodes: List[str]
+    missing: List[str] = []
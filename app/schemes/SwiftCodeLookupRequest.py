@@ -0,0 +1,20 @@
+from pydantic import BaseModel, field_validator
+from typing import List
+from app.core.config import get_settings
+
+
+class SwiftCodeLookupRequest(BaseModel):
+    """
+    Scheme for looking up many SWIFT codes in one request
+    """
+
+    swiftCodes: List[str]
+    includeBranches: bool = False
+
+    @field_validator('swiftCodes')
+    def validate_swift_codes(cls, v):
+        max_codes = get_settings().LOOKUP_MAX_CODES
+        if len(v) > max_codes:
+            raise ValueError(
+                f"At most {max_codes} SWIFT codes can be looked up in one request")
+        return list(dict.fromkeys(code.strip().upper() for code in v))
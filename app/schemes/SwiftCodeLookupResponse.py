@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Dict, List
+from app.schemes.SwiftCodeResponse import SwiftCodeResponse
+from app.schemes.SwiftCodeWithBranches import SwiftCodeWithBranches
+
+
+class SwiftCodeLookupResponse(BaseModel):
+    """
+    Scheme for the response of a batch SWIFT code lookup
+    """
+
+    found: Dict[str, SwiftCodeResponse | SwiftCodeWithBranches]
+    missing: List[str]
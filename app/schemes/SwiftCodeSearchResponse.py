@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List
+from app.schemes.SwiftCodeBranch import SwiftCodeBranch
+
+
+class SwiftCodeSearchResponse(BaseModel):
+    """
+    Scheme for the response of a SWIFT code prefix search
+    """
+
+    prefix: str
+    swiftCodes: List[SwiftCodeBranch]
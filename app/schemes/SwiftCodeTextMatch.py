@@ -0,0 +1,9 @@
+from app.schemes.SwiftCodeBranch import SwiftCodeBranch
+
+
+class SwiftCodeTextMatch(SwiftCodeBranch):
+    """
+    Scheme for a SWIFT code found by a text search, with its relevance score
+    """
+
+    score: float
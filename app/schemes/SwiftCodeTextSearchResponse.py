@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List
+from app.schemes.SwiftCodeTextMatch import SwiftCodeTextMatch
+
+
+class SwiftCodeTextSearchResponse(BaseModel):
+    """
+    Scheme for the response of a bank name and address text search
+    """
+
+    query: str
+    swiftCodes: List[SwiftCodeTextMatch]
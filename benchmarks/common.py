@@ -0,0 +1,220 @@
+"""
+Shared helpers for the benchmark scripts.
+
+The benchmarks run the API in-process against a throwaway SQLite database so
+they can be executed without the MySQL containers.
+"""
+
+import os
+import random
+import string
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import asyncio
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from app.db.database import Base
+
+
+def create_sqlite_engines(path: str):
+    """
+    Create a sync and an async SQLite engine for the same database file and
+    make sure the application schema exists.
+
+    Returns:
+        tuple: (engine, async_engine)
+    """
+
+    engine = create_engine(f"sqlite:///{path}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    from app.models.dataset_version import DatasetVersionModel
+    from app.models.swift_code import SwiftCodeModel
+    from app.models.sync_state import SyncStateModel
+    Base.metadata.create_all(bind=engine)
+
+    return engine, async_engine
+
+
+def make_async_session_override(async_engine) -> Callable:
+    """
+    Return a replacement for the get_async_db and get_async_read_db dependencies bound to the given engine.
+    """
+
+    session_factory = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    return override_get_async_db
+
+
+def generate_records(banks: int, branches_per_bank: int, seed: int = 42,
+                     large_banks: int = 0, large_bank_branches: int = 0) -> List[Dict[str, Any]]:
+    """
+    Generate parsed SWIFT code records: one headquarter per bank plus branches.
+    The first `large_banks` banks get `large_bank_branches` branches instead.
+    """
+
+    rng = random.Random(seed)
+    countries = ["PL", "DE", "FR", "US", "GB", "IT", "ES", "NL"]
+    records = []
+    seen = set()
+
+    while len(seen) < banks:
+        bank_code = "".join(rng.choices(string.ascii_uppercase, k=4))
+        country = rng.choice(countries)
+        location = "".join(rng.choices(string.ascii_uppercase + string.digits, k=2))
+        prefix = f"{bank_code}{country}{location}"
+        if prefix in seen:
+            continue
+        seen.add(prefix)
+
+        records.append({
+            "swift_code": f"{prefix}XXX",
+            "address": f"{rng.randint(1, 999)} MAIN STREET",
+            "bank_name": f"BANK {bank_code}",
+            "country_ISO2": country,
+            "country_name": f"COUNTRY {country}",
+            "is_headquarter": True
+        })
+        branch_count = large_bank_branches if len(seen) <= large_banks else branches_per_bank
+        for branch in range(branch_count):
+            records.append({
+                "swift_code": f"{prefix}{_branch_code(branch)}",
+                "address": f"{rng.randint(1, 999)} BRANCH AVENUE",
+                "bank_name": f"BANK {bank_code} BRANCH {branch}",
+                "country_ISO2": country,
+                "country_name": f"COUNTRY {country}",
+                "is_headquarter": False
+            })
+
+    return records
+
+
+CSV_COLUMNS = ["COUNTRY ISO2 CODE", "SWIFT CODE", "CODE TYPE", "NAME",
+               "ADDRESS", "TOWN NAME", "COUNTRY NAME", "TIME ZONE"]
+
+
+def write_csv(records: List[Dict[str, Any]], path: str):
+    """
+    Write generated records to a CSV file in the format of the source SWIFT code sheet.
+    """
+
+    import csv
+
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(CSV_COLUMNS)
+        for record in records:
+            writer.writerow([record["country_ISO2"], record["swift_code"], "BIC11",
+                             record["bank_name"], record["address"], "TOWN",
+                             record["country_name"], "Europe/Warsaw"])
+
+
+def _branch_code(index: int) -> str:
+    """
+    Return the index-th 3-character alphanumeric branch code, skipping 'XXX'.
+    """
+
+    alphabet = string.digits + string.ascii_uppercase
+    code = "".join(alphabet[(index // len(alphabet) ** power) % len(alphabet)]
+                   for power in (2, 1, 0))
+    return code if code != "XXX" else "XX0"
+
+
+def seed_records(engine, records: List[Dict[str, Any]], batch_size: int = 10000):
+    """
+    Insert generated records into the swift_codes table.
+    """
+
+    from app.models.swift_code import SwiftCodeModel
+
+    with engine.begin() as conn:
+        for start in range(0, len(records), batch_size):
+            conn.execute(SwiftCodeModel.__table__.insert(),
+                         records[start:start + batch_size])
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """
+    Return the given percentile (0-100) of a list of samples.
+    """
+
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float], elapsed: float) -> Dict[str, float]:
+    """
+    Summarize per-request latencies (seconds) into milliseconds and requests per second.
+    """
+
+    return {
+        "requests": len(samples),
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "rps": len(samples) / elapsed if elapsed else 0.0
+    }
+
+
+def time_calls(func: Callable, arguments: List[Any]) -> Dict[str, float]:
+    """
+    Call func once per argument and summarize the latencies.
+    """
+
+    samples = []
+    started = time.perf_counter()
+    for argument in arguments:
+        call_started = time.perf_counter()
+        func(argument)
+        samples.append(time.perf_counter() - call_started)
+
+    return summarize(samples, time.perf_counter() - started)
+
+
+async def measure_requests(app, method: str, paths: List[str], concurrency: int = 1, **kwargs) -> Dict[str, float]:
+    """
+    Send one request per path to the ASGI app in-process, keeping at most
+    `concurrency` requests in flight, and summarize the latencies.
+    """
+
+    samples = []
+    queue = list(reversed(paths))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            while queue:
+                path = queue.pop()
+                call_started = time.perf_counter()
+                await client.request(method, path, **kwargs)
+                samples.append(time.perf_counter() - call_started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(samples, elapsed)
+
+
+def print_results(title: str, results: Dict[str, Dict[str, float]]):
+    """
+    Print a small table of benchmark results.
+    """
+
+    print(title)
+    print(f"{'variant':<24}{'requests':>10}{'p50 ms':>10}{'p99 ms':>10}{'rps':>12}")
+    for name, result in results.items():
+        print(f"{name:<24}{result['requests']:>10}{result['p50_ms']:>10.3f}"
+              f"{result['p99_ms']:>10.3f}{result['rps']:>12.1f}")
@@ -0,0 +1,91 @@
+"""
+Benchmark the binary directory file against the in-memory read snapshot.
+
+A synthetic BIC directory is parsed, loaded into SQLite and compiled with
+compile_database. The script reports how long each representation takes to
+become usable in a fresh process (building the snapshot from the database or
+from the file, and mapping the file) and the latency of code, bank and country
+lookups.
+
+Usage:
+    python benchmarks/directory_file.py --rows 1000000 --lookups 10000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.common import create_sqlite_engines, time_calls
+from app.core.bic_generator import write_bic_directory
+from app.core.directory_file import DirectoryFile, compile_database
+from app.core.parser import parse_swift_data
+from app.core.snapshot import clear_snapshot, load_snapshot, load_snapshot_file
+from app.db.bulk_load import bulk_load
+
+
+def run(rows: int, lookups: int, seed: int = 42):
+    rng = random.Random(seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "swift_codes.csv")
+        write_bic_directory(csv_path, rows, seed=seed)
+        records = parse_swift_data(csv_path)
+
+        engine, _ = create_sqlite_engines(os.path.join(directory, "bench.db"))
+        bulk_load(engine, records)
+
+        binary_path = os.path.join(directory, "swift_codes.bin")
+        started = time.perf_counter()
+        stats = compile_database(engine, binary_path)
+        print(f"Compiled {stats['records']} records into {stats['bytes'] / 2 ** 20:.1f} MiB "
+              f"in {time.perf_counter() - started:.2f} s")
+
+        codes = [rng.choice(records)["swift_code"] for _ in range(lookups)]
+        countries = sorted({record["country_ISO2"] for record in records})
+        del records
+
+        started = time.perf_counter()
+        snapshot = load_snapshot(engine)
+        print(f"{'snapshot from database':<24}{(time.perf_counter() - started) * 1000:>12.1f} ms to load")
+        started = time.perf_counter()
+        load_snapshot_file(binary_path, engine)
+        print(f"{'snapshot from file':<24}{(time.perf_counter() - started) * 1000:>12.1f} ms to load")
+        started = time.perf_counter()
+        directory_file = DirectoryFile(binary_path)
+        print(f"{'mmap directory file':<24}{(time.perf_counter() - started) * 1000:>12.3f} ms to open")
+
+        print(f"{'lookup':<24}{'p50 ms':>12}{'p99 ms':>12}{'ops/s':>12}")
+        cases = {
+            "snapshot get": (snapshot.get, codes),
+            "file get": (directory_file.get, codes),
+            "snapshot bank": (lambda code: snapshot.branches(code[:8] + "XXX"), codes[:1000]),
+            "file bank": (directory_file.bank, codes[:1000]),
+            "file country": (directory_file.country, countries)
+        }
+        for name, (func, arguments) in cases.items():
+            result = time_calls(func, arguments)
+            print(f"{name:<24}{result['p50_ms']:>12.4f}{result['p99_ms']:>12.4f}{result['rps']:>12.1f}")
+
+        directory_file.close()
+        clear_snapshot()
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the binary directory file against the read snapshot")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--lookups", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    run(args.rows, args.lookups, args.seed)
+
+
+if __name__ == "__main__":
+    main()
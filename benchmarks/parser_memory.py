@@ -0,0 +1,73 @@
+"""
+Measure the peak RSS of parsing a large CSV file with parse_swift_data and with
+iter_parse_swift_data. Each variant runs in its own subprocess so that the peak
+resident set size of one does not hide the other.
+
+Usage:
+    python benchmarks/parser_memory.py --rows 1000000 --chunksize 10000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.common import generate_records, write_csv
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+VARIANTS = {
+    "baseline": "pass",
+    "parse_swift_data": "rows = len(parse_swift_data(path))",
+    "iter_parse_swift_data": "rows = sum(len(chunk) for chunk in iter_parse_swift_data(path, chunksize))",
+}
+
+CHILD = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+from app.core.parser import parse_swift_data, iter_parse_swift_data
+path, chunksize, rows = {path!r}, {chunksize}, 0
+started = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - started
+try:
+    # VmHWM is reset on exec, unlike ru_maxrss which can inherit the parent's peak.
+    with open("/proc/self/status") as status:
+        peak = next(int(line.split()[1]) for line in status if line.startswith("VmHWM:"))
+except OSError:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(rows, seconds, peak)
+"""
+
+
+def measure(path: str, chunksize: int, statement: str):
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(root=ROOT, path=path, chunksize=chunksize, statement=statement)],
+        check=True, capture_output=True, text=True).stdout.split()
+    return int(output[0]), float(output[1]), int(output[2]) / 1024
+
+
+def run(rows: int, chunksize: int):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "swift_codes.csv")
+        write_csv(generate_records(max(1, rows // 11), 10)[:rows], path)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        print(f"{rows} rows, {size_mb:.1f} MB file, chunksize {chunksize}")
+        print(f"{'variant':<24}{'rows':>10}{'seconds':>10}{'peak RSS MB':>14}")
+        for name, statement in VARIANTS.items():
+            parsed, seconds, peak = measure(path, chunksize, statement)
+            print(f"{name:<24}{parsed:>10}{seconds:>10.2f}{peak:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--chunksize", type=int, default=10000)
+    args = parser.parse_args()
+
+    run(args.rows, args.chunksize)
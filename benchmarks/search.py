@@ -0,0 +1,72 @@
+"""
+Benchmark prefix searches over the in-memory search index.
+
+A synthetic BIC directory is generated and indexed, then searches are timed
+for every prefix length from 1 to 11 characters, without filters and with the
+country and headquarter filters. The time to build the index and to apply a
+single write to it is reported as well.
+
+Usage:
+    python benchmarks/search.py --rows 1000000 --searches 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.common import time_calls
+from app.core.bic_generator import write_bic_directory
+from app.core.parser import parse_swift_data
+from app.core.search_index import SwiftCodeIndex
+
+
+def run(rows: int, searches: int, limit: int, seed: int = 42):
+    rng = random.Random(seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "swift_codes.csv")
+        write_bic_directory(csv_path, rows, seed=seed)
+        records = {record["swift_code"]: record for record in parse_swift_data(csv_path)}
+
+    started = time.perf_counter()
+    index = SwiftCodeIndex(records)
+    print(f"Indexed {len(index)} codes in {time.perf_counter() - started:.2f} s")
+
+    sample = [rng.choice(list(records.values())) for _ in range(searches)]
+    new_record = dict(sample[0], swift_code=sample[0]["swift_code"][:8] + "ZZ9")
+    started = time.perf_counter()
+    index.with_changes(upserted=[new_record], deleted=[sample[1]["swift_code"]])
+    print(f"Applied one write in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    print(f"{'prefix length':<16}{'filters':<22}{'p50 ms':>10}{'p99 ms':>10}{'searches/s':>14}")
+    for length in range(1, 12):
+        for filters in ("none", "country", "country+headquarter"):
+            def search(record):
+                country = record["country_ISO2"] if filters != "none" else None
+                headquarter = record["is_headquarter"] if filters == "country+headquarter" else None
+                return index.search(record["swift_code"][:length], limit, country, headquarter)
+
+            result = time_calls(search, sample)
+            print(f"{length:<16}{filters:<22}{result['p50_ms']:>10.4f}{result['p99_ms']:>10.4f}"
+                  f"{result['rps']:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prefix searches over the search index")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--searches", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    run(args.rows, args.searches, args.limit, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark response serialization before and after the orjson fast path.
+
+"before" is the previous path: the handler builds the response scheme, then
+FastAPI validates it again against the route's response_model and encodes it
+with JSONResponse. "after" builds plain dictionaries from the records and
+encodes them once with orjson. No database is involved; only the time spent
+turning records into response bytes is measured.
+
+Usage:
+    python benchmarks/serialization.py --branches 1000 --country-rows 10000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from benchmarks.common import generate_records, print_results, summarize
+from app.api.endpoints.swift_codes import router
+from app.core.serialization import country_json, json_response, swift_code_json
+from app.schemes.SwiftCodeBranch import SwiftCodeBranch
+from app.schemes.SwiftCodesByCountryResponse import SwiftCodesByCountryResponse
+from app.schemes.SwiftCodeWithBranches import SwiftCodeWithBranches
+
+
+def _response_field(path: str):
+    for route in router.routes:
+        if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods:
+            return route.response_field
+    raise LookupError(path)
+
+
+def _branch_scheme(record) -> SwiftCodeBranch:
+    return SwiftCodeBranch(address=record["address"], bankName=record["bank_name"],
+                           countryISO2=record["country_ISO2"], isHeadquarter=record["is_headquarter"],
+                           swiftCode=record["swift_code"])
+
+
+def headquarter_before(headquarter, branches):
+    return SwiftCodeWithBranches(
+        address=headquarter["address"], bankName=headquarter["bank_name"],
+        countryISO2=headquarter["country_ISO2"], countryName=headquarter["country_name"],
+        isHeadquarter=headquarter["is_headquarter"], swiftCode=headquarter["swift_code"],
+        branches=[_branch_scheme(branch) for branch in branches])
+
+
+def country_before(country_code, country_name, records):
+    return SwiftCodesByCountryResponse(
+        countryISO2=country_code, countryName=country_name,
+        swiftCodes=[_branch_scheme(record) for record in records])
+
+
+async def _time(build, field, repeat: int):
+    samples = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        call_started = time.perf_counter()
+        content = build()
+        if field is not None:
+            content = JSONResponse(await serialize_response(field=field, response_content=content)).body
+        samples.append(time.perf_counter() - call_started)
+    return summarize(samples, time.perf_counter() - started), len(content)
+
+
+async def run(branches: int, country_rows: int, repeat: int):
+    bank = generate_records(1, 0, large_banks=1, large_bank_branches=branches)
+    headquarter, bank_branches = bank[0], bank[1:]
+
+    country = generate_records(max(1, country_rows // 10), 9)[:country_rows]
+    for record in country:
+        record["country_ISO2"], record["country_name"] = "PL", "POLAND"
+
+    single_field = _response_field("/v1/swift-codes/{swift_code}")
+    country_field = _response_field("/v1/swift-codes/country/{countryISO2code}")
+
+    workloads = {
+        f"hq-{branches}/before": (lambda: headquarter_before(headquarter, bank_branches), single_field),
+        f"hq-{branches}/after": (lambda: json_response(swift_code_json(headquarter, bank_branches)).body, None),
+        f"country-{country_rows}/before": (lambda: country_before("PL", "POLAND", country), country_field),
+        f"country-{country_rows}/after": (lambda: json_response(country_json("PL", "POLAND", country)).body, None),
+    }
+
+    results = {}
+    for name, (build, field) in workloads.items():
+        results[name], size = await _time(build, field, repeat)
+        print(f"{name}: {size} bytes")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--branches", type=int, default=1000)
+    parser.add_argument("--country-rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print_results("Response serialization", asyncio.run(
+        run(args.branches, args.country_rows, args.repeat)))
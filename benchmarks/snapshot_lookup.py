@@ -0,0 +1,70 @@
+"""
+Benchmark GET /v1/swift-codes/{swift_code} with and without the read snapshot.
+
+Usage:
+    python benchmarks/snapshot_lookup.py --banks 2000 --branches 20 --requests 5000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.common import (create_sqlite_engines, generate_records, make_async_session_override,
+                               measure_requests, print_results, seed_records)
+from app.core.snapshot import clear_snapshot, load_snapshot
+from app.db.database import get_async_read_db
+from main import app
+
+
+async def run(banks: int, branches: int, requests: int, seed: int = 42):
+    with tempfile.TemporaryDirectory() as directory:
+        engine, async_engine = create_sqlite_engines(
+            os.path.join(directory, "bench.db"))
+        records = generate_records(banks, branches, seed=seed)
+        seed_records(engine, records)
+
+        rng = random.Random(seed)
+        headquarters = [r["swift_code"] for r in records if r["is_headquarter"]]
+        codes = [r["swift_code"] for r in records]
+        workloads = {
+            "single": [f"/v1/swift-codes/{rng.choice(codes)}" for _ in range(requests)],
+            "headquarter": [f"/v1/swift-codes/{rng.choice(headquarters)}" for _ in range(requests)]
+        }
+
+        app.dependency_overrides[get_async_read_db] = make_async_session_override(
+            async_engine)
+        results = {}
+
+        try:
+            for workload, paths in workloads.items():
+                clear_snapshot()
+                results[f"{workload}/database"] = await measure_requests(
+                    app, "GET", paths)
+
+                load_snapshot(engine)
+                results[f"{workload}/snapshot"] = await measure_requests(
+                    app, "GET", paths)
+        finally:
+            clear_snapshot()
+            app.dependency_overrides.clear()
+            await async_engine.dispose()
+            engine.dispose()
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--banks", type=int, default=2000)
+    parser.add_argument("--branches", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    print_results(f"{args.banks * (args.branches + 1)} rows, {args.requests} requests per variant",
+                  asyncio.run(run(args.banks, args.branches, args.requests)))
@@ -0,0 +1,98 @@
+"""
+Benchmark fuzzy bank name and address searches over the in-memory text index.
+
+A synthetic BIC directory is generated and indexed, then queries built from
+random records are timed: a single common word, a bank name, a bank name with
+a typo, a street with a typo, a post code, and a query that matches nothing.
+The time and memory to build the index and the time to apply a single write
+to it are reported as well.
+
+Usage:
+    python benchmarks/text_search.py --rows 1000000 --searches 1000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.common import time_calls
+from app.core.bic_generator import write_bic_directory
+from app.core.parser import parse_swift_data
+from app.core.text_index import TextIndex
+
+
+def resident_mib() -> float:
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+def misspell(rng: random.Random, text: str) -> str:
+    """
+    Swap two adjacent letters in the longest word of a text.
+    """
+
+    words = text.split()
+    longest = max(range(len(words)), key=lambda position: len(words[position]))
+    word = words[longest]
+    position = rng.randrange(1, len(word) - 2)
+    words[longest] = word[:position] + word[position + 1] + word[position] + word[position + 2:]
+    return " ".join(words)
+
+
+def run(rows: int, searches: int, limit: int, seed: int = 42):
+    rng = random.Random(seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "swift_codes.csv")
+        write_bic_directory(csv_path, rows, seed=seed)
+        records = {record["swift_code"]: record for record in parse_swift_data(csv_path)}
+
+    resident = resident_mib()
+    started = time.perf_counter()
+    index = TextIndex(records)
+    print(f"Indexed {len(index)} codes in {time.perf_counter() - started:.2f} s "
+          f"using {resident_mib() - resident:.0f} MiB")
+
+    sample = [rng.choice(list(records.values())) for _ in range(searches)]
+    new_record = dict(sample[0], swift_code=sample[0]["swift_code"][:8] + "ZZ9")
+    started = time.perf_counter()
+    index.with_changes(upserted=[new_record], deleted=[sample[1]["swift_code"]])
+    print(f"Applied one write in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    queries = {
+        "common word": lambda record: "BANK",
+        "bank name": lambda record: record["bank_name"],
+        "bank name typo": lambda record: misspell(rng, record["bank_name"]),
+        "street typo": lambda record: misspell(rng, " ".join(record["address"].split()[1:3])),
+        "post code": lambda record: record["address"].split()[-1],
+        "no match": lambda record: "QXZJ VWKY"
+    }
+
+    print(f"{'query':<18}{'p50 ms':>10}{'p99 ms':>10}{'searches/s':>14}{'found':>10}")
+    for name, make_query in queries.items():
+        texts = [make_query(record) for record in sample]
+        found = sum(1 for text in texts if index.search(text, limit))
+        result = time_calls(lambda text: index.search(text, limit), texts)
+        print(f"{name:<18}{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}{result['rps']:>14.1f}"
+              f"{found / len(texts):>10.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fuzzy searches over the text index")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--searches", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    run(args.rows, args.searches, args.limit, args.seed)
+
+
+if __name__ == "__main__":
+    main()
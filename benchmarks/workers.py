@@ -0,0 +1,274 @@
+"""
+Benchmark how the production launcher (server.py) scales with the number of
+worker processes, and how much memory each worker adds.
+
+A synthetic BIC directory is loaded into a throwaway SQLite database. For each
+worker count the launcher is started in a subprocess with the read snapshot
+preloaded in the parent, and GET /v1/swift-codes/{swift_code} is sent over
+real HTTP keep-alive connections from --clients load generator processes for
+--duration seconds. Memory is read from /proc after the run: the RSS of every
+worker, its PSS (shared pages divided among the processes sharing them) and its
+private memory, i.e. what the worker did not share with the parent.
+
+The load generators run on the same machine and compete with the workers for
+CPUs, so compare the numbers between worker counts rather than in absolute terms.
+
+Usage:
+    python benchmarks/workers.py --rows 200000 --workers 1 2 4 8 --duration 10
+    python benchmarks/workers.py --rows 1000000 --clients 4 --output workers.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+
+from benchmarks.common import create_sqlite_engines, make_async_session_override
+from app.core.bic_generator import write_bic_directory
+from app.core.parser import parse_swift_data
+from app.db.bulk_load import bulk_load
+
+DEFAULT_WORKERS = [1, 2, 4, 8]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve_database(path: str, port: int, workers: int):
+    """
+    Run server.py's launcher on the SQLite database at `path` (the --serve mode
+    of this script, started in a subprocess).
+    """
+
+    from app.core.snapshot import load_snapshot
+    from app.db.database import get_async_db, get_async_read_db
+    from main import app
+    from server import serve
+
+    engine, async_engine = create_sqlite_engines(path)
+    override = make_async_session_override(async_engine)
+    app.dependency_overrides[get_async_db] = override
+    app.dependency_overrides[get_async_read_db] = override
+
+    def preload():
+        load_snapshot(engine)
+        engine.dispose()
+
+    sys.exit(serve(app, "127.0.0.1", port, workers, preload=preload, lifespan="off",
+                   access_log=False, log_level="warning"))
+
+
+def worker_pids(parent: int) -> List[int]:
+    try:
+        with open(f"/proc/{parent}/task/{parent}/children") as children:
+            return [int(pid) for pid in children.read().split()]
+    except FileNotFoundError:
+        pids = []
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                try:
+                    with open(f"/proc/{entry}/stat") as stat:
+                        if int(stat.read().rsplit(")", 1)[1].split()[1]) == parent:
+                            pids.append(int(entry))
+                except (FileNotFoundError, ProcessLookupError):
+                    continue
+        return pids
+
+
+def memory_mb(pid: int) -> Dict[str, float]:
+    """
+    Return the RSS, PSS and private memory of a process in MiB, from /proc.
+    """
+
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as rollup:
+        for line in rollup:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+
+    return {
+        "rss_mb": fields.get("Rss", 0.0),
+        "pss_mb": fields.get("Pss", 0.0),
+        "private_mb": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0)
+    }
+
+
+async def _client(port: int, paths: List[str], connections: int, duration: float) -> Tuple[int, int]:
+    """
+    Send GET requests over `connections` keep-alive connections until `duration` has passed.
+
+    Returns:
+        tuple: (successful requests, failed requests)
+    """
+
+    deadline = time.perf_counter() + duration
+    counts = [0, 0]
+
+    async def connection(offset: int):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        index = offset
+        try:
+            while time.perf_counter() < deadline:
+                path = paths[index % len(paths)]
+                index += connections
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                await reader.readexactly(length)
+                counts[0 if head.startswith(b"HTTP/1.1 200") else 1] += 1
+        finally:
+            writer.close()
+
+    await asyncio.gather(*(connection(offset) for offset in range(connections)))
+    return counts[0], counts[1]
+
+
+def run_client(port: int, paths: List[str], connections: int, duration: float) -> Tuple[int, int]:
+    return asyncio.run(_client(port, paths, connections, duration))
+
+
+def wait_until_ready(port: int, path: str, process: subprocess.Popen, timeout: float = 300.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"The server exited with status {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}{path}", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("The server did not become ready in time")
+
+
+def measure(path: str, workers: int, paths: List[str], clients: int, connections: int,
+            duration: float) -> Dict[str, Any]:
+    port = free_port()
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", path,
+                                "--port", str(port), "--workers", str(workers)])
+    try:
+        wait_until_ready(port, paths[0], process)
+        # Every worker must be up before the clock starts.
+        while len(worker_pids(process.pid)) < workers:
+            time.sleep(0.1)
+
+        with ProcessPoolExecutor(clients) as pool:
+            started = time.perf_counter()
+            futures = [pool.submit(run_client, port, paths[index::clients], connections, duration)
+                       for index in range(clients)]
+            counts = [future.result() for future in futures]
+            elapsed = time.perf_counter() - started
+
+        requests = sum(ok for ok, _ in counts)
+        worker_memory = [memory_mb(pid) for pid in worker_pids(process.pid)]
+        parent_memory = memory_mb(process.pid)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=60)
+
+    def mean(key):
+        return sum(memory[key] for memory in worker_memory) / len(worker_memory)
+
+    return {
+        "workers": workers,
+        "requests": requests,
+        "errors": sum(failed for _, failed in counts),
+        "rps": requests / elapsed,
+        "parent_rss_mb": parent_memory["rss_mb"],
+        "worker_rss_mb": mean("rss_mb"),
+        "worker_pss_mb": mean("pss_mb"),
+        "worker_private_mb": mean("private_mb"),
+        "total_pss_mb": parent_memory["pss_mb"] + sum(memory["pss_mb"] for memory in worker_memory)
+    }
+
+
+def run(rows: int, workers: List[int], clients: int, connections: int, duration: float,
+        seed: int = 42) -> List[Dict[str, Any]]:
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "swift_codes.csv")
+        write_bic_directory(csv_path, rows, seed=seed)
+        records = parse_swift_data(csv_path)
+
+        database_path = os.path.join(directory, "bench.db")
+        engine, _ = create_sqlite_engines(database_path)
+        bulk_load(engine, records)
+        engine.dispose()
+
+        rng = random.Random(seed)
+        paths = [f"/v1/swift-codes/{rng.choice(records)['swift_code']}" for _ in range(10000)]
+        del records
+
+        for count in workers:
+            results.append(measure(database_path, count, paths, clients, connections, duration))
+            print_row(results[-1])
+
+    return results
+
+
+def print_header():
+    print(f"{'workers':>8}{'rps':>12}{'errors':>8}{'parent RSS':>12}{'worker RSS':>12}"
+          f"{'worker PSS':>12}{'private':>10}{'total PSS':>12}")
+
+
+def print_row(result: Dict[str, Any]):
+    print(f"{result['workers']:>8}{result['rps']:>12.1f}{result['errors']:>8}"
+          f"{result['parent_rss_mb']:>12.1f}{result['worker_rss_mb']:>12.1f}"
+          f"{result['worker_pss_mb']:>12.1f}{result['worker_private_mb']:>10.1f}"
+          f"{result['total_pss_mb']:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark requests per second and memory per worker of server.py")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--workers", type=int, nargs="+", default=DEFAULT_WORKERS)
+    parser.add_argument("--clients", type=int, default=os.cpu_count() or 1,
+                        help="Load generator processes")
+    parser.add_argument("--connections", type=int, default=16,
+                        help="Keep-alive connections per load generator")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--serve", metavar="DATABASE", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve_database(args.serve, args.port, args.workers[0])
+        return
+
+    print(f"{args.rows} rows, {args.clients} load generators x {args.connections} connections, "
+          f"{args.duration:g} s per run, {os.cpu_count()} CPUs (memory in MiB)")
+    print_header()
+    results = run(args.rows, args.workers, args.clients, args.connections, args.duration, args.seed)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
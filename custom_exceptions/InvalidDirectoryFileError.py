@@ -0,0 +1,6 @@
+class InvalidDirectoryFileError(Exception):
+    """Raised when a file is not a compiled SWIFT directory or was written by an unsupported version."""
+
+    def __init__(self, message="File is not a compiled SWIFT directory"):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,6 @@
+class MalformedBodyError(Exception):
+    """Raised when a bulk request body is not valid NDJSON or a JSON array."""
+
+    def __init__(self, message="Request body is not valid NDJSON or a JSON array"):
+        self.message = message
+        super().__init__(self.message)
\ No newline at end of file
@@ -1,20 +1,46 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.api.endpoints import swift_codes
-from app.db.database import init_db
+from app.api.endpoints import health, internal, metrics, swift_codes
+from app.core.config import get_settings
+from app.core.metrics import MetricsMiddleware, flush_metrics, write_metrics_file
+from app.core.warmup import warm_up
+from app.db.instrumentation import QueryHeadersMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    init_db()
+    # Warm-up runs in the background so that /health/live answers right away;
+    # /health/ready reports ready once it has completed. Under server.py the
+    # parent runs every phase but the connections before the workers fork.
+    warm_up_task = asyncio.create_task(warm_up(app))
+
+    # With several workers, each one writes its metrics to METRICS_DIR for the
+    # worker that answers /metrics to merge them.
+    settings = get_settings()
+    flush_task = None
+    if settings.METRICS_ENABLED and settings.METRICS_DIR:
+        flush_task = asyncio.create_task(flush_metrics(settings.METRICS_DIR, settings.METRICS_FLUSH_SECONDS))
 
     yield
 
-    pass
+    warm_up_task.cancel()
+    if flush_task is not None:
+        flush_task.cancel()
+        write_metrics_file(settings.METRICS_DIR)
 
 app = FastAPI(lifespan=lifespan)
 
 app.include_router(swift_codes.router)
+app.include_router(internal.router)
+app.include_router(health.router)
+
+if get_settings().METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
+
+if get_settings().DB_DEBUG_HEADERS:
+    app.add_middleware(QueryHeadersMiddleware)
 
 if __name__ == "__main__":
     import uvicorn
@@ -2,7 +2,8 @@
 SWIFT Codes Data Loader
 
 This script loads SWIFT code data from a CSV file into a database. It handles database
-connection management, data parsing, and bulk insertion of records.
+connection management, data parsing, and bulk insertion of records through the shared
+bulk loader in app/db/bulk_load.py.
 
 The script will wait for the database to be available before attempting to load data,
 making it suitable for use in containerized environments where the database may start
@@ -13,14 +14,15 @@ after this script.
 import time
 import sys
 import os
-from sqlalchemy import create_engine, text
+import argparse
+from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
 
 sys.path.insert(0, os.path.abspath(
     os.path.join(os.path.dirname(__file__), '..')))
 
-from app.core.parser import parse_swift_data
-from app.models.swift_code import swift_codes
+from app.db.bulk_load import LOAD_MODES, create_loader_engine
+from app.db.load_data import load_data as load_data_into
 
 
 DB_USER = os.getenv("MYSQL_USER")
@@ -31,6 +33,7 @@ DB_NAME = os.getenv("MYSQL_DATABASE")
 
 DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 PATH_TO_CSV = "data/Interns_2025_SWIFT_CODES - Sheet1.csv"
+LOAD_MODE = os.getenv("LOAD_MODE", "executemany")
 
 
 def wait_for_db(max_retries=20, delay=3):
@@ -53,7 +56,7 @@ def wait_for_db(max_retries=20, delay=3):
     """
 
     print("Waiting for database to be ready...")
-    engine = create_engine(DATABASE_URL)
+    engine = create_loader_engine(DATABASE_URL, LOAD_MODE)
 
     for i in range(max_retries):
         try:
@@ -69,53 +72,52 @@ def wait_for_db(max_retries=20, delay=3):
     raise Exception("Failed to connect to database after multiple attempts.")
 
 
-def load_data(engine):
+def load_data(engine, path=PATH_TO_CSV, batch_size=None, mode=None, delta=False, force=False):
     """
     Load SWIFT codes from CSV file into the database.
-    
+
     This function parses the CSV file containing SWIFT code data,
-    then inserts the data into the database. It uses the IGNORE prefix
-    to avoid errors when inserting duplicate records.
-    
+    then inserts the data into the database in batches using the shared
+    bulk loader. Existing SWIFT codes are skipped.
+
     Args:
         engine (SQLAlchemy Engine): Database engine to use for insertion
-        
+        path (str): Path to the CSV file
+        batch_size (int): Records per batch (default: LOAD_BATCH_SIZE)
+        mode (str): "executemany" or "load_data" (default: LOAD_MODE)
+        delta (bool): Apply only the differences between the file and the table
+        force (bool): With delta, diff the file even if it is unchanged since the last sync
+
     Returns:
         bool: True if data was loaded successfully, False otherwise
     """
-    
-    try:
-        parsed_data = parse_swift_data(PATH_TO_CSV)
-        print(f"Successfully parsed {len(parsed_data)} records")
-    except Exception as e:
-        print(f"Parse error occurred: {str(e)}")
-        return False
 
-    try:
-        from sqlalchemy.dialects.mysql import insert
-
-        with engine.begin() as conn:
-            inserted_records = 0
-            for record in parsed_data:
-                statement = insert(swift_codes).values(
-                    record).prefix_with("IGNORE")
-                conn.execute(statement)
-                inserted_records += 1
-            print(f"Successfully inserted {inserted_records} records")
-        return True
-    except Exception as e:
-        print(f"Database error occurred: {str(e)}")
-        return False
+    return load_data_into(engine, path=path, batch_size=batch_size, mode=mode,
+                          delta=delta, force=force)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load SWIFT codes from CSV into the database.")
+    parser.add_argument("--path", default=PATH_TO_CSV)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--mode", choices=LOAD_MODES, default=None)
+    parser.add_argument("--delta", action="store_true",
+                        help="apply only the differences between the file and the table")
+    parser.add_argument("--force", action="store_true",
+                        help="with --delta, diff the file even if it is unchanged")
+    args = parser.parse_args()
+
+    if args.mode:
+        LOAD_MODE = args.mode
+
     try:
         engine = wait_for_db()
 
         from app.db.database import Base, metadata
 
         metadata.create_all(engine)
-        success = load_data(engine)
+        success = load_data(engine, path=args.path, batch_size=args.batch_size,
+                            mode=LOAD_MODE, delta=args.delta, force=args.force)
 
         if success:
             print("Data loaded successfully")
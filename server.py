@@ -0,0 +1,237 @@
+"""
+Production launcher for the SWIFT codes API.
+
+The parent process loads the SWIFT dataset once, retrying until the database
+is up, binds the listening socket, then forks the workers. The workers inherit
+the read snapshot and share its memory copy-on-write instead of each loading
+its own copy. The worker count
+defaults to the number of CPUs available to the process, and the fastest
+installed event loop (uvloop) and HTTP parser (httptools) are used.
+The parent restarts workers that die and forwards SIGINT / SIGTERM to them.
+
+Usage:
+    python server.py
+    python server.py --workers 4 --host 0.0.0.0 --port 8080
+"""
+
+import argparse
+import gc
+import importlib.util
+import os
+import signal
+import sys
+import tempfile
+from typing import Callable, Dict, Optional
+
+import uvicorn
+
+from app.core.config import get_settings
+
+# Exit status of a worker whose application failed to start (as used by uvicorn).
+STARTUP_FAILURE = 3
+
+
+def available_cpus() -> int:
+    """
+    Return the number of CPUs this process may run on.
+    """
+
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def resolve_workers(requested: int) -> int:
+    """
+    Return the number of workers to start: `requested`, or one per CPU when it is 0.
+    """
+
+    return requested if requested > 0 else available_cpus()
+
+
+def fastest_loop() -> str:
+    """
+    Return the uvicorn event loop to use: uvloop when installed, asyncio otherwise.
+    """
+
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def fastest_http() -> str:
+    """
+    Return the uvicorn HTTP implementation to use: httptools when installed, h11 otherwise.
+    """
+
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def preload_app(app):
+    """
+    Run the startup phases of the application that the workers can share in
+    the current process: imports, table creation, the read snapshot, the search
+    index and the text index (when SNAPSHOT_ENABLED, SEARCH_INDEX_ENABLED and
+    TEXT_INDEX_ENABLED are set) and the OpenAPI schema.
+
+    Meant to run in the parent before the workers are forked. Phases are timed
+    and retried until they succeed, as in the workers' warm-up, so the launcher
+    waits for the database instead of exiting. The engine's pooled connections
+    are closed afterwards, so that no worker inherits a connection that another
+    process also uses.
+
+    Args:
+        app (FastAPI): The application the workers serve.
+    """
+
+    from app.core.warmup import preload
+    from app.db import database
+
+    preload(app)
+    database.engine.dispose()
+
+
+class WorkerSupervisor:
+    """
+    Forks the uvicorn workers that share one listening socket and keeps them running.
+    """
+
+    def __init__(self, config: uvicorn.Config, workers: int):
+        self.config = config
+        self.workers = workers
+        self.socket = None
+        self.children: Dict[int, int] = {}
+        self.should_exit = False
+        self.status = 0
+
+    def spawn(self, index: int):
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+        self.children[pid] = index
+
+    def _run_worker(self):
+        status = 1
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            server = uvicorn.Server(self.config)
+            server.run(sockets=[self.socket])
+            status = 0 if server.started else STARTUP_FAILURE
+        finally:
+            # Never return into the parent's code path.
+            os._exit(status)
+
+    def handle_exit(self, signum, frame):
+        self.should_exit = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self, socket) -> int:
+        """
+        Fork the workers and wait for them, restarting any that die, until
+        the parent is asked to stop.
+
+        Returns:
+            int: The exit status for the launcher.
+        """
+
+        self.socket = socket
+        # Objects created so far (modules, the snapshot) are moved out of the
+        # collector's reach, so that collections in the workers do not write to
+        # their pages and break the copy-on-write sharing.
+        gc.collect()
+        gc.freeze()
+
+        signal.signal(signal.SIGINT, self.handle_exit)
+        signal.signal(signal.SIGTERM, self.handle_exit)
+
+        for index in range(self.workers):
+            self.spawn(index)
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+
+            index = self.children.pop(pid, None)
+            if index is None or self.should_exit:
+                continue
+
+            exit_code = os.waitstatus_to_exitcode(status)
+            if exit_code == STARTUP_FAILURE:
+                print(f"Worker {pid} failed to start; shutting down.")
+                self.status = STARTUP_FAILURE
+                self.handle_exit(None, None)
+                continue
+
+            print(f"Worker {pid} exited with status {exit_code}; restarting it.")
+            self.spawn(index)
+
+        return self.status
+
+
+def serve(app, host: str, port: int, workers: int = 0, preload: Optional[Callable[[], None]] = None,
+          lifespan: str = "auto", access_log: bool = True, log_level: str = "info") -> int:
+    """
+    Run `app` in a pre-forked pool of uvicorn workers.
+
+    Args:
+        app: ASGI application, imported in the parent so the workers share it.
+        host: Address to listen on.
+        port: Port to listen on.
+        workers: Number of worker processes; 0 starts one per CPU.
+        preload: Called in the parent before forking, to load shared data.
+        lifespan: uvicorn lifespan mode of the workers.
+        access_log: Whether the workers log every request.
+        log_level: uvicorn log level.
+
+    Returns:
+        int: The exit status for the launcher.
+    """
+
+    workers = resolve_workers(workers)
+    config = uvicorn.Config(app, host=host, port=port, loop=fastest_loop(), http=fastest_http(),
+                            lifespan=lifespan, access_log=access_log, log_level=log_level)
+
+    if preload is not None:
+        preload()
+
+    socket = config.bind_socket()
+    print(f"Starting {workers} workers (loop={config.loop}, http={config.http}).")
+
+    return WorkerSupervisor(config, workers).run(socket)
+
+
+def main():
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Run the SWIFT codes API with one worker per CPU")
+    parser.add_argument("--host", default=settings.WEB_HOST)
+    parser.add_argument("--port", type=int, default=settings.WEB_PORT)
+    parser.add_argument("--workers", type=int, default=settings.WEB_CONCURRENCY,
+                        help="Worker processes; 0 starts one per CPU")
+    parser.add_argument("--no-access-log", action="store_true",
+                        help="Do not log every request")
+    args = parser.parse_args()
+
+    from app.core.metrics import clear_metrics_dir
+    from main import app
+
+    # Every worker counts its own requests; with several of them, /metrics
+    # merges the files they write to METRICS_DIR.
+    if settings.METRICS_ENABLED and resolve_workers(args.workers) > 1:
+        if settings.METRICS_DIR:
+            clear_metrics_dir(settings.METRICS_DIR)
+        else:
+            settings.METRICS_DIR = tempfile.mkdtemp(prefix="swift-metrics-")
+
+    sys.exit(serve(app, args.host, args.port, args.workers, preload=lambda: preload_app(app),
+                   access_log=not args.no_access_log))
+
+
+if __name__ == "__main__":
+    main()
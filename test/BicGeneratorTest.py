@@ -0,0 +1,120 @@
+import collections
+import os
+import tempfile
+import unittest
+from app.core.bic_generator import branch_code, generate_bic_directory, write_bic_directory
+from app.core.parser import parse_swift_data
+
+from custom_exceptions.InvalidSwiftCodeError import InvalidSwiftCodeError
+from custom_exceptions.DuplicateSwiftCodeError import DuplicateSwiftCodeError
+
+
+class BicGeneratorTest(unittest.TestCase):
+    """
+    Unit test class for the synthetic BIC directory generator. This class verifies that
+    the generated files are deterministic, accepted by parse_swift_data, skewed as
+    configured, and that injected invalid and duplicate rows are rejected by the parser.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_deterministic_from_seed(self):
+        """
+        Test case: The generator is run twice with the same seed and once with another seed.
+        Expected behavior: The same seed yields identical rows; another seed yields different rows.
+        """
+        first = list(generate_bic_directory(500, seed=7))
+
+        self.assertEqual(first, list(generate_bic_directory(500, seed=7)))
+        self.assertNotEqual(first, list(generate_bic_directory(500, seed=8)))
+
+    def test_generated_file_parses(self):
+        """
+        Test case: A directory of 3000 rows with 80% branches is written and parsed.
+        Expected behavior: Every row is parsed, 20% are headquarters, every branch
+        follows its headquarter's prefix and the country matches the code.
+        """
+        stats = write_bic_directory(self.path("directory.csv"), 3000, branch_ratio=0.8)
+        records = parse_swift_data(self.path("directory.csv"))
+
+        self.assertEqual(stats["rows"], 3000)
+        self.assertEqual(len(records), 3000)
+        self.assertEqual(sum(record["is_headquarter"] for record in records), 600)
+        for record in records:
+            self.assertEqual(record["swift_code"][4:6], record["country_ISO2"])
+
+    def test_skewed_bank_sizes_and_countries(self):
+        """
+        Test case: A skewed and an unskewed directory of 20000 rows are generated.
+        Expected behavior: With skew the largest bank has thousands of branches and the
+        most common country holds a larger share of the banks than without skew.
+        """
+        def banks_and_countries(**options):
+            rows = list(generate_bic_directory(20000, **options))
+            banks = collections.Counter(row["SWIFT CODE"][:8] for row in rows)
+            countries = collections.Counter(row["COUNTRY ISO2 CODE"] for row in rows
+                                            if row["SWIFT CODE"].endswith("XXX"))
+            return max(banks.values()), max(countries.values())
+
+        skewed_bank, skewed_country = banks_and_countries(bank_skew=1.1, country_skew=1.0)
+        even_bank, even_country = banks_and_countries(bank_skew=0, country_skew=0)
+
+        self.assertGreater(skewed_bank, 1000)
+        self.assertLess(even_bank, 10)
+        self.assertGreater(skewed_country, 2 * even_country)
+
+    def test_injected_invalid_rows(self):
+        """
+        Test case: A directory is generated with 1% invalid rows.
+        Expected behavior: The parser rejects the file with an InvalidSwiftCodeError.
+        """
+        write_bic_directory(self.path("invalid.csv"), 1000, invalid_rate=0.01)
+
+        with self.assertRaises(InvalidSwiftCodeError):
+            parse_swift_data(self.path("invalid.csv"))
+
+    def test_injected_duplicate_rows(self):
+        """
+        Test case: A directory is generated with 1% duplicate rows.
+        Expected behavior: Ten codes repeat earlier ones and the parser rejects the
+        file with a DuplicateSwiftCodeError.
+        """
+        rows = list(generate_bic_directory(1000, duplicate_rate=0.01))
+        codes = collections.Counter(row["SWIFT CODE"] for row in rows)
+        write_bic_directory(self.path("duplicate.csv"), 1000, duplicate_rate=0.01)
+
+        self.assertEqual(len(rows), 1000)
+        self.assertEqual(sum(count - 1 for count in codes.values()), 10)
+        with self.assertRaises(DuplicateSwiftCodeError):
+            parse_swift_data(self.path("duplicate.csv"))
+
+    def test_branch_code_skips_headquarter_suffix(self):
+        """
+        Test case: Branch codes are generated around the position of 'XXX'.
+        Expected behavior: 'XXX' is never returned and codes stay unique.
+        """
+        codes = [branch_code(index) for index in range(30000, 31000)]
+
+        self.assertNotIn("XXX", codes)
+        self.assertEqual(len(set(codes)), len(codes))
+
+    def test_invalid_arguments(self):
+        """
+        Test case: A branch ratio of 1 or injection rates summing to 1 are requested.
+        Expected behavior: A ValueError is raised.
+        """
+        with self.assertRaises(ValueError):
+            list(generate_bic_directory(10, branch_ratio=1))
+        with self.assertRaises(ValueError):
+            list(generate_bic_directory(10, invalid_rate=0.5, duplicate_rate=0.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+from sqlalchemy import create_engine, select
+
+from app.db.bulk_load import EXECUTEMANY, batched, bulk_load
+from app.db.database import Base
+from app.models.dataset_version import DatasetVersionModel, dataset_versions
+from app.models.swift_code import SwiftCodeModel, swift_codes
+from test.helpers import make_record
+
+
+class BulkLoadTest(unittest.TestCase):
+    """
+    Unit test class for the shared bulk loader. This class verifies batch splitting, the
+    inserted counts when codes already exist, the dataset version bumps, the derived
+    columns and the validation of the arguments, against SQLite.
+    """
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        self.addCleanup(self.engine.dispose)
+        Base.metadata.create_all(bind=self.engine, tables=[SwiftCodeModel.__table__, DatasetVersionModel.__table__])
+
+    def versions(self):
+        with self.engine.connect() as conn:
+            return dict(conn.execute(select(dataset_versions.c.scope, dataset_versions.c.version)).all())
+
+    def test_batched(self):
+        """
+        Test case: Seven items and an empty iterable are split into batches of three.
+        Expected behavior: Batches of three, three and one are returned; nothing is returned for no items.
+        """
+        self.assertEqual(list(batched(iter(range(7)), 3)), [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual(list(batched([], 3)), [])
+
+    def test_batches_skip_existing_codes(self):
+        """
+        Test case: Five records are loaded in batches of two into a table that already holds one of them.
+        Expected behavior: Three batches are committed and only the four new codes are counted as inserted.
+        """
+        bulk_load(self.engine, [make_record("AAAAPLPWXXX"), make_record("AAAAPLPW002")])
+        received = []
+
+        stats = bulk_load(self.engine, (make_record(f"AAAAPLPW{number:03d}") for number in range(5)),
+                          batch_size=2, on_batch=received.append)
+
+        self.assertEqual(stats["mode"], EXECUTEMANY)
+        self.assertEqual((stats["rows"], stats["inserted"]), (5, 4))
+        self.assertEqual([(batch["rows"], batch["inserted"]) for batch in stats["batches"]], [(2, 2), (2, 1), (1, 1)])
+        self.assertEqual(received, stats["batches"])
+        with self.engine.connect() as conn:
+            self.assertEqual(len(conn.execute(select(swift_codes)).all()), 6)
+
+    def test_versions_bumped_per_inserting_batch(self):
+        """
+        Test case: A batch of Polish and German codes is loaded, then the same codes again.
+        Expected behavior: Both countries and the global version are bumped once; a batch
+        that inserts nothing bumps nothing.
+        """
+        records = [make_record("AAAAPLPWXXX"), make_record("BBBBDEFFXXX")]
+
+        bulk_load(self.engine, records)
+        self.assertEqual(self.versions(), {"*": 1, "PL": 1, "DE": 1})
+
+        stats = bulk_load(self.engine, records)
+        self.assertEqual(stats["inserted"], 0)
+        self.assertEqual(self.versions(), {"*": 1, "PL": 1, "DE": 1})
+
+    def test_derived_columns_are_filled(self):
+        """
+        Test case: A headquarter, a branch and an 8-character code are loaded with executemany.
+        Expected behavior: bank_prefix and branch_code are derived from every SWIFT code.
+        """
+        bulk_load(self.engine, [make_record("AAAAPLPWXXX"), make_record("AAAAPLPW123"), make_record("BBBBPLPW")])
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(swift_codes.c.swift_code, swift_codes.c.bank_prefix,
+                                       swift_codes.c.branch_code).order_by(swift_codes.c.swift_code)).all()
+
+        self.assertEqual([tuple(row) for row in rows], [("AAAAPLPW123", "AAAAPLPW", "123"),
+                                                       ("AAAAPLPWXXX", "AAAAPLPW", "XXX"),
+                                                       ("BBBBPLPW", "BBBBPLPW", "")])
+
+    def test_invalid_arguments(self):
+        """
+        Test case: The loader is called with a batch size of zero and with an unknown mode.
+        Expected behavior: ValueError is raised before anything is written.
+        """
+        with self.assertRaises(ValueError):
+            bulk_load(self.engine, [make_record("AAAAPLPWXXX")], batch_size=0)
+        with self.assertRaises(ValueError):
+            bulk_load(self.engine, [make_record("AAAAPLPWXXX")], mode="copy")
+
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(select(swift_codes)).all(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
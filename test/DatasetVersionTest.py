@@ -0,0 +1,76 @@
+import unittest
+from datetime import datetime
+from sqlalchemy import create_engine, select
+from starlette.requests import Request
+
+from app.core.conditional import is_not_modified, validator_headers
+from app.db.dataset_versions import GLOBAL_SCOPE, bump_versions, record_scopes
+from app.models.dataset_version import dataset_versions
+
+
+def make_request(**headers):
+    return Request({"type": "http", "headers": [
+        (name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]})
+
+
+class DatasetVersionTest(unittest.TestCase):
+    """
+    Unit test class for the dataset versions behind the ETag headers. This class verifies
+    which countries a write touches, how versions are bumped and how conditional headers are evaluated.
+    """
+
+    def test_record_scopes_include_code_country(self):
+        """
+        Test case: A record whose stored country differs from the country part of its SWIFT code.
+        Expected behavior: Both countries are returned.
+        """
+        self.assertEqual(record_scopes([{"swift_code": "AAAAXKCCXXX", "country_ISO2": "rs"}]),
+                         {"XK", "RS"})
+
+    def test_bump_versions_increments_country_and_global(self):
+        """
+        Test case: Versions are bumped for PL, for PL and DE, for DE and for no country.
+        Expected behavior: PL and DE are at version 2 and the global version counts every bump.
+        """
+        engine = create_engine("sqlite://")
+        dataset_versions.create(engine)
+
+        with engine.begin() as conn:
+            bump_versions(conn, {"PL"})
+            bump_versions(conn, {"PL", "DE"})
+            bump_versions(conn, {"DE"})
+            bump_versions(conn, set())
+
+        with engine.connect() as conn:
+            versions = dict(conn.execute(select(dataset_versions.c.scope, dataset_versions.c.version)).all())
+
+        self.assertEqual(versions, {"PL": 2, "DE": 2, GLOBAL_SCOPE: 4})
+
+    def test_if_none_match(self):
+        """
+        Test case: Requests carry a matching, a weak matching, a listed and a stale If-None-Match.
+        Expected behavior: Only the stale tag is reported as modified.
+        """
+        headers = validator_headers("PL", 3, datetime(2025, 1, 1))
+        etag = headers["ETag"]
+
+        self.assertTrue(is_not_modified(make_request(if_none_match=etag), headers))
+        self.assertTrue(is_not_modified(make_request(if_none_match=f"W/{etag}"), headers))
+        self.assertTrue(is_not_modified(make_request(if_none_match=f'"other", {etag}'), headers))
+        self.assertFalse(is_not_modified(make_request(if_none_match='"PL.2.0"'), headers))
+
+    def test_if_modified_since(self):
+        """
+        Test case: Requests carry If-Modified-Since at and before the last modification.
+        Expected behavior: Not modified at the last modification time, modified before it.
+        """
+        headers = validator_headers("PL", 3, datetime(2025, 1, 1, 12))
+
+        self.assertTrue(is_not_modified(make_request(
+            if_modified_since=headers["Last-Modified"]), headers))
+        self.assertFalse(is_not_modified(make_request(
+            if_modified_since="Wed, 01 Jan 2025 11:00:00 GMT"), headers))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import csv
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, select
+
+from app.db import delta_sync as delta_sync_module
+from app.db.database import Base
+from app.db.delta_sync import delta_sync, file_fingerprint, record_hash
+from app.models.dataset_version import DatasetVersionModel, dataset_versions
+from app.models.swift_code import SwiftCodeModel, swift_codes
+from app.models.sync_state import SyncStateModel
+from test.helpers import make_record
+
+
+def write_csv(path, records):
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["COUNTRY ISO2 CODE", "SWIFT CODE", "NAME", "ADDRESS", "COUNTRY NAME"])
+        for record in records:
+            writer.writerow([record["country_ISO2"], record["swift_code"], record["bank_name"],
+                             record["address"], record["country_name"]])
+
+
+class DeltaSyncTest(unittest.TestCase):
+    """
+    Unit test class for delta_sync and its hashing helpers. This class verifies that equal
+    content hashes equally regardless of where it was read from, that any change is detected,
+    and that a sync against SQLite applies exactly the differences of a file.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "swift_codes.csv")
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.directory.name, 'sync.db')}")
+        self.addCleanup(self.engine.dispose)
+        Base.metadata.create_all(bind=self.engine, tables=[
+            SwiftCodeModel.__table__, DatasetVersionModel.__table__, SyncStateModel.__table__])
+
+    def rows(self):
+        with self.engine.connect() as conn:
+            return {row["swift_code"]: dict(row) for row in conn.execute(select(swift_codes)).mappings()}
+
+    def versions(self):
+        with self.engine.connect() as conn:
+            return dict(conn.execute(select(dataset_versions.c.scope, dataset_versions.c.version)).all())
+
+    def test_equal_records_hash_equally(self):
+        """
+        Test case: Two records with the same content are hashed.
+        Expected behavior: Both hashes are equal.
+        """
+        self.assertEqual(record_hash(make_record("AAAAUSCCXXX")), record_hash(make_record("AAAAUSCCXXX")))
+
+    def test_changed_field_changes_hash(self):
+        """
+        Test case: A record with a changed address is hashed.
+        Expected behavior: The hash differs from the original record's hash.
+        """
+        self.assertNotEqual(record_hash(make_record("AAAAUSCCXXX")),
+                            record_hash(make_record("AAAAUSCCXXX", address="456 OTHER ST")))
+
+    def test_null_and_empty_string_hash_equally(self):
+        """
+        Test case: A database row with a NULL address and a parsed record with an empty address are hashed.
+        Expected behavior: Both hashes are equal, so the row is not reported as changed.
+        """
+        self.assertEqual(record_hash(make_record("AAAAUSCCXXX", address=None)),
+                         record_hash(make_record("AAAAUSCCXXX", address="")))
+
+    def test_headquarter_flag_representation(self):
+        """
+        Test case: The headquarter flag is given as a boolean and as an integer.
+        Expected behavior: Both representations hash equally, and flipping the flag changes the hash.
+        """
+        self.assertEqual(record_hash(make_record("AAAAUSCCXXX", is_headquarter=True)),
+                         record_hash(make_record("AAAAUSCCXXX", is_headquarter=1)))
+        self.assertNotEqual(record_hash(make_record("AAAAUSCCXXX", is_headquarter=True)),
+                            record_hash(make_record("AAAAUSCCXXX", is_headquarter=False)))
+
+    def test_file_fingerprint_is_stable(self):
+        """
+        Test case: The same file is fingerprinted twice and compared with a different file.
+        Expected behavior: The fingerprint is stable for the same file and differs between files.
+        """
+        self.assertEqual(file_fingerprint("test/data/test_5.csv"),
+                         file_fingerprint("test/data/test_5.csv"))
+        self.assertNotEqual(file_fingerprint("test/data/test_5.csv"),
+                            file_fingerprint("test/data/test_6.csv"))
+
+    def test_sync_inserts_updates_and_deletes(self):
+        """
+        Test case: A file is synced into an empty table, then a changed file with one new,
+        one updated and one removed code is synced.
+        Expected behavior: The first sync inserts every code; the second applies only the three
+        differences, fills the derived columns and bumps the versions of the changed countries only.
+        """
+        write_csv(self.path, [make_record("AAAAPLPWXXX", country_name="POLAND"),
+                              make_record("AAAAPLPW123", country_name="POLAND"),
+                              make_record("BBBBDEFFXXX", country_name="GERMANY")])
+        stats = delta_sync(self.engine, self.path)
+        self.assertEqual((stats["inserted"], stats["updated"], stats["deleted"]), (3, 0, 0))
+        self.assertEqual(self.versions(), {"*": 1, "PL": 1, "DE": 1})
+
+        write_csv(self.path, [make_record("AAAAPLPWXXX", country_name="POLAND"),
+                              make_record("AAAAPLPW123", address="NEW ADDRESS", country_name="POLAND"),
+                              make_record("CCCCCZPPXXX", country_name="CZECHIA")])
+        stats = delta_sync(self.engine, self.path)
+
+        self.assertEqual((stats["rows"], stats["inserted"], stats["updated"], stats["deleted"], stats["unchanged"]),
+                         (3, 1, 1, 1, 1))
+        self.assertEqual(sorted(stats["upserted_codes"]), ["AAAAPLPW123", "CCCCCZPPXXX"])
+        self.assertEqual(stats["deleted_codes"], ["BBBBDEFFXXX"])
+
+        rows = self.rows()
+        self.assertEqual(sorted(rows), ["AAAAPLPW123", "AAAAPLPWXXX", "CCCCCZPPXXX"])
+        self.assertEqual(rows["AAAAPLPW123"]["address"], "NEW ADDRESS")
+        self.assertEqual((rows["CCCCCZPPXXX"]["bank_prefix"], rows["CCCCCZPPXXX"]["branch_code"]),
+                         ("CCCCCZPP", "XXX"))
+        self.assertEqual(self.versions(), {"*": 2, "PL": 2, "DE": 2, "CZ": 1})
+
+    def test_unchanged_file_is_skipped_unless_forced(self):
+        """
+        Test case: The same file is synced twice, then once more with force after a row was changed
+        directly in the database.
+        Expected behavior: The second sync is skipped without touching the table; the forced sync
+        diffs the file and restores the row.
+        """
+        write_csv(self.path, [make_record("AAAAPLPWXXX", country_name="POLAND")])
+        delta_sync(self.engine, self.path)
+        with self.engine.begin() as conn:
+            conn.execute(swift_codes.update().values(address="EDITED"))
+
+        stats = delta_sync(self.engine, self.path)
+        self.assertTrue(stats["skipped"])
+        self.assertEqual(self.rows()["AAAAPLPWXXX"]["address"], "EDITED")
+
+        stats = delta_sync(self.engine, self.path, force=True)
+        self.assertFalse(stats["skipped"])
+        self.assertEqual(stats["updated"], 1)
+        self.assertEqual(self.rows()["AAAAPLPWXXX"]["address"], "ADDRESS")
+
+    def test_hash_query_does_not_stream_the_connection(self):
+        """
+        Test case: The stored hashes are read inside a sync transaction.
+        Expected behavior: Only the hash query streams; the connection's execution options are unchanged.
+        """
+        with self.engine.begin() as conn:
+            delta_sync_module._current_hashes(conn)
+            self.assertNotIn("stream_results", conn.get_execution_options())
+            self.assertNotIn("yield_per", conn.get_execution_options())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, delete
+
+from app.core.bic_generator import write_bic_directory
+from app.core.directory_file import DirectoryFile, compile_database, compile_directory
+from app.core.parser import parse_swift_data
+from app.core.snapshot import clear_snapshot, get_snapshot, load_snapshot_file
+from app.db.bulk_load import bulk_load
+from app.db.database import Base
+from app.db.dataset_versions import bump_versions
+from app.models.dataset_version import DatasetVersionModel, dataset_versions
+from app.models.swift_code import SwiftCodeModel, swift_codes
+from custom_exceptions.InvalidDirectoryFileError import InvalidDirectoryFileError
+from test.helpers import make_record
+
+
+class DirectoryFileTest(unittest.TestCase):
+    """
+    Unit test class for the binary directory file. This class verifies that compiled
+    files return the parsed records unchanged by code, prefix and country, and that
+    invalid input is rejected.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "directory.bin")
+        self.records = [
+            make_record("BBBBDEFFXXX", "BANK B", "1 STRASSE", country_name="GERMANY"),
+            make_record("AAAAPLPWXXX", "BANK A", "ULICA 1", country_name="POLAND"),
+            make_record("AAAAPLPW123", "BANK A BRANCH", "ULICA 2", country_name="POLAND"),
+            make_record("AAAAPLPW", "BANK A", "ULICA 1", country_name="POLAND"),
+            make_record("CCCCPLKR001", "BANK C", "ŁÓDŹ 3", country_name="POLAND")
+        ]
+        self.stats = compile_directory(self.records, self.path)
+        self.file = DirectoryFile(self.path)
+
+    def tearDown(self):
+        self.file.close()
+        self.directory.cleanup()
+
+    def test_get_returns_records(self):
+        """
+        Test case: Every compiled code is looked up, including an 8-character code and non-ASCII strings.
+        Expected behavior: Each record is returned exactly as it was compiled.
+        """
+        self.assertEqual(len(self.file), 5)
+        self.assertEqual(self.stats["countries"], 2)
+        for record in self.records:
+            self.assertEqual(self.file.get(record["swift_code"]), record)
+
+    def test_get_missing_code(self):
+        """
+        Test case: Codes that are not in the file are looked up.
+        Expected behavior: None is returned.
+        """
+        self.assertIsNone(self.file.get("AAAAPLPW124"))
+        self.assertIsNone(self.file.get("ZZZZZZZZXXX"))
+        self.assertIsNone(self.file.get("AAAAPLPWŻŻŻ"))
+
+    def test_prefix_and_bank_lookups(self):
+        """
+        Test case: Records are requested by bank prefix and by shorter code prefixes, with a limit.
+        Expected behavior: The matching records are returned in code order.
+        """
+        codes = [record["swift_code"] for record in self.file.bank("AAAAPLPWXXX")]
+        self.assertEqual(codes, ["AAAAPLPW", "AAAAPLPW123", "AAAAPLPWXXX"])
+        self.assertEqual(len(self.file.with_prefix("a")), 3)
+        self.assertEqual(len(self.file.with_prefix("AAAA", limit=2)), 2)
+        self.assertEqual(self.file.with_prefix("AAAB"), [])
+        self.assertEqual(len(self.file.with_prefix("")), 5)
+
+    def test_country_lookup(self):
+        """
+        Test case: Records are requested by country code.
+        Expected behavior: The country's records are returned in code order; unknown countries return none.
+        """
+        self.assertEqual(self.file.countries(), ["DE", "PL"])
+        codes = [record["swift_code"] for record in self.file.country("pl")]
+        self.assertEqual(codes, ["AAAAPLPW", "AAAAPLPW123", "AAAAPLPWXXX", "CCCCPLKR001"])
+        self.assertEqual(self.file.country("US"), [])
+        self.assertEqual(self.file.country("ZZ"), [])
+
+    def test_matches_parsed_csv(self):
+        """
+        Test case: A generated CSV file is parsed and compiled.
+        Expected behavior: Every parsed record is returned unchanged by code and by country.
+        """
+        csv_path = os.path.join(self.directory.name, "generated.csv")
+        write_bic_directory(csv_path, 2000, seed=7)
+        records = parse_swift_data(csv_path)
+        path = os.path.join(self.directory.name, "generated.bin")
+        compile_directory(records, path)
+
+        with DirectoryFile(path) as directory_file:
+            for record in records:
+                self.assertEqual(directory_file.get(record["swift_code"]), record)
+            for country in directory_file.countries():
+                expected = sorted(record["swift_code"] for record in records if record["country_ISO2"] == country)
+                self.assertEqual([record["swift_code"] for record in directory_file.country(country)], expected)
+
+    def test_snapshot_from_database_file(self):
+        """
+        Test case: The table is compiled with its dataset versions, then a Polish branch is
+        deleted and another one added before the snapshot is built from the file.
+        Expected behavior: The snapshot holds the rows of the table, with Poland read again
+        from the database and Germany taken from the file, and reflects the current versions.
+        A file compiled from CSV records no versions and is refused.
+        """
+        engine = create_engine(f"sqlite:///{os.path.join(self.directory.name, 'directory.db')}")
+        self.addCleanup(engine.dispose)
+        self.addCleanup(clear_snapshot)
+        Base.metadata.create_all(bind=engine, tables=[SwiftCodeModel.__table__, DatasetVersionModel.__table__])
+        bulk_load(engine, self.records)
+
+        path = os.path.join(self.directory.name, "database.bin")
+        self.assertEqual(compile_database(engine, path)["records"], 5)
+
+        added = make_record("AAAAPLPW456", "BANK A BRANCH", "ULICA 4", country_name="POLAND")
+        with engine.begin() as conn:
+            conn.execute(delete(swift_codes).where(swift_codes.c.swift_code == "AAAAPLPW123"))
+            conn.execute(swift_codes.insert().values(**added))
+            bump_versions(conn, {"PL"})
+
+        snapshot = load_snapshot_file(path, engine)
+
+        self.assertIs(get_snapshot(), snapshot)
+        self.assertEqual(len(snapshot), 5)
+        self.assertIsNone(snapshot.get("AAAAPLPW123"))
+        self.assertEqual(snapshot.get("AAAAPLPW456")["address"], "ULICA 4")
+        self.assertEqual(snapshot.get("BBBBDEFFXXX"), self.records[0])
+        with engine.connect() as conn:
+            self.assertEqual(snapshot.versions, {row.scope: row.version for row in conn.execute(dataset_versions.select())})
+
+        self.assertIsNone(self.file.versions)
+        with self.assertRaises(InvalidDirectoryFileError):
+            load_snapshot_file(self.path, engine)
+
+    def test_rejects_duplicate_codes(self):
+        """
+        Test case: Records containing the same SWIFT code twice are compiled.
+        Expected behavior: A ValueError is raised.
+        """
+        with self.assertRaises(ValueError):
+            compile_directory([make_record("AAAAPLPWXXX"), make_record("AAAAPLPWXXX")],
+                              os.path.join(self.directory.name, "duplicate.bin"))
+
+    def test_rejects_invalid_file(self):
+        """
+        Test case: An empty file and a file that is not a compiled directory are opened.
+        Expected behavior: InvalidDirectoryFileError is raised.
+        """
+        for content in (b"", b"COUNTRY ISO2 CODE,SWIFT CODE\n" * 10):
+            path = os.path.join(self.directory.name, "invalid.bin")
+            with open(path, "wb") as file:
+                file.write(content)
+            with self.assertRaises(InvalidDirectoryFileError):
+                DirectoryFile(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
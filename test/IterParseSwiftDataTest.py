@@ -0,0 +1,88 @@
+import unittest
+from app.core.parser import iter_parse_swift_data, parse_swift_data
+import pandas as pd
+
+from custom_exceptions.InvalidStringInputError import InvalidStringInputError
+from custom_exceptions.FileNotFoundError import FileNotFoundError
+from custom_exceptions.MissingColumnError import MissingColumnError
+from custom_exceptions.InvalidSwiftCodeError import InvalidSwiftCodeError
+from custom_exceptions.DuplicateSwiftCodeError import DuplicateSwiftCodeError
+
+
+class IterParseSwiftDataTest(unittest.TestCase):
+    """
+    Unit test class for the function iter_parse_swift_data. This class verifies that chunked
+    parsing produces the same records as parse_swift_data and applies the same validation rules,
+    including duplicate detection across chunk boundaries.
+    """
+
+    def test_none_argument_passed(self):
+        """
+        Test case: None is passed as an argument to the iter_parse_swift_data function.
+        Expected behavior: An InvalidStringInputError is raised when iteration starts.
+        """
+        with self.assertRaises(InvalidStringInputError):
+            list(iter_parse_swift_data(None))
+
+    def test_not_file_name(self):
+        """
+        Test case: A non-existent file name is passed to the iter_parse_swift_data function.
+        Expected behavior: A FileNotFoundError is raised because the file does not exist.
+        """
+        with self.assertRaises(FileNotFoundError):
+            list(iter_parse_swift_data("Test"))
+
+    def test_empty_file(self):
+        """
+        Test case: An empty CSV file is passed to the iter_parse_swift_data function.
+        Expected behavior: A pandas.errors.EmptyDataError is raised because the file has no data.
+        """
+        with self.assertRaises(pd.errors.EmptyDataError):
+            list(iter_parse_swift_data("test/data/test_1.csv"))
+
+    def test_missing_column(self):
+        """
+        Test case: A CSV file missing required columns is passed to the iter_parse_swift_data function.
+        Expected behavior: A MissingColumnError is raised.
+        """
+        with self.assertRaises(MissingColumnError):
+            list(iter_parse_swift_data("test/data/test_2.csv"))
+
+    def test_invalid_swift_code(self):
+        """
+        Test case: A CSV file containing invalid SWIFT codes is passed to the iter_parse_swift_data function.
+        Expected behavior: An InvalidSwiftCodeError is raised.
+        """
+        with self.assertRaises(InvalidSwiftCodeError):
+            list(iter_parse_swift_data("test/data/test_8.csv"))
+
+    def test_duplicate_across_chunks(self):
+        """
+        Test case: A CSV file with a duplicate SWIFT code is parsed one row per chunk.
+        Expected behavior: A DuplicateSwiftCodeError is raised although the duplicates are in different chunks.
+        """
+        with self.assertRaises(DuplicateSwiftCodeError):
+            list(iter_parse_swift_data("test/data/test_13.csv", chunksize=1))
+
+    def test_headers_only(self):
+        """
+        Test case: A CSV file with only headers is passed to the iter_parse_swift_data function.
+        Expected behavior: No chunks are yielded.
+        """
+        self.assertEqual(list(iter_parse_swift_data("test/data/test_16.csv")), [])
+
+    def test_chunks_match_full_parse(self):
+        """
+        Test case: The sample dataset is parsed in small chunks.
+        Expected behavior: The concatenated chunks equal the output of parse_swift_data and no chunk exceeds the chunk size.
+        """
+        path = "data/Interns_2025_SWIFT_CODES - Sheet1.csv"
+        chunks = list(iter_parse_swift_data(path, chunksize=100))
+
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+        self.assertEqual([record for chunk in chunks for record in chunk],
+                         parse_swift_data(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
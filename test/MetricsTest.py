@@ -0,0 +1,127 @@
+import asyncio
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import get_settings
+from app.core.snapshot import SwiftCodeSnapshot
+from app.core.metrics import (Counter, LabeledHistogram, MetricsMiddleware, REQUESTS, REQUEST_DB_STATEMENTS,
+                              REQUEST_SECONDS, render_metrics)
+from app.db.instrumentation import instrument_engine
+from test.helpers import make_record
+
+
+class MetricsTest(unittest.TestCase):
+    """
+    Unit test class for the metrics subsystem. This class verifies the Prometheus
+    text rendering and the per-request attribution of SQL statements.
+    """
+
+    def test_render_counter_and_histogram(self):
+        """
+        Test case: A labelled counter and histogram receive observations, one with a
+        label value containing a quote.
+        Expected behavior: Samples are rendered in the Prometheus text format with
+        escaped label values and cumulative buckets.
+        """
+        counter = Counter("test_total", "Test counter.", ("route",))
+        counter.inc(('/a"b',))
+        counter.inc(('/a"b',), 2)
+
+        histogram = LabeledHistogram("test_seconds", "Test histogram.", ("route",), buckets=(0.1, 1.0))
+        histogram.observe(("/a",), 0.05)
+        histogram.observe(("/a",), 0.5)
+
+        self.assertEqual(counter.render(), [
+            "# HELP test_total Test counter.",
+            "# TYPE test_total counter",
+            'test_total{route="/a\\"b"} 3'
+        ])
+        self.assertEqual(histogram.render()[2:], [
+            'test_seconds_bucket{route="/a",le="0.1"} 1',
+            'test_seconds_bucket{route="/a",le="1.0"} 2',
+            'test_seconds_bucket{route="/a",le="+Inf"} 2',
+            'test_seconds_sum{route="/a"} 0.55',
+            'test_seconds_count{route="/a"} 2'
+        ])
+
+    def test_middleware_attributes_statements(self):
+        """
+        Test case: An ASGI app behind the middleware runs two statements on an
+        instrumented async engine and answers 201.
+        Expected behavior: The request is counted with its status and both statements
+        are attributed to it.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory.name, 'metrics.db')}")
+        instrument_engine(engine)
+
+        async def app(scope, receive, send):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.execute(text("SELECT 2"))
+            await send({"type": "http.response.start", "status": 201, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        async def call():
+            scope = {"type": "http", "method": "POST", "path": "/metrics-test"}
+
+            async def send(message):
+                pass
+
+            await MetricsMiddleware(app)(scope, None, send)
+            await engine.dispose()
+
+        asyncio.run(call())
+
+        self.assertIn('http_requests_total{method="POST",route="unmatched",status="201"}',
+                      "\n".join(REQUESTS.render()))
+        self.assertIn('http_request_db_statements_bucket{method="POST",route="unmatched",le="2"} 1',
+                      "\n".join(REQUEST_DB_STATEMENTS.render()))
+
+    def test_render_all_workers(self):
+        """
+        Test case: METRICS_DIR holds the files of a live worker and of a worker that
+        has exited, and this process serves the scrape.
+        Expected behavior: Counters and histograms of all three processes are summed;
+        gauges are reported per live process only, with a pid label.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        exited = subprocess.Popen(["true"])
+        exited.wait()
+
+        labels = ["GET", "/workers-test", "200"]
+        for pid, name in ((os.getppid(), "live"), (exited.pid, "exited")):
+            state = {"pid": pid,
+                     "metrics": {REQUESTS.name: [[labels, 2]],
+                                 REQUEST_SECONDS.name: [[labels[:2], [1] + [0] * len(REQUEST_SECONDS.buckets), 0.5]]},
+                     "gauges": {"swift_codes_snapshot_records": [[{}, 7]]}}
+            with open(os.path.join(directory.name, f"{name}.json"), "wb") as file:
+                file.write(orjson.dumps(state))
+
+        REQUESTS.inc(tuple(labels))
+        REQUEST_SECONDS.observe(tuple(labels[:2]), 0.25)
+        snapshot = SwiftCodeSnapshot({code: make_record(code) for code in ("AAAAUSCCXXX", "AAAAUSCC123", "AAAAUSCC321")})
+        with mock.patch.object(get_settings(), "METRICS_DIR", directory.name), \
+                mock.patch("app.core.snapshot._snapshot", snapshot):
+            rendered = render_metrics()
+
+        self.assertIn('http_requests_total{method="GET",route="/workers-test",status="200"} 5', rendered)
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="/workers-test"} 3', rendered)
+        self.assertIn('http_request_duration_seconds_sum{method="GET",route="/workers-test"} 1.25', rendered)
+        self.assertIn(f'swift_codes_snapshot_records{{pid="{os.getppid()}"}} 7', rendered)
+        self.assertIn(f'swift_codes_snapshot_records{{pid="{os.getpid()}"}} 3', rendered)
+        self.assertNotIn(f'pid="{exited.pid}"', rendered)
+        self.assertEqual(len(os.listdir(directory.name)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.db.pool_stats import InstrumentedQueuePool, get_pool_stats, instrument_pool
+
+
+class PoolStatsTest(unittest.TestCase):
+    """
+    Unit test class for the connection pool instrumentation. This class verifies that
+    checkouts, overflow, timeouts and checkout waits are recorded.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.directory.name, 'pool.db')}",
+                                    poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=1,
+                                    pool_timeout=0.05)
+        self.stats = instrument_pool(self.engine, "test")
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def test_checkouts_overflow_and_timeout(self):
+        """
+        Test case: Three connections are held on a pool of size 2 with one overflow slot,
+        and a fourth checkout is attempted.
+        Expected behavior: The overflow checkout and the timeout are counted,
+        and every checkout wait is recorded.
+        """
+        connections = [self.engine.connect() for _ in range(3)]
+
+        with self.assertRaises(PoolTimeoutError):
+            self.engine.connect()
+
+        stats = get_pool_stats()["test"]
+        self.assertEqual(stats["checkouts"], 3)
+        self.assertEqual(stats["inUse"], 3)
+        self.assertEqual(stats["maxInUse"], 3)
+        self.assertEqual(stats["overflowCheckouts"], 1)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["waitSeconds"]["count"], 4)
+
+        for connection in connections:
+            connection.close()
+
+        self.assertEqual(get_pool_stats()["test"]["checkins"], 3)
+
+    def test_stats_survive_dispose(self):
+        """
+        Test case: The engine is disposed, which replaces its pool, and used again.
+        Expected behavior: Checkouts on the new pool are still counted.
+        """
+        self.engine.connect().close()
+        self.engine.dispose()
+        self.engine.connect().close()
+
+        self.assertEqual(get_pool_stats()["test"]["checkouts"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import asyncio
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db import instrumentation
+from app.db.instrumentation import QueryHeadersMiddleware, instrument_engine, redact_parameters
+
+
+class QueryInstrumentationTest(unittest.TestCase):
+    """
+    Unit test class for the SQL statement instrumentation. This class verifies the
+    X-DB-Queries / X-DB-Time headers and the redacted slow-query log.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(self.directory.name, 'queries.db')}")
+        instrument_engine(self.engine)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def call(self, statements, pause: float = 0):
+        """
+        Run the given statements inside an ASGI request wrapped by QueryHeadersMiddleware
+        and return the response headers. Failing statements are ignored, and the
+        request waits `pause` seconds after each statement.
+        """
+
+        async def app(scope, receive, send):
+            async with self.engine.connect() as conn:
+                for statement, parameters in statements:
+                    try:
+                        await conn.execute(text(statement), parameters)
+                    except DBAPIError:
+                        pass
+                    await asyncio.sleep(pause)
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        async def run():
+            await QueryHeadersMiddleware(app)({"type": "http", "method": "GET", "path": "/test"}, None, send)
+            await self.engine.dispose()
+
+        asyncio.run(run())
+        return dict(messages[0]["headers"])
+
+    def test_headers_count_request_statements(self):
+        """
+        Test case: A request executes three statements.
+        Expected behavior: X-DB-Queries is 3 and X-DB-Time is a non-negative number of milliseconds.
+        """
+        headers = self.call([("SELECT 1", {})] * 3)
+
+        self.assertEqual(headers[b"x-db-queries"], b"3")
+        self.assertGreaterEqual(float(headers[b"x-db-time"]), 0.0)
+
+    def test_failed_statement_does_not_skew_timing(self):
+        """
+        Test case: A statement fails, the request waits 0.3 s on the same connection,
+        then runs another statement.
+        Expected behavior: Both statements are counted, and the wait is not included
+        in their time.
+        """
+        headers = self.call([("SELECT * FROM missing_table", {}), ("SELECT 1", {})], pause=0.3)
+
+        self.assertEqual(headers[b"x-db-queries"], b"2")
+        self.assertLess(float(headers[b"x-db-time"]), 200.0)
+
+    def test_slow_query_log_redacts_parameters(self):
+        """
+        Test case: The slow-query threshold is tiny and a statement is run with a
+        client-supplied parameter.
+        Expected behavior: The statement and request are logged with the parameter's
+        type, not its value.
+        """
+        output = io.StringIO()
+        with mock.patch.object(instrumentation, "slow_query_seconds", 1e-9), \
+                contextlib.redirect_stdout(output):
+            self.call([("SELECT :code", {"code": "SECRETCODE1"})])
+
+        log = output.getvalue()
+        self.assertIn("Slow query", log)
+        self.assertIn("[GET /test]: SELECT ?", log)
+        self.assertIn("<str>", log)
+        self.assertNotIn("SECRETCODE1", log)
+
+    def test_redact_parameters(self):
+        """
+        Test case: Positional, named and executemany parameters are redacted.
+        Expected behavior: Only types or batch sizes are returned.
+        """
+        self.assertEqual(redact_parameters(("PL", 3)), "(<str>, <int>)")
+        self.assertEqual(redact_parameters({"code": "X"}), "{code: <str>}")
+        self.assertEqual(redact_parameters([("A",), ("B",)], executemany=True), "<2 parameter sets>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from main import app
+from app.core.conditional import invalidate_versions
+from app.core.config import get_settings
+from app.core.response_cache import get_response_cache
+from app.db import database
+from app.db.database import Base, set_replica_routers
+from app.db.replicas import LEAST_CONNECTIONS, READ_YOUR_WRITES_COOKIE, ReplicaRouter
+from app.models.dataset_version import DatasetVersionModel
+from app.models.swift_code import SwiftCodeModel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class ReplicaRoutingTest(unittest.TestCase):
+    """
+    Unit test class for read/write splitting. This class verifies replica selection,
+    read-your-writes stickiness, and the routing of the API endpoints with two local
+    SQLite databases standing in for the primary and a replica.
+    """
+
+    def test_round_robin(self):
+        """
+        Test case: Reads are routed across two replicas with round-robin selection.
+        Expected behavior: The replicas alternate and the primary is never used.
+        """
+        router = ReplicaRouter("primary", ["replica-a", "replica-b"])
+
+        chosen = [router.choose_read().sessions for _ in range(4)]
+
+        self.assertEqual(chosen, ["replica-a", "replica-b", "replica-a", "replica-b"])
+
+    def test_least_connections(self):
+        """
+        Test case: One replica has a session in flight and least-connections selection is used.
+        Expected behavior: The idle replica is chosen until the first one is released.
+        """
+        router = ReplicaRouter("primary", ["replica-a", "replica-b"], strategy=LEAST_CONNECTIONS)
+        busy = router.acquire(router.choose_read())
+
+        self.assertNotEqual(router.choose_read(), busy)
+        router.release(busy)
+        self.assertEqual(router.choose_read().sessions, "replica-a")
+
+    def test_read_your_writes_window(self):
+        """
+        Test case: A client writes, then reads with its token within and after the
+        stickiness window, and through another router sharing the secret.
+        Expected behavior: Its reads go to the primary only within the window, on
+        either router; reads without the token keep going to the replica.
+        """
+        clock = FakeClock()
+        router = ReplicaRouter("primary", ["replica"], sticky_seconds=5, secret=b"secret", clock=clock)
+        other_worker = ReplicaRouter("primary", ["replica"], sticky_seconds=5, secret=b"secret", clock=clock)
+
+        token = router.write_token()
+        self.assertEqual(router.choose_read(token).sessions, "primary")
+        self.assertEqual(other_worker.choose_read(token).sessions, "primary")
+        self.assertEqual(router.choose_read().sessions, "replica")
+
+        clock.now += 5
+        self.assertEqual(router.choose_read(token).sessions, "replica")
+
+    def test_forged_tokens(self):
+        """
+        Test case: Reads come with a token whose end was extended, with a token signed
+        by another secret and with malformed tokens.
+        Expected behavior: None of them is sticky.
+        """
+        clock = FakeClock()
+        router = ReplicaRouter("primary", ["replica"], sticky_seconds=5, secret=b"secret", clock=clock)
+        _, _, signature = router.write_token().rpartition(".")
+        stranger = ReplicaRouter("primary", ["replica"], sticky_seconds=5, secret=b"other", clock=clock)
+
+        for token in (f"9999999999.000.{signature}", stranger.write_token(), "105.000", "garbage", "é.é"):
+            self.assertFalse(router.is_sticky(token), token)
+
+    def test_no_token_without_replicas(self):
+        """
+        Test case: Tokens are requested without replicas and with stickiness disabled.
+        Expected behavior: No token is handed out, as every read goes to the primary anyway.
+        """
+        self.assertIsNone(ReplicaRouter("primary").write_token())
+        self.assertIsNone(ReplicaRouter("primary", ["replica"], sticky_seconds=0).write_token())
+
+    def test_unknown_strategy(self):
+        """
+        Test case: An unknown replica selection strategy is configured.
+        Expected behavior: A ValueError is raised.
+        """
+        with self.assertRaises(ValueError):
+            ReplicaRouter("primary", ["replica"], strategy="random")
+
+    def test_endpoints_with_primary_and_replica(self):
+        """
+        Test case: The API runs against a primary and a lagging replica. A code exists
+        only on the replica, and a client creates a code on the primary.
+        Expected behavior: GET and lookup requests read from the replica, the create
+        writes to the primary and sets the read-your-writes cookie, and the writing
+        client reads its own write from the primary while other clients still read
+        from the replica. Bulk creates set the cookie as well, once, while requests that
+        write nothing, such as a conflicting create, do not set it.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        routers = {}
+        engines = []
+        for name in ("primary", "replica"):
+            path = os.path.join(directory.name, f"{name}.db")
+            engine = create_engine(f"sqlite:///{path}")
+            Base.metadata.create_all(bind=engine)
+            engine.dispose()
+            engines.append(create_async_engine(f"sqlite+aiosqlite:///{path}"))
+            routers[name] = async_sessionmaker(engines[-1], autoflush=False, expire_on_commit=False)
+
+        replica_only = SwiftCodeModel(swift_code="REPLUSCCXXX", address="1 REPLICA ST", bank_name="REPLICA BANK",
+                                      country_ISO2="US", country_name="UNITED STATES", is_headquarter=True)
+
+        async def seed_replica():
+            async with routers["replica"]() as db:
+                db.add(replica_only)
+                await db.commit()
+
+        asyncio.run(seed_replica())
+
+        previous = database.async_replica_router
+        router = ReplicaRouter(routers["primary"], [routers["replica"]], sticky_seconds=60)
+        set_replica_routers(async_router=router)
+        invalidate_versions()
+        get_response_cache().clear()
+
+        def cleanup():
+            set_replica_routers(async_router=previous)
+            invalidate_versions()
+            for engine in engines:
+                asyncio.run(engine.dispose())
+
+        self.addCleanup(cleanup)
+
+        writer, reader = TestClient(app), TestClient(app)
+
+        self.assertEqual(writer.get("/v1/swift-codes/REPLUSCCXXX").status_code, 200)
+        response = reader.post("/v1/swift-codes/lookup", json={"swiftCodes": ["REPLUSCCXXX"]})
+        self.assertEqual(list(response.json()["found"]), ["REPLUSCCXXX"])
+
+        response = writer.post("/v1/swift-codes", json={
+            "address": "1 PRIMARY ST", "bankName": "PRIMARY BANK", "countryISO2": "US",
+            "countryName": "UNITED STATES", "isHeadquarter": True, "swiftCode": "PRIMUSCCXXX"})
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(READ_YOUR_WRITES_COOKIE, response.cookies)
+        invalidate_versions()
+
+        self.assertEqual(writer.get("/v1/swift-codes/PRIMUSCCXXX").status_code, 200)
+        self.assertEqual(writer.get("/v1/swift-codes/REPLUSCCXXX").status_code, 404)
+        self.assertEqual(reader.get("/v1/swift-codes/PRIMUSCCXXX").status_code, 404)
+
+        response = reader.post("/v1/swift-codes", json={
+            "address": "1 PRIMARY ST", "bankName": "PRIMARY BANK", "countryISO2": "US",
+            "countryName": "UNITED STATES", "isHeadquarter": True, "swiftCode": "PRIMUSCCXXX"})
+        self.assertEqual(response.status_code, 409)
+        self.assertNotIn(READ_YOUR_WRITES_COOKIE, response.cookies)
+        response = reader.post("/v1/swift-codes/bulk", json=[{"swiftCode": "INVALID"}])
+        self.assertEqual(response.json()["invalid"], 1)
+        self.assertNotIn(READ_YOUR_WRITES_COOKIE, response.cookies)
+
+        with mock.patch.object(get_settings(), "BULK_TRANSACTION_SIZE", 1):
+            response = reader.post("/v1/swift-codes/bulk", json=[{
+                "address": f"{number} PRIMARY ST", "bankName": "PRIMARY BANK", "countryISO2": "US",
+                "countryName": "UNITED STATES", "isHeadquarter": False, "swiftCode": f"PRIMUSCC00{number}"}
+                for number in range(2)])
+        self.assertEqual(response.json()["created"], 2)
+        self.assertEqual(len(response.headers.get_list("set-cookie")), 1)
+        self.assertIn(READ_YOUR_WRITES_COOKIE, response.cookies)
+
+        stats = writer.get("/internal/stats").json()["replicas"]
+        self.assertEqual(stats["targets"]["replica-0"]["checkouts"], 3)
+        self.assertEqual(stats["stickyReads"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
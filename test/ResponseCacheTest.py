@@ -0,0 +1,85 @@
+import gzip
+import time
+import unittest
+from app.core.response_cache import LRUResponseCache, ResponseCache, bank_key, country_key, invalidation_keys
+
+
+class ResponseCacheTest(unittest.TestCase):
+    """
+    Unit test class for the LRU response cache. This class verifies version checks,
+    eviction, expiry, invalidation and the keys affected by a write.
+    """
+
+    def test_hit_requires_matching_etag(self):
+        """
+        Test case: An entry is stored and read back with its own and with another ETag.
+        Expected behavior: Only the matching ETag is a hit; the counters reflect both lookups.
+        """
+        cache = LRUResponseCache()
+        cache.set("country:PL", b"{}", '"PL.1.0"')
+
+        self.assertEqual(cache.get("country:PL", '"PL.1.0"').body, b"{}")
+        self.assertIsNone(cache.get("country:PL", '"PL.2.0"'))
+        self.assertEqual((cache.stats()["hits"], cache.stats()["misses"]), (1, 1))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """
+        Test case: Three entries are stored in a cache holding two, after the first one was read.
+        Expected behavior: The second entry is evicted and counted as an eviction.
+        """
+        cache = LRUResponseCache(max_entries=2)
+        cache.set("a", b"1", "e")
+        cache.set("b", b"2", "e")
+        cache.get("a", "e")
+        cache.set("c", b"3", "e")
+
+        self.assertIsNotNone(cache.get("a", "e"))
+        self.assertIsNone(cache.get("b", "e"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_size_limit_and_expiry(self):
+        """
+        Test case: Entries exceed the byte limit, and an entry outlives its TTL.
+        Expected behavior: Oversized entries are not kept and expired entries are misses.
+        """
+        cache = LRUResponseCache(max_bytes=4, ttl=0.01)
+        cache.set("big", b"12345", "e")
+        cache.set("small", b"1234", "e")
+        self.assertIsNone(cache.get("big", "e"))
+        self.assertEqual(cache.stats()["bytes"], 4)
+
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("small", "e"))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_compressed_entries(self):
+        """
+        Test case: An entry is stored in a cache with compression enabled.
+        Expected behavior: The entry keeps a gzip body next to the plain one.
+        """
+        entry = LRUResponseCache(compress=True).set("a", b'{"a":1}', "e")
+        self.assertEqual(gzip.decompress(entry.gzipped), b'{"a":1}')
+
+    def test_backend_must_implement_interface(self):
+        """
+        Test case: A backend implementing only some methods of ResponseCache is created.
+        Expected behavior: TypeError is raised, naming the missing methods.
+        """
+        class PartialCache(ResponseCache):
+            def get(self, key, etag):
+                return None
+
+        with self.assertRaisesRegex(TypeError, "invalidate"):
+            PartialCache()
+
+    def test_invalidation_keys(self):
+        """
+        Test case: A branch record is written.
+        Expected behavior: Its country listing, the country of its code and its bank entry are invalidated.
+        """
+        keys = invalidation_keys([{"swift_code": "AAAAXKCC123", "country_ISO2": "RS"}])
+        self.assertEqual(keys, {country_key("RS"), country_key("XK"), bank_key("AAAAXKCCXXX")})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+from unittest import mock
+
+from app.core import search_index
+from app.core.search_index import SwiftCodeIndex
+from test.helpers import codes, make_record
+
+
+class SearchIndexTest(unittest.TestCase):
+    """
+    Unit test class for SwiftCodeIndex. This class verifies prefix searches with and
+    without the country and headquarter filters, and that writes produce a new index
+    without modifying the current one.
+    """
+
+    def setUp(self):
+        records = [make_record(code) for code in [
+            "AAAAUSCCXXX", "AAAAUSCC123", "AAAAUSCC321", "AAABUSCCXXX", "ZZYYCAWWXXX", "ZZYYCAWW001"]]
+        self.index = SwiftCodeIndex({record["swift_code"]: record for record in records})
+
+    def test_prefix_search(self):
+        """
+        Test case: Codes are searched by prefixes of different lengths, with a limit.
+        Expected behavior: Matching codes are returned in code order, at most `limit` of them.
+        """
+        self.assertEqual(codes(self.index.search("AAAA", 10)), ["AAAAUSCC123", "AAAAUSCC321", "AAAAUSCCXXX"])
+        self.assertEqual(codes(self.index.search("AAA", 2)), ["AAAAUSCC123", "AAAAUSCC321"])
+        self.assertEqual(codes(self.index.search("AAAAUSCC321", 10)), ["AAAAUSCC321"])
+        self.assertEqual(self.index.search("AAAC", 10), [])
+        self.assertEqual(self.index.search("ZZZZ", 10), [])
+
+    def test_filters(self):
+        """
+        Test case: Codes are searched with the country and headquarter filters.
+        Expected behavior: Only codes of that country and kind are returned.
+        """
+        self.assertEqual(codes(self.index.search("A", 10, headquarter=True)), ["AAAAUSCCXXX", "AAABUSCCXXX"])
+        self.assertEqual(codes(self.index.search("Z", 10, country="CA", headquarter=False)), ["ZZYYCAWW001"])
+        self.assertEqual(self.index.search("A", 10, country="CA"), [])
+        self.assertEqual(self.index.search("A", 10, country="PL"), [])
+
+    def test_with_changes(self):
+        """
+        Test case: A new index is derived with codes added, replaced and removed.
+        Expected behavior: The new index reflects the changes in every filter; the original is unchanged.
+        """
+        updated = self.index.with_changes(
+            upserted=[make_record("AAAAUSCC200"), make_record("AAABUSCCXXX", country_iso2="CA")],
+            deleted=["AAAAUSCC123", "ZZYYCAWW001"])
+
+        self.assertEqual(codes(updated.search("AAAA", 10)), ["AAAAUSCC200", "AAAAUSCC321", "AAAAUSCCXXX"])
+        self.assertEqual(codes(updated.search("A", 10, country="CA")), ["AAABUSCCXXX"])
+        self.assertEqual(codes(updated.search("A", 10, country="US", headquarter=True)), ["AAAAUSCCXXX"])
+        self.assertEqual(updated.search("Z", 10, headquarter=False), [])
+        self.assertNotIn(("CA", False), updated.partitions)
+
+        self.assertEqual(codes(self.index.search("AAAA", 10)), ["AAAAUSCC123", "AAAAUSCC321", "AAAAUSCCXXX"])
+        self.assertEqual(len(self.index), 6)
+
+    def test_synchronized(self):
+        """
+        Test case: The database holds newer rows of Canada than the index.
+        Expected behavior: Added and removed rows of that country are applied in every
+        filter, other countries are kept, and the versions of the read are recorded.
+        """
+        rows = [make_record("ZZYYCAWWXXX"), make_record("ZZYYCAWW002")]
+        updated = self.index.synchronized({"CA"}, rows, {"*": 3, "CA": 1})
+
+        self.assertEqual(codes(updated.search("Z", 10, country="CA", headquarter=False)), ["ZZYYCAWW002"])
+        self.assertEqual(codes(updated.search("A", 10)), codes(self.index.search("A", 10)))
+        self.assertEqual(updated.versions, {"*": 3, "CA": 1})
+        self.assertEqual(codes(self.index.search("Z", 10)), ["ZZYYCAWW001", "ZZYYCAWWXXX"])
+
+    def test_many_changes_are_merged(self):
+        """
+        Test case: More codes than the merge threshold are added and removed at once.
+        Expected behavior: Every partition stays sorted, in line with its records, and holds exactly the remaining codes.
+        """
+        added = [make_record(f"BBBBPLPW{number:03X}") for number in range(search_index.MERGE_THRESHOLD + 1)]
+        updated = self.index.with_changes(upserted=added, deleted=["AAAAUSCC123"])
+
+        for partition in updated.partitions.values():
+            partition_codes = [code for code, _ in partition.items()]
+            self.assertEqual(partition_codes, sorted(partition_codes))
+            self.assertEqual(partition_codes, [record["swift_code"] for _, record in partition.items()])
+        self.assertEqual(len(updated.search("BBBB", 5000)), len(added))
+        self.assertEqual(len(updated.search("", 5000)), len(added) + 5)
+        self.assertEqual(len(updated.search("B", 5000, country="PL", headquarter=False)), len(added))
+
+    def test_chunks_split_and_empty(self):
+        """
+        Test case: With tiny chunks, codes are added and removed one write at a time.
+        Expected behavior: Chunks are split and dropped as needed, and searches spanning
+        several chunks match a plain sorted list.
+        """
+        records = dict(self.index.partitions[(None, None)].items())
+        expected = sorted(records)
+        with mock.patch.object(search_index, "CHUNK_SIZE", 2):
+            index = SwiftCodeIndex(records)
+            for number in range(40):
+                code = f"CCCCPLPW{number:03d}"
+                index = index.with_changes(upserted=[make_record(code)])
+                expected.append(code)
+            for number in range(0, 40, 3):
+                index = index.with_changes(deleted=[f"CCCCPLPW{number:03d}"])
+                expected.remove(f"CCCCPLPW{number:03d}")
+            index = index.with_changes(deleted=["AAAAUSCC123", "AAAAUSCC321", "AAAAUSCCXXX"])
+            expected = [code for code in sorted(expected) if not code.startswith("AAAAUSCC")]
+
+        self.assertEqual(codes(index.search("", 100)), expected)
+        self.assertEqual(codes(index.search("CCCCPLPW01", 100)), [code for code in expected if code.startswith("CCCCPLPW01")])
+        self.assertEqual(codes(index.search("CCCC", 5)), [code for code in expected if code.startswith("CCCC")][:5])
+        self.assertEqual(len(index), len(expected))
+        self.assertGreater(len(index.partitions[(None, None)].maxes), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+from sqlalchemy import create_engine
+
+import server
+from app.core import warmup
+from app.core.search_index import clear_search_index, get_search_index
+from app.core.snapshot import clear_snapshot, get_snapshot
+from app.core.text_index import clear_text_index, get_text_index
+from app.db import database
+from app.db.database import Base
+from app.models.dataset_version import DatasetVersionModel
+from app.models.swift_code import SwiftCodeModel
+from main import app
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# A tiny app served by server.serve with two workers; the preload marks the
+# module state in the parent, which the workers must see after the fork.
+SERVER_SCRIPT = textwrap.dedent("""
+    import os, sys
+    sys.path.insert(0, {root!r})
+    from fastapi import FastAPI
+    from server import serve
+
+    app = FastAPI()
+    preloaded = {{}}
+
+    @app.get("/worker")
+    def worker():
+        return {{"pid": os.getpid(), "preloaded": preloaded.get("by")}}
+
+    sys.exit(serve(app, "127.0.0.1", {port}, 2, preload=lambda: preloaded.update(by=os.getpid()),
+                   lifespan="off", access_log=False, log_level="warning"))
+""")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as file:
+        return sorted(int(child) for child in file.read().split())
+
+
+class ServerTest(unittest.TestCase):
+    """
+    Unit test class for the production launcher. This class verifies the worker count,
+    the event loop and HTTP parser selection, the dataset preload, and that forked
+    workers inherit the preloaded data and are restarted when they die.
+    """
+
+    def test_worker_count_defaults_to_cpus(self):
+        """
+        Test case: No worker count, and then an explicit one, is requested.
+        Expected behavior: One worker per available CPU is started by default, otherwise the requested number.
+        """
+        self.assertEqual(server.resolve_workers(0), server.available_cpus())
+        self.assertGreaterEqual(server.available_cpus(), 1)
+        self.assertEqual(server.resolve_workers(3), 3)
+
+    def test_falls_back_without_uvloop_and_httptools(self):
+        """
+        Test case: Neither uvloop nor httptools is installed.
+        Expected behavior: The asyncio event loop and the h11 parser are used.
+        """
+        with mock.patch("server.importlib.util.find_spec", return_value=None):
+            self.assertEqual(server.fastest_loop(), "asyncio")
+            self.assertEqual(server.fastest_http(), "h11")
+
+        with mock.patch("server.importlib.util.find_spec", return_value=object()):
+            self.assertEqual(server.fastest_loop(), "uvloop")
+            self.assertEqual(server.fastest_http(), "httptools")
+
+    def test_preload_app_loads_dataset(self):
+        """
+        Test case: The application is preloaded with the snapshot, the search index and the
+        text index enabled, while creating the tables fails once.
+        Expected behavior: Table creation is retried, all datasets hold the table's rows,
+        no pooled connection is opened, and the engine's connections are closed.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{os.path.join(directory, 'server.db')}")
+            Base.metadata.create_all(bind=engine, tables=[SwiftCodeModel.__table__, DatasetVersionModel.__table__])
+            with engine.begin() as conn:
+                conn.execute(SwiftCodeModel.__table__.insert(), [{
+                    "swift_code": "AAAAPLPWXXX", "address": "ADDRESS", "bank_name": "BANK",
+                    "country_ISO2": "PL", "country_name": "POLAND", "is_headquarter": True}])
+
+            attempts = []
+
+            def init_db():
+                attempts.append(True)
+                if len(attempts) == 1:
+                    raise ConnectionError("database is starting")
+
+            settings = SimpleNamespace(SNAPSHOT_ENABLED=True, DIRECTORY_FILE="", SEARCH_INDEX_ENABLED=True,
+                                       TEXT_INDEX_ENABLED=True, WARMUP_CONNECTIONS=1, DB_POOL_SIZE=1,
+                                       WARMUP_RETRY_SECONDS=0)
+            try:
+                with mock.patch("app.core.warmup.get_settings", return_value=settings), \
+                        mock.patch.object(database, "engine", engine), \
+                        mock.patch.object(database, "init_db", init_db):
+                    server.preload_app(app)
+
+                self.assertEqual(len(attempts), 2)
+                self.assertEqual(len(get_snapshot()), 1)
+                self.assertEqual(len(get_search_index()), 1)
+                self.assertEqual(len(get_text_index()), 1)
+                self.assertEqual(list(warmup.readiness()["phases"]), ["imports", "database", "snapshot",
+                                                                     "search_index", "text_index", "openapi"])
+                self.assertFalse(warmup.is_ready())
+                self.assertEqual(engine.pool.checkedin(), 0)
+            finally:
+                warmup.reset_readiness()
+                clear_snapshot()
+                clear_search_index()
+                clear_text_index()
+                engine.dispose()
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "reads worker processes from /proc")
+    def test_workers_share_preloaded_data_and_are_restarted(self):
+        """
+        Test case: Two workers are forked after a preload, one is killed, and the launcher gets SIGTERM.
+        Expected behavior: The workers see the data loaded by the parent, the killed worker is
+        replaced, and the launcher exits cleanly.
+        """
+        port = free_port()
+        process = subprocess.Popen([sys.executable, "-c", SERVER_SCRIPT.format(root=ROOT, port=port)])
+        try:
+            deadline = time.monotonic() + 30
+            while len(children(process.pid)) < 2 or not self._reachable(port):
+                self.assertLess(time.monotonic(), deadline, "the workers did not start")
+                time.sleep(0.1)
+
+            body = httpx.get(f"http://127.0.0.1:{port}/worker").json()
+            self.assertEqual(body["preloaded"], process.pid)
+            self.assertIn(body["pid"], children(process.pid))
+
+            killed = children(process.pid)[0]
+            os.kill(killed, signal.SIGKILL)
+            deadline = time.monotonic() + 30
+            while killed in children(process.pid) or len(children(process.pid)) < 2:
+                self.assertLess(time.monotonic(), deadline, "the worker was not restarted")
+                time.sleep(0.1)
+        finally:
+            process.send_signal(signal.SIGTERM)
+            self.assertEqual(process.wait(timeout=30), 0)
+
+    def _reachable(self, port):
+        try:
+            return httpx.get(f"http://127.0.0.1:{port}/worker", timeout=1).status_code == 200
+        except httpx.HTTPError:
+            return False
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from app.core.snapshot import SHARDS, SwiftCodeSnapshot
+from test.helpers import make_record
+
+
+class SwiftCodeSnapshotTest(unittest.TestCase):
+    """
+    Unit test class for SwiftCodeSnapshot. This class verifies that lookups by code and
+    by bank prefix match the database semantics and that writes never mutate a snapshot in place.
+    """
+
+    def setUp(self):
+        records = [
+            make_record("AAAAUSCCXXX"),
+            make_record("AAAAUSCC123"),
+            make_record("AAAAUSCC321"),
+            make_record("ZZYYCAWWXXX")
+        ]
+        self.snapshot = SwiftCodeSnapshot(
+            {record["swift_code"]: record for record in records})
+
+    def test_get_existing_code(self):
+        """
+        Test case: An existing SWIFT code is looked up.
+        Expected behavior: The stored record is returned.
+        """
+        self.assertEqual(self.snapshot.get("AAAAUSCC123")["swift_code"], "AAAAUSCC123")
+
+    def test_get_missing_code(self):
+        """
+        Test case: A SWIFT code that is not in the snapshot is looked up.
+        Expected behavior: None is returned.
+        """
+        self.assertIsNone(self.snapshot.get("NONEXIST"))
+
+    def test_branches_of_headquarter(self):
+        """
+        Test case: Branches of a headquarter are requested.
+        Expected behavior: All codes with the same bank prefix except the headquarter are returned.
+        """
+        branches = [branch["swift_code"]
+                    for branch in self.snapshot.branches("AAAAUSCCXXX")]
+        self.assertEqual(branches, ["AAAAUSCC123", "AAAAUSCC321"])
+
+    def test_with_changes_adds_and_removes(self):
+        """
+        Test case: A new snapshot is derived with one branch added and one removed.
+        Expected behavior: The new snapshot reflects both changes while the original is unchanged.
+        """
+        updated = self.snapshot.with_changes(
+            upserted=[make_record("AAAAUSCC555")], deleted=["AAAAUSCC123"])
+
+        self.assertEqual([branch["swift_code"] for branch in updated.branches("AAAAUSCCXXX")],
+                         ["AAAAUSCC321", "AAAAUSCC555"])
+        self.assertIsNone(updated.get("AAAAUSCC123"))
+        self.assertIsNotNone(self.snapshot.get("AAAAUSCC123"))
+        self.assertEqual(len(self.snapshot), 4)
+
+    def test_with_changes_drops_empty_bank(self):
+        """
+        Test case: The only code of a bank is deleted.
+        Expected behavior: The bank prefix disappears from the secondary index.
+        """
+        updated = self.snapshot.with_changes(deleted=["ZZYYCAWWXXX"])
+        self.assertFalse(any("ZZYYCAWW" in banks for _, banks in updated.shards))
+        self.assertEqual(len(updated), 3)
+
+    def test_with_changes_shares_untouched_shards(self):
+        """
+        Test case: A new snapshot is derived with a branch of one bank added.
+        Expected behavior: Only the shard of that bank is copied; every other
+        shard is the same object as in the original snapshot.
+        """
+        updated = self.snapshot.with_changes(upserted=[make_record("AAAAUSCC555")])
+
+        shared = sum(new is old for new, old in zip(updated.shards, self.snapshot.shards))
+        self.assertEqual(shared, SHARDS - 1)
+        self.assertEqual(len(updated), 5)
+
+    def test_synchronized(self):
+        """
+        Test case: The database holds newer rows of the United States than the snapshot.
+        Expected behavior: Added, changed and removed rows of that country are applied,
+        other countries are kept, and the versions of the read are recorded.
+        """
+        rows = [make_record("AAAAUSCCXXX"), make_record("AAAAUSCC123", address="NEW ADDRESS"),
+                make_record("AAAAUSCC001")]
+        updated = self.snapshot.synchronized({"US"}, rows, {"*": 4, "US": 2})
+
+        self.assertEqual([branch["swift_code"] for branch in updated.branches("AAAAUSCCXXX")],
+                         ["AAAAUSCC001", "AAAAUSCC123"])
+        self.assertEqual(updated.get("AAAAUSCC123")["address"], "NEW ADDRESS")
+        self.assertIs(updated.get("ZZYYCAWWXXX"), self.snapshot.get("ZZYYCAWWXXX"))
+        self.assertEqual(updated.versions, {"*": 4, "US": 2})
+        self.assertEqual(self.snapshot.versions, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import unittest
+from unittest import mock
+
+from app.core import text_index
+from app.core.text_index import TextIndex, trigrams, words
+from test.helpers import make_record, matched_codes
+
+
+class TextIndexTest(unittest.TestCase):
+    """
+    Unit test class for TextIndex. This class verifies word splitting, fuzzy and ranked
+    searches, field restrictions, writes producing a new index without modifying the
+    current one, and synchronising countries with the database.
+    """
+
+    def setUp(self):
+        records = [
+            make_record("PKOPPLPWXXX", "PKO BANK POLSKI SA", "UL. PULAWSKA 15 WARSZAWA"),
+            make_record("PKOPPLPW123", "PKO BANK POLSKI SA", "UL. MARSZALKOWSKA 1 WARSZAWA"),
+            make_record("BREXPLPWXXX", "MBANK SA", "UL. PROSTA 18 WARSZAWA"),
+            make_record("DEUTDEFFXXX", "DEUTSCHE BANK AG", "TAUNUSANLAGE 12 FRANKFURT AM MAIN"),
+            make_record("COBADEFFXXX", "COMMERZBANK AG", "KAISERPLATZ FRANKFURT AM MAIN")
+        ]
+        self.index = TextIndex({record["swift_code"]: record for record in records}, {"PL": 3, "DE": 1})
+
+    def test_words_and_trigrams(self):
+        """
+        Test case: Texts are split into words and words into trigrams.
+        Expected behavior: Words are upper-case without punctuation; trigrams are padded at both ends.
+        """
+        self.assertEqual(words("ul. Prosta 18, Warszawa"), {"UL", "PROSTA", "18", "WARSZAWA"})
+        self.assertEqual(words(None), set())
+        self.assertEqual(trigrams("BANK"), {"$$B", "$BA", "BAN", "ANK", "NK$"})
+
+    def test_exact_and_fuzzy_search(self):
+        """
+        Test case: Words are searched as is, misspelled and in any case.
+        Expected behavior: Records containing every word score 1; misspelled words still match
+        with a lower score; results are ranked best first.
+        """
+        matches = self.index.search("pko bank", 10)
+        self.assertEqual(matched_codes(matches), ["PKOPPLPW123", "PKOPPLPWXXX"])
+        self.assertEqual([score for score, _ in matches], [1.0, 1.0])
+
+        matches = self.index.search("deutshe frankfurt", 10)
+        self.assertEqual(matched_codes(matches), ["DEUTDEFFXXX"])
+        self.assertTrue(0.5 < matches[0][0] < 1.0)
+
+        matches = self.index.search("frankfurt commerzbank", 10)
+        self.assertEqual(matched_codes(matches), ["COBADEFFXXX"])
+        self.assertEqual(self.index.search("warszawa", 2), self.index.search("WARSZAWA", 2))
+        self.assertEqual(len(self.index.search("warszawa", 2)), 2)
+
+    def test_unmatched_words(self):
+        """
+        Test case: Queries contain words that match nothing.
+        Expected behavior: Unmatched words lower the score; a query matching nothing has no results.
+        """
+        self.assertEqual(self.index.search("commerzbank xyzzy", 10), [(0.5, self.index.get("COBADEFFXXX"))])
+        self.assertEqual(self.index.search("xyzzy", 10), [])
+        self.assertEqual(self.index.search("...", 10), [])
+
+    def test_fields(self):
+        """
+        Test case: The search is restricted to the bank name or to the address.
+        Expected behavior: Only words of that field are matched.
+        """
+        self.assertEqual(matched_codes(self.index.search("marszalkowska", 10, fields=("address",))), ["PKOPPLPW123"])
+        self.assertEqual(self.index.search("marszalkowska", 10, fields=("bank_name",)), [])
+        self.assertEqual(matched_codes(self.index.search("bank", 10, fields=("bank_name",))),
+                         ["DEUTDEFFXXX", "PKOPPLPW123", "PKOPPLPWXXX", "BREXPLPWXXX"])
+        self.assertEqual(self.index.search("bank", 10, fields=("address",)), [])
+
+    def test_with_changes(self):
+        """
+        Test case: A new index is derived with records added, replaced and removed.
+        Expected behavior: The new index matches the new words and no longer the removed ones,
+        counts the given versions, and the original index is unchanged.
+        """
+        updated = self.index.with_changes(
+            upserted=[make_record("INGBPLPWXXX", "ING BANK SLASKI SA", "UL. SOKOLSKA 34 KATOWICE"),
+                      make_record("BREXPLPWXXX", "MBANK SA", "UL. PROSTA 18 WARSZAWA", "CZ")],
+            deleted=["PKOPPLPW123", "COBADEFFXXX"], versions={"PL": 4})
+
+        self.assertEqual(matched_codes(updated.search("slaski katowice", 10)), ["INGBPLPWXXX"])
+        self.assertEqual(updated.search("marszalkowska", 10), [])
+        self.assertEqual(updated.search("commerzbank", 10), [])
+        self.assertEqual(updated.get("BREXPLPWXXX")["country_ISO2"], "CZ")
+        self.assertEqual(sorted(record["swift_code"] for record in updated.country_records("PL")),
+                         ["INGBPLPWXXX", "PKOPPLPWXXX"])
+        self.assertEqual(updated.versions, {"PL": 4, "DE": 1})
+        self.assertEqual(len(updated), 4)
+
+        self.assertEqual(matched_codes(self.index.search("marszalkowska", 10)), ["PKOPPLPW123"])
+        self.assertEqual(self.index.search("slaski", 10), [])
+        self.assertEqual(self.index.versions, {"PL": 3, "DE": 1})
+        self.assertEqual(len(self.index), 5)
+
+    def test_many_writes_share_unchanged_parts(self):
+        """
+        Test case: With tiny document chunks, records are added and removed one write at a time.
+        Expected behavior: Every index finds exactly its own records, and unchanged posting
+        lists are shared between an index and the next one.
+        """
+        with mock.patch.object(text_index, "CHUNK_SIZE", 2):
+            index = TextIndex({}, {})
+            for number in range(20):
+                index = index.with_changes(upserted=[
+                    make_record(f"AAAAPLPW{number:03d}", f"BANK {number}", "MAIN STREET")])
+            previous = index
+            index = index.with_changes(deleted=[f"AAAAPLPW{number:03d}" for number in range(0, 20, 2)])
+
+            self.assertEqual(matched_codes(index.search("bank 7", 10)), ["AAAAPLPW007"])
+            self.assertEqual(index.search("bank 8", 10)[0][0], 0.5)
+            self.assertEqual(len(index.search("main street", 100)), 10)
+            self.assertEqual(len(previous.search("main street", 100)), 20)
+            self.assertEqual(len(index.documents.chunks), 10)
+        self.assertIs(index.postings.get((0, "7")), previous.postings.get((0, "7")))
+        self.assertIsNone(index.postings.get((0, "8")))
+
+    def test_removed_documents_are_compacted(self):
+        """
+        Test case: The bank name of the same records is changed over and over, one write at a time.
+        Expected behavior: The document table is rebuilt once removed documents pass
+        COMPACTION_RATIO of the live ones, so it stays bounded, and searches and
+        versions are unaffected.
+        """
+        with mock.patch.object(text_index, "MIN_COMPACTION", 0):
+            index = self.index
+            for number in range(50):
+                index = index.with_changes(upserted=[
+                    make_record("PKOPPLPW123", f"PKO BANK {number}", "UL. MARSZALKOWSKA 1 WARSZAWA")],
+                    versions={"PL": 4 + number})
+
+                self.assertLessEqual(index.documents.tombstones, text_index.COMPACTION_RATIO * len(index))
+                self.assertLessEqual(index.documents.next_id, len(index) * (1 + text_index.COMPACTION_RATIO))
+
+        self.assertEqual(matched_codes(index.search("pko 49 marszalkowska", 10)), ["PKOPPLPW123"])
+        self.assertEqual(index.search("pko 48 marszalkowska", 10)[0][0], round(2 / 3, 4))
+        self.assertEqual(matched_codes(index.search("commerzbank", 10)), ["COBADEFFXXX"])
+        self.assertEqual(index.versions, {"PL": 53, "DE": 1})
+        self.assertEqual(len(index), 5)
+        self.assertEqual(self.index.documents.next_id, 5)
+
+    def test_stale_scopes_and_synchronized(self):
+        """
+        Test case: The database holds newer versions and rows of a country than the index.
+        Expected behavior: That country is reported as stale, and synchronising it applies
+        the added, changed and removed rows and records the new version.
+        """
+        self.assertEqual(self.index.stale_scopes({"*": 9, "PL": 5, "DE": 1, "US": 0}), {"PL"})
+
+        rows = [make_record("PKOPPLPWXXX", "PKO BANK POLSKI SA", "UL. PULAWSKA 15 WARSZAWA"),
+                make_record("PKOPPLPW123", "PKO BANK POLSKI SA", "UL. PIEKNA 2 WARSZAWA"),
+                make_record("ALBPPLPWXXX", "ALIOR BANK SA", "UL. LOPUSZANSKA 38D WARSZAWA")]
+        updated = self.index.synchronized({"PL"}, rows, {"PL": 5})
+
+        self.assertEqual(matched_codes(updated.search("alior", 10)), ["ALBPPLPWXXX"])
+        self.assertEqual(matched_codes(updated.search("pikna", 10)), ["PKOPPLPW123"])
+        self.assertEqual(updated.search("prosta", 10), [])
+        self.assertIs(updated.get("PKOPPLPWXXX"), self.index.get("PKOPPLPWXXX"))
+        self.assertEqual(updated.stale_scopes({"PL": 5, "DE": 1}), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core import warmup
+from app.core.search_index import clear_search_index, get_search_index
+from app.core.directory_file import compile_database
+from app.core.snapshot import clear_snapshot, get_snapshot, load_snapshot
+from app.core.text_index import clear_text_index, get_text_index
+from app.db import database
+from app.models.dataset_version import DatasetVersionModel
+from app.models.swift_code import SwiftCodeModel
+from main import app
+
+
+def make_settings(**overrides):
+    settings = dict(SNAPSHOT_ENABLED=True, DIRECTORY_FILE="", SEARCH_INDEX_ENABLED=True, TEXT_INDEX_ENABLED=True,
+                    WARMUP_CONNECTIONS=3, DB_POOL_SIZE=2, WARMUP_RETRY_SECONDS=0)
+    settings.update(overrides)
+    return SimpleNamespace(**settings)
+
+
+class WarmupTest(unittest.TestCase):
+    """
+    Unit test class for the startup warm-up. This class verifies that every phase runs and
+    is timed, that datasets already loaded are skipped, that failing phases are retried,
+    and that the health endpoints report liveness and readiness.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        path = os.path.join(directory.name, "warmup.db")
+        self.engine = create_engine(f"sqlite:///{path}")
+        self.async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=AsyncAdaptedQueuePool)
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(lambda: asyncio.run(self.async_engine.dispose()))
+
+        for target, value in (("engine", self.engine), ("async_engine", self.async_engine),
+                              ("async_replica_engines", [])):
+            patcher = mock.patch.object(database, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        for cleanup in (warmup.reset_readiness, clear_snapshot, clear_search_index, clear_text_index):
+            self.addCleanup(cleanup)
+        warmup.reset_readiness()
+
+    def warm_up(self, **settings):
+        with mock.patch("app.core.warmup.get_settings", return_value=make_settings(**settings)):
+            asyncio.run(warmup.warm_up(app))
+
+    def test_runs_every_phase(self):
+        """
+        Test case: The service warms up against an empty database with every dataset enabled.
+        Expected behavior: The tables are created, every phase is timed, the datasets are
+        loaded, the pool keeps the warmed connections, and the service is ready.
+        """
+        self.assertFalse(warmup.is_ready())
+        self.warm_up()
+
+        state = warmup.readiness()
+        self.assertTrue(state["ready"])
+        self.assertEqual(list(state["phases"]), ["imports", "database", "connections", "snapshot",
+                                                 "search_index", "text_index", "openapi"])
+        self.assertNotIn("error", state)
+        self.assertIsNotNone(get_snapshot())
+        self.assertIsNotNone(get_search_index())
+        self.assertIsNotNone(get_text_index())
+        self.assertEqual(self.async_engine.pool.checkedin(), 2)
+        self.assertIsNotNone(app.openapi_schema)
+
+    def test_skips_loaded_and_disabled_datasets(self):
+        """
+        Test case: The snapshot was already loaded, e.g. by the launcher before forking, and
+        the indexes are disabled.
+        Expected behavior: No dataset phase runs.
+        """
+        database.Base.metadata.create_all(bind=self.engine, tables=[SwiftCodeModel.__table__,
+                                                                    DatasetVersionModel.__table__])
+        load_snapshot(self.engine)
+
+        self.warm_up(SEARCH_INDEX_ENABLED=False, TEXT_INDEX_ENABLED=False)
+
+        self.assertEqual(list(warmup.readiness()["phases"]),
+                         ["imports", "database", "connections", "openapi"])
+        self.assertIsNone(get_search_index())
+        self.assertIsNone(get_text_index())
+
+    def test_snapshot_from_directory_file(self):
+        """
+        Test case: DIRECTORY_FILE names a file compiled from the database.
+        Expected behavior: The snapshot phase builds the snapshot from the file instead of
+        reading the table.
+        """
+        database.Base.metadata.create_all(bind=self.engine, tables=[SwiftCodeModel.__table__,
+                                                                    DatasetVersionModel.__table__])
+        path = os.path.join(self.directory, "directory.bin")
+        compile_database(self.engine, path)
+
+        with mock.patch.object(warmup, "load_snapshot", wraps=load_snapshot) as table_load:
+            self.warm_up(DIRECTORY_FILE=path, SEARCH_INDEX_ENABLED=False, TEXT_INDEX_ENABLED=False)
+
+        table_load.assert_not_called()
+        self.assertIn("snapshot", warmup.readiness()["phases"])
+        self.assertIsNotNone(get_snapshot())
+
+    def test_preload_leaves_connections_to_workers(self):
+        """
+        Test case: The launcher preloads the application, then a worker warms up.
+        Expected behavior: The preload runs every phase but the pooled connections and
+        does not make the service ready; the worker then only opens its connections.
+        """
+        with mock.patch("app.core.warmup.get_settings", return_value=make_settings()):
+            warmup.preload(app)
+
+        self.assertFalse(warmup.is_ready())
+        self.assertEqual(self.async_engine.pool.checkedin(), 0)
+        self.assertIsNotNone(get_text_index())
+
+        with mock.patch("builtins.print") as printed:
+            self.warm_up()
+
+        self.assertTrue(warmup.is_ready())
+        self.assertEqual([call.args[0].split()[2] for call in printed.call_args_list
+                          if call.args[0].startswith("Startup phase")], ["connections"])
+        self.assertEqual(self.async_engine.pool.checkedin(), 2)
+
+    def test_retries_failing_phase(self):
+        """
+        Test case: Creating the tables fails once, as when the database is not up yet.
+        Expected behavior: The error is reported while the service is not ready, and the
+        phase is retried until the warm-up completes.
+        """
+        errors = []
+        init_db = database.init_db
+
+        def failing_once():
+            if not errors:
+                errors.append(warmup.readiness())
+                raise ConnectionError("database is starting")
+            errors.append(warmup.readiness())
+            init_db()
+
+        with mock.patch.object(database, "init_db", failing_once):
+            self.warm_up(SNAPSHOT_ENABLED=False, SEARCH_INDEX_ENABLED=False, TEXT_INDEX_ENABLED=False)
+
+        self.assertEqual(errors[1]["error"], "database: database is starting")
+        self.assertFalse(errors[1]["ready"])
+        self.assertTrue(warmup.is_ready())
+        self.assertNotIn("error", warmup.readiness())
+
+    def test_health_endpoints(self):
+        """
+        Test case: The health endpoints are called before and after the warm-up.
+        Expected behavior: Liveness always answers 200; readiness answers 503 until the
+        warm-up completes and 200 afterwards.
+        """
+        client = TestClient(app)
+
+        self.assertEqual(client.get("/health/live").json(), {"status": "ok"})
+        response = client.get("/health/ready")
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.json()["ready"])
+
+        self.warm_up(SNAPSHOT_ENABLED=False, SEARCH_INDEX_ENABLED=False, TEXT_INDEX_ENABLED=False)
+
+        response = client.get("/health/ready")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("connections", response.json()["phases"])
+        self.assertEqual(client.get("/health/live").status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+def make_record(swift_code, bank_name="BANK", address="ADDRESS", country_iso2=None, country_name="COUNTRY",
+                is_headquarter=None):
+    """
+    Build a SWIFT code record as returned by the parser. The country comes from the code
+    and codes ending with XXX are headquarters unless given otherwise.
+    """
+    return {
+        "swift_code": swift_code,
+        "address": address,
+        "bank_name": bank_name,
+        "country_ISO2": country_iso2 or swift_code[4:6],
+        "country_name": country_name,
+        "is_headquarter": swift_code.endswith("XXX") if is_headquarter is None else is_headquarter
+    }
+
+
+def codes(records):
+    return [record["swift_code"] for record in records]
+
+
+def matched_codes(matches):
+    return codes(record for _, record in matches)
@@ -1,13 +1,25 @@
+import json
 import os
 import unittest
+from unittest import mock
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from dotenv import load_dotenv
 
 from main import app
-from app.db.database import get_db, Base
+from app.api.endpoints import swift_codes as swift_codes_endpoints
+from app.core.config import get_settings
+from app.core.conditional import invalidate_versions
+from app.core.response_cache import LRUResponseCache, get_response_cache, set_response_cache
+from app.core.search_index import clear_search_index, load_search_index
+from app.core.snapshot import clear_snapshot, load_snapshot
+from app.core.text_index import clear_text_index, load_text_index
+from app.db.bulk_load import bulk_load
+from app.db.database import get_async_db, get_async_read_db, Base
+from app.db.instrumentation import instrument_engine
 from app.models.swift_code import SwiftCodeModel
 
 load_dotenv()
@@ -18,6 +30,7 @@ MYSQL_HOST: str = os.getenv("MYSQL_HOST", "localhost")
 MYSQL_TEST_DATABASE: str = os.getenv("MYSQL_TEST_DATABASE", "test_swift_codes")
 
 TEST_DB_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:3307/{MYSQL_TEST_DATABASE}"
+TEST_ASYNC_DB_URL = f"mysql+aiomysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:3307/{MYSQL_TEST_DATABASE}"
 
 
 class IntegrationTests(unittest.TestCase):
@@ -38,7 +51,11 @@ class IntegrationTests(unittest.TestCase):
         """
         Set up test environment before any tests run.
 
-        Creates a database engine and session factory that will be used for all tests.
+        Creates a database engine and session factory that will be used for all tests,
+        plus an async engine for the API endpoints. The async engine does not pool
+        connections because the test client runs every request on a new event loop.
+        The async engine is instrumented like the application's, so that
+        per-request database metrics are recorded.
         Also creates all database tables needed for testing.
         """
 
@@ -49,25 +66,35 @@ class IntegrationTests(unittest.TestCase):
         cls.TestingSessionLocal = sessionmaker(
             autoflush=False, bind=cls.engine)
 
+        cls.async_engine = create_async_engine(
+            TEST_ASYNC_DB_URL,
+            poolclass=NullPool
+        )
+        cls.TestingAsyncSessionLocal = async_sessionmaker(
+            cls.async_engine, autoflush=False, expire_on_commit=False)
+        instrument_engine(cls.async_engine)
+
         Base.metadata.create_all(bind=cls.engine)
 
     def setUp(self):
         """
         Set up test environment before each test.
 
-        Creates a new database session, overrides the database dependency,
+        Creates a new database session, overrides the database dependencies,
+        clears the in-process version and response caches,
         initializes the test client, and populates the database with test data.
         """
 
         self.db = self.TestingSessionLocal()
 
-        def override_get_db():
-            try:
-                yield self.db
-            finally:
-                pass
+        async def override_get_async_db():
+            async with self.TestingAsyncSessionLocal() as db:
+                yield db
 
-        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        app.dependency_overrides[get_async_read_db] = override_get_async_db
+        invalidate_versions()
+        get_response_cache().clear()
 
         self.client = TestClient(app)
         self.setup_test_data()
@@ -207,6 +234,29 @@ class IntegrationTests(unittest.TestCase):
         self.assertEqual(response.status_code, 404)
         self.assertIn("detail", response.json())
 
+    def test_get_swift_code_by_id_lowercase(self):
+        """
+        Test retrieving SWIFT codes written in lowercase, with and without the read snapshot.
+
+        Verifies that:
+        - The code is found regardless of its case, as with the table's collation
+        - A headquarter still lists its branches
+        """
+
+        for snapshot_enabled in (False, True):
+            if snapshot_enabled:
+                load_snapshot(self.engine)
+            try:
+                response = self.client.get("/v1/swift-codes/aaaauscc123")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()["swiftCode"], "AAAAUSCC123")
+
+                response = self.client.get("/v1/swift-codes/ aaaausccxxx")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()["branches"]), 2)
+            finally:
+                clear_snapshot()
+
     def test_get_swift_code_by_country_code(self):
         """
         Test retrieving all SWIFT codes for a specific country.
@@ -226,6 +276,48 @@ class IntegrationTests(unittest.TestCase):
         self.assertEqual(data["countryName"], "UNITED STATES")
         self.assertEqual(len(data["swiftCodes"]), 3)
 
+    def test_get_swift_code_by_country_code_paginated(self):
+        """
+        Test retrieving a country's SWIFT codes page by page.
+
+        Verifies that:
+        - Each page holds at most `limit` codes, ordered by SWIFT code
+        - The X-Next-Cursor header leads to the next page
+        - The last page has no X-Next-Cursor header
+        """
+
+        first_page = self.client.get(
+            "/v1/swift-codes/country/US", params={"limit": 2})
+
+        self.assertEqual(first_page.status_code, 200)
+        self.assertEqual([code["swiftCode"] for code in first_page.json()["swiftCodes"]],
+                         ["AAAAUSCC123", "AAAAUSCC321"])
+        self.assertEqual(first_page.headers["X-Next-Cursor"], "AAAAUSCC321")
+
+        second_page = self.client.get("/v1/swift-codes/country/US", params={
+            "limit": 2, "cursor": first_page.headers["X-Next-Cursor"]})
+
+        self.assertEqual(second_page.status_code, 200)
+        self.assertEqual([code["swiftCode"] for code in second_page.json()["swiftCodes"]],
+                         ["AAAAUSCCXXX"])
+        self.assertNotIn("X-Next-Cursor", second_page.headers)
+
+    def test_get_swift_code_by_country_code_streamed(self):
+        """
+        Test retrieving a country's SWIFT codes as a streamed response.
+
+        Verifies that:
+        - The response status is 200 OK
+        - The streamed document has the same content as the regular response
+        """
+
+        regular = self.client.get("/v1/swift-codes/country/US")
+        streamed = self.client.get(
+            "/v1/swift-codes/country/US", params={"stream": "true"})
+
+        self.assertEqual(streamed.status_code, 200)
+        self.assertEqual(streamed.json(), regular.json())
+
     def test_get_swift_by_country_not_found(self):
         """
         Test retrieving SWIFT codes for a non-existent country.
@@ -401,6 +493,647 @@ class IntegrationTests(unittest.TestCase):
         self.assertEqual(response.status_code, 404)
         self.assertIn("not found", response.json()["detail"])
 
+    def test_lookup_swift_codes(self):
+        """
+        Test looking up several SWIFT codes in one request.
+
+        Verifies that:
+        - The response status is 200 OK
+        - Found codes are returned keyed by SWIFT code
+        - Codes that do not exist are listed as missing
+        - Headquarters do not include branches unless requested
+        """
+
+        response = self.client.post("/v1/swift-codes/lookup", json={
+            "swiftCodes": ["AAAAUSCCXXX", "AAAAUSCC123", "NONEXIST"]
+        })
+
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual(set(data["found"]), {"AAAAUSCCXXX", "AAAAUSCC123"})
+        self.assertEqual(data["missing"], ["NONEXIST"])
+        self.assertNotIn("branches", data["found"]["AAAAUSCCXXX"])
+
+    def test_lookup_swift_codes_with_branches(self):
+        """
+        Test looking up a headquarter with branch expansion.
+
+        Verifies that:
+        - The response status is 200 OK
+        - The headquarter includes its branches
+        - Branch records do not include a branches list
+        """
+
+        response = self.client.post("/v1/swift-codes/lookup", json={
+            "swiftCodes": ["AAAAUSCCXXX", "AAAAUSCC123"],
+            "includeBranches": True
+        })
+
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual(len(data["found"]["AAAAUSCCXXX"]["branches"]), 2)
+        self.assertNotIn("branches", data["found"]["AAAAUSCC123"])
+
+    def test_lookup_swift_codes_too_many(self):
+        """
+        Test looking up more SWIFT codes than allowed.
+
+        Verifies that:
+        - The response status is 422 Unprocessable Entity
+        """
+
+        response = self.client.post("/v1/swift-codes/lookup", json={
+            "swiftCodes": [f"AAAAUS{i:05d}" for i in range(100000)]
+        })
+
+        self.assertEqual(response.status_code, 422)
+
+    def test_get_swift_code_not_modified(self):
+        """
+        Test retrieving a SWIFT code with a matching If-None-Match header.
+
+        Verifies that:
+        - The first response carries ETag and Cache-Control headers
+        - Repeating the request with the ETag returns 304 Not Modified with an empty body
+        """
+
+        response = self.client.get("/v1/swift-codes/AAAAUSCCXXX")
+
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+        self.assertIn("Cache-Control", response.headers)
+
+        response = self.client.get("/v1/swift-codes/AAAAUSCCXXX",
+                                   headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_country_etag_changes_after_write(self):
+        """
+        Test that creating a SWIFT code changes the ETag of its country only.
+
+        Verifies that:
+        - The country listing is revalidated with 304 before the write
+        - After the write, the old ETag of the country no longer matches
+        - The ETag of another country still matches, once that country has a version of its own
+        """
+
+        self.client.post("/v1/swift-codes", json={
+            "address": "2 New St",
+            "bankName": "Other Bank Branch",
+            "countryISO2": "CA",
+            "countryName": "CANADA",
+            "isHeadquarter": False,
+            "swiftCode": "ZZYYCAWW456"
+        })
+
+        us_etag = self.client.get("/v1/swift-codes/country/US").headers["ETag"]
+        ca_etag = self.client.get("/v1/swift-codes/country/CA").headers["ETag"]
+
+        response = self.client.get("/v1/swift-codes/country/US",
+                                   headers={"If-None-Match": us_etag})
+        self.assertEqual(response.status_code, 304)
+
+        self.client.post("/v1/swift-codes", json={
+            "address": "1 New St",
+            "bankName": "New Bank",
+            "countryISO2": "US",
+            "countryName": "UNITED STATES",
+            "isHeadquarter": True,
+            "swiftCode": "NEWBUSCCXXX"
+        })
+
+        response = self.client.get("/v1/swift-codes/country/US",
+                                   headers={"If-None-Match": us_etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], us_etag)
+
+        response = self.client.get("/v1/swift-codes/country/CA",
+                                   headers={"If-None-Match": ca_etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_response_cache_invalidated_on_write(self):
+        """
+        Test that cached country and headquarter responses are invalidated by writes.
+
+        Verifies that:
+        - Repeated reads are served from the cache, with the X-Record-Version of the code
+        - After creating a branch, both the country listing and the headquarter include it
+        """
+
+        set_response_cache(LRUResponseCache(compress=True))
+        try:
+            self.client.get("/v1/swift-codes/country/US")
+            version = self.client.get("/v1/swift-codes/AAAAUSCCXXX").headers["X-Record-Version"]
+            self.client.get("/v1/swift-codes/country/US")
+            response = self.client.get("/v1/swift-codes/AAAAUSCCXXX")
+
+            self.assertEqual(response.headers["Content-Encoding"], "gzip")
+            self.assertEqual(response.headers["X-Record-Version"], version)
+            self.assertEqual(len(response.json()["branches"]), 2)
+            self.assertEqual(self.client.get("/internal/stats").json()["responseCache"]["hits"], 2)
+
+            self.client.post("/v1/swift-codes", json={
+                "address": "1 New Branch St",
+                "bankName": "Test Bank Branch 3",
+                "countryISO2": "US",
+                "countryName": "UNITED STATES",
+                "isHeadquarter": False,
+                "swiftCode": "AAAAUSCC999"
+            })
+
+            self.assertEqual(len(self.client.get(
+                "/v1/swift-codes/country/US").json()["swiftCodes"]), 4)
+            self.assertEqual(len(self.client.get(
+                "/v1/swift-codes/AAAAUSCCXXX").json()["branches"]), 3)
+        finally:
+            set_response_cache(None)
+
+    def test_bulk_create_ndjson(self):
+        """
+        Test creating many SWIFT codes from an NDJSON body.
+
+        Verifies that:
+        - Valid rows are created and can be retrieved
+        - Existing and repeated codes are reported as conflicts
+        - Malformed and invalid rows are reported as invalid with errors
+        """
+
+        rows = [
+            '{"address": "1 A St", "bankName": "New Bank", "countryISO2": "US", "countryName": "UNITED STATES", '
+            '"isHeadquarter": true, "swiftCode": "NEWBUSCCXXX"}',
+            '{"address": "2 A St", "bankName": "New Bank", "countryISO2": "US", "countryName": "UNITED STATES", '
+            '"isHeadquarter": false, "swiftCode": "NEWBUSCC001"}',
+            '{"address": "3 A St", "bankName": "Test Bank", "countryISO2": "US", "countryName": "UNITED STATES", '
+            '"isHeadquarter": false, "swiftCode": "AAAAUSCC123"}',
+            '{"address": "4 A St", "bankName": "New Bank", "countryISO2": "US", "countryName": "UNITED STATES", '
+            '"isHeadquarter": false, "swiftCode": "NEWBUSCC001"}',
+            '{"address": "5 A St", "bankName": "New Bank", "countryISO2": "PL", "countryName": "POLAND", '
+            '"isHeadquarter": false, "swiftCode": "NEWBUSCC002"}',
+            '{not json'
+        ]
+
+        response = self.client.post("/v1/swift-codes/bulk", content="\n".join(rows),
+                                    headers={"Content-Type": "application/x-ndjson"})
+
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual((data["created"], data["conflicts"], data["invalid"]), (2, 2, 2))
+        self.assertEqual([result["status"] for result in data["results"]],
+                         ["created", "created", "conflict", "conflict", "invalid", "invalid"])
+        self.assertTrue(data["results"][4]["errors"])
+
+        response = self.client.get("/v1/swift-codes/NEWBUSCCXXX")
+        self.assertEqual(len(response.json()["branches"]), 1)
+
+    def test_bulk_create_json_array(self):
+        """
+        Test creating many SWIFT codes from a JSON array body.
+
+        Verifies that:
+        - Every row is created
+        - The country listing includes the new codes
+        """
+
+        rows = [{
+            "address": f"{i} Branch St",
+            "bankName": "Other Bank",
+            "countryISO2": "CA",
+            "countryName": "CANADA",
+            "isHeadquarter": False,
+            "swiftCode": f"ZZYYCAWW{i:03d}"
+        } for i in range(200, 250)]
+
+        response = self.client.post("/v1/swift-codes/bulk", json=rows)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["created"], 50)
+
+        response = self.client.get("/v1/swift-codes/country/CA")
+        self.assertEqual(len(response.json()["swiftCodes"]), 51)
+
+    def test_bulk_create_row_limit_and_failed_batch(self):
+        """
+        Test the row limit of a bulk create and a batch that fails to commit.
+
+        Verifies that:
+        - Reading stops at BULK_MAX_ROWS with a single invalid result for the rest of the body
+        - When a batch fails, the earlier batches stay created and are reported, the rows of
+          the failed batch are reported as failed, and the status is 500
+        """
+
+        rows = [{
+            "address": f"{i} Branch St",
+            "bankName": "Other Bank",
+            "countryISO2": "CA",
+            "countryName": "CANADA",
+            "isHeadquarter": False,
+            "swiftCode": f"ZZYYCAWW{i:03d}"
+        } for i in range(200, 210)]
+
+        with mock.patch.object(get_settings(), "BULK_MAX_ROWS", 3):
+            response = self.client.post("/v1/swift-codes/bulk", json=rows)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data["created"], data["invalid"]), (3, 1))
+        self.assertEqual(len(data["results"]), 4)
+        self.assertEqual(data["results"][3]["index"], 3)
+        self.assertIn("At most 3 rows", data["results"][3]["errors"][0])
+
+        create_batch = swift_codes_endpoints._create_batch
+        calls = []
+
+        async def failing_second_batch(db, batch):
+            calls.append(batch)
+            if len(calls) == 2:
+                raise RuntimeError("connection lost")
+            return await create_batch(db, batch)
+
+        with mock.patch.object(get_settings(), "BULK_TRANSACTION_SIZE", 2), \
+                mock.patch.object(swift_codes_endpoints, "_create_batch", failing_second_batch):
+            response = self.client.post("/v1/swift-codes/bulk", json=rows[3:])
+
+        self.assertEqual(response.status_code, 500)
+        data = response.json()
+        self.assertEqual((data["created"], data["failed"]), (2, 2))
+        self.assertEqual([result["status"] for result in data["results"]], ["created", "created", "failed", "failed"])
+        self.assertIn("connection lost", data["results"][2]["errors"][0])
+        self.assertEqual(self.client.get("/v1/swift-codes/ZZYYCAWW204").status_code, 200)
+        self.assertEqual(self.client.get("/v1/swift-codes/ZZYYCAWW205").status_code, 404)
+
+    def test_bulk_create_element_size_limit(self):
+        """
+        Test a bulk create whose body holds a malformed row followed by a lot of data.
+
+        Verifies that:
+        - In a JSON array, the rows before the malformed one are created and the rest of the
+          body is reported as a single invalid result once BULK_MAX_ELEMENT_SIZE is passed
+        - In NDJSON, a line longer than BULK_MAX_ELEMENT_SIZE stops reading the same way
+        """
+
+        row = {
+            "address": "1 Branch St",
+            "bankName": "Other Bank",
+            "countryISO2": "CA",
+            "countryName": "CANADA",
+            "isHeadquarter": False,
+            "swiftCode": "ZZYYCAWW301"
+        }
+        body = "[" + json.dumps(row) + ', {"address": "' + "x" * 5000 + ", " + json.dumps(row) + "]"
+
+        with mock.patch.object(get_settings(), "BULK_MAX_ELEMENT_SIZE", 1000):
+            response = self.client.post("/v1/swift-codes/bulk", content=body,
+                                        headers={"Content-Type": "application/json"})
+
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertEqual((data["created"], data["invalid"]), (1, 1))
+            self.assertIn("longer than 1000 characters", data["results"][1]["errors"][0])
+
+            row["swiftCode"] = "ZZYYCAWW302"
+            body = json.dumps(row) + "\n" + "x" * 5000
+            response = self.client.post("/v1/swift-codes/bulk", content=body,
+                                        headers={"Content-Type": "application/x-ndjson"})
+
+            data = response.json()
+            self.assertEqual((data["created"], data["invalid"]), (1, 1))
+            self.assertIn("longer than 1000 bytes", data["results"][1]["errors"][0])
+
+    def test_delete_swift_codes(self):
+        """
+        Test deleting a list of SWIFT codes in one request.
+
+        Verifies that:
+        - Existing codes are deleted and counted
+        - Unknown codes are reported as missing
+        - Deleted codes can no longer be retrieved
+        """
+
+        response = self.client.post("/v1/swift-codes/delete", json={
+            "swiftCodes": ["AAAAUSCC123", "ZZYYCAWW123", "NONEXISTXXX"]
+        })
+
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual(data["deleted"], 2)
+        self.assertEqual(data["swiftCodes"], ["AAAAUSCC123", "ZZYYCAWW123"])
+        self.assertEqual(data["missing"], ["NONEXISTXXX"])
+
+        self.assertEqual(self.client.get("/v1/swift-codes/AAAAUSCC123").status_code, 404)
+        self.assertEqual(len(self.client.get("/v1/swift-codes/AAAAUSCCXXX").json()["branches"]), 1)
+
+    def test_delete_bank(self):
+        """
+        Test deleting a whole bank by its 8-character prefix.
+
+        Verifies that:
+        - A bank with branches is not deleted without cascade (409 Conflict),
+          and no DELETE statement is issued for it
+        - With cascade, the headquarter and all branches are deleted
+        - An unknown bank returns 404 Not Found
+        """
+
+        statements = []
+
+        def record_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(self.async_engine.sync_engine, "before_cursor_execute", record_statement)
+        try:
+            response = self.client.delete("/v1/swift-codes/bank/AAAAUSCC")
+        finally:
+            event.remove(self.async_engine.sync_engine, "before_cursor_execute", record_statement)
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse([statement for statement in statements if statement.lstrip().upper().startswith("DELETE")])
+        self.assertEqual(self.client.get("/v1/swift-codes/AAAAUSCCXXX").status_code, 200)
+
+        response = self.client.delete("/v1/swift-codes/bank/AAAAUSCC?cascade=true")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["deleted"], 3)
+
+        response = self.client.get("/v1/swift-codes/country/US")
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.delete("/v1/swift-codes/bank/AAAAUSCC")
+        self.assertEqual(response.status_code, 404)
+
+    def test_upsert_swift_code(self):
+        """
+        Test creating and replacing a SWIFT code with PUT.
+
+        Verifies that:
+        - PUT creates a missing code and replaces an existing one
+        - A path that does not match the body is rejected (422)
+        """
+
+        payload = {
+            "address": "1 New St",
+            "bankName": "New Bank",
+            "countryISO2": "US",
+            "countryName": "UNITED STATES",
+            "isHeadquarter": True,
+            "swiftCode": "NEWBUSCCXXX"
+        }
+
+        response = self.client.put("/v1/swift-codes/NEWBUSCCXXX", json=payload)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.put("/v1/swift-codes/NEWBUSCCXXX", json={**payload, "address": "2 New St"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get("/v1/swift-codes/NEWBUSCCXXX").json()["address"], "2 New St")
+
+        response = self.client.put("/v1/swift-codes/OTHRUSCCXXX", json=payload)
+        self.assertEqual(response.status_code, 422)
+
+    def test_upsert_swift_code_if_match(self):
+        """
+        Test PUT with an If-Match precondition.
+
+        Verifies that:
+        - GET sends the version of the code in X-Record-Version, and it allows the write
+        - A write to another code of the same country does not invalidate it
+        - The same version is rejected after the write changed the code (412)
+        - The country ETag is not accepted as a record version (412)
+        - `If-Match: *` is rejected for a code that does not exist (412)
+        """
+
+        response = self.client.get("/v1/swift-codes/AAAAUSCC123")
+        version, etag = response.headers["X-Record-Version"], response.headers["ETag"]
+        payload = {
+            "address": "456 Branch Ave, Floor 2",
+            "bankName": "Test Bank Branch 1",
+            "countryISO2": "US",
+            "countryName": "UNITED STATES",
+            "isHeadquarter": False,
+            "swiftCode": "AAAAUSCC123"
+        }
+
+        response = self.client.put("/v1/swift-codes/AAAAUSCC999", json={**payload, "swiftCode": "AAAAUSCC999"})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(self.client.get("/v1/swift-codes/AAAAUSCC123").headers["ETag"], etag)
+
+        response = self.client.put("/v1/swift-codes/AAAAUSCC123", json=payload,
+                                   headers={"If-Match": version})
+        self.assertEqual(response.status_code, 200)
+        new_version = response.headers["X-Record-Version"]
+        self.assertNotEqual(new_version, version)
+        self.assertEqual(self.client.get("/v1/swift-codes/AAAAUSCC123").headers["X-Record-Version"], new_version)
+
+        response = self.client.put("/v1/swift-codes/AAAAUSCC123", json=payload,
+                                   headers={"If-Match": version})
+        self.assertEqual(response.status_code, 412)
+
+        etag = self.client.get("/v1/swift-codes/AAAAUSCC123").headers["ETag"]
+        response = self.client.put("/v1/swift-codes/AAAAUSCC123", json=payload,
+                                   headers={"If-Match": etag})
+        self.assertEqual(response.status_code, 412)
+
+        response = self.client.put("/v1/swift-codes/AAAAUSCC998", json={**payload, "swiftCode": "AAAAUSCC998"},
+                                   headers={"If-Match": "*"})
+        self.assertEqual(response.status_code, 412)
+
+    def test_metrics_endpoint(self):
+        """
+        Test the Prometheus metrics endpoint.
+
+        Verifies that:
+        - Requests are counted per route template and status code
+        - The SQL statements executed by a request are attributed to its route
+        - Unmatched paths are grouped under a single label
+        """
+
+        def sample(text, line_prefix):
+            for line in text.splitlines():
+                if line.startswith(line_prefix + " "):
+                    return float(line.rsplit(" ", 1)[1])
+            return 0.0
+
+        labels = 'method="GET",route="/v1/swift-codes/{swift_code}"'
+        before = self.client.get("/metrics").text
+
+        self.client.get("/v1/swift-codes/AAAAUSCCXXX")
+        self.client.get("/v1/swift-codes/ZZZZZZZZZZZ")
+        self.client.get("/no-such-path")
+
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain; version=0.0.4"))
+
+        after = response.text
+        for line_prefix, increase in [
+            (f'http_requests_total{{{labels},status="200"}}', 1),
+            (f'http_requests_total{{{labels},status="404"}}', 1),
+            ('http_requests_total{method="GET",route="unmatched",status="404"}', 1),
+            (f"http_request_duration_seconds_count{{{labels}}}", 2),
+        ]:
+            self.assertEqual(sample(after, line_prefix) - sample(before, line_prefix), increase)
+
+        statements = f"http_request_db_statements_sum{{{labels}}}"
+        self.assertGreater(sample(after, statements), sample(before, statements))
+        self.assertIn("# TYPE swift_codes_response_cache gauge", after)
+
+
+    def test_search_swift_codes(self):
+        """
+        Test the prefix search endpoint without the search index.
+
+        Verifies that:
+        - Codes starting with the prefix are returned in code order, case-insensitively
+        - The limit, country and headquarter filters are applied
+        - A prefix without matches returns an empty list
+        """
+
+        response = self.client.get("/v1/swift-codes/search?prefix=aaaa")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["prefix"], "AAAA")
+        self.assertEqual([code["swiftCode"] for code in response.json()["swiftCodes"]],
+                         ["AAAAUSCC123", "AAAAUSCC321", "AAAAUSCCXXX"])
+
+        response = self.client.get("/v1/swift-codes/search?prefix=AAAAUSCC&limit=1")
+        self.assertEqual([code["swiftCode"] for code in response.json()["swiftCodes"]], ["AAAAUSCC123"])
+
+        response = self.client.get("/v1/swift-codes/search?prefix=A&headquarter=true&country=us")
+        self.assertEqual([code["swiftCode"] for code in response.json()["swiftCodes"]], ["AAAAUSCCXXX"])
+        self.assertEqual(response.json()["swiftCodes"][0]["bankName"], "Test Bank")
+
+        response = self.client.get("/v1/swift-codes/search?prefix=ZZYY&country=US")
+        self.assertEqual(response.json()["swiftCodes"], [])
+
+        self.assertEqual(self.client.get("/v1/swift-codes/search?prefix=").status_code, 422)
+
+    def test_search_index_updated_on_write(self):
+        """
+        Test the prefix search endpoint with the in-memory search index.
+
+        Verifies that:
+        - The index built from the table returns the same results as the database
+        - Created codes are found and deleted codes are not, without rebuilding the index
+        """
+
+        load_search_index(self.engine)
+        try:
+            response = self.client.get("/v1/swift-codes/search?prefix=AAAA&headquarter=false")
+            self.assertEqual([code["swiftCode"] for code in response.json()["swiftCodes"]],
+                             ["AAAAUSCC123", "AAAAUSCC321"])
+
+            self.client.post("/v1/swift-codes", json={
+                "address": "1 New Branch St",
+                "bankName": "Test Bank Branch 3",
+                "countryISO2": "US",
+                "countryName": "UNITED STATES",
+                "isHeadquarter": False,
+                "swiftCode": "AAAAUSCC200"
+            })
+            self.client.delete("/v1/swift-codes/AAAAUSCC123")
+
+            response = self.client.get("/v1/swift-codes/search?prefix=AAAA&headquarter=false")
+            self.assertEqual([code["swiftCode"] for code in response.json()["swiftCodes"]],
+                             ["AAAAUSCC200", "AAAAUSCC321"])
+        finally:
+            clear_search_index()
+
+    def test_snapshot_and_search_index_follow_other_writers(self):
+        """
+        Test the read snapshot and the search index when another process loads rows.
+
+        Verifies that:
+        - A branch added by a loader is found by code, listed under its headquarter and
+          returned by prefix searches, once the dataset versions show the load
+        - A code created through the API afterwards is served as well
+        """
+
+        load_snapshot(self.engine)
+        load_search_index(self.engine)
+        try:
+            self.assertEqual(self.client.get("/v1/swift-codes/AAAAUSCC001").status_code, 404)
+            self.assertEqual(len(self.client.get("/v1/swift-codes/AAAAUSCCXXX").json()["branches"]), 2)
+
+            bulk_load(self.engine, [{
+                "swift_code": "AAAAUSCC001", "address": "1 Loader St", "bank_name": "Test Bank Branch 0",
+                "country_ISO2": "US", "country_name": "UNITED STATES", "is_headquarter": False}])
+            invalidate_versions()
+
+            response = self.client.get("/v1/swift-codes/AAAAUSCC001")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["address"], "1 Loader St")
+            self.assertEqual([branch["swiftCode"] for branch in
+                              self.client.get("/v1/swift-codes/AAAAUSCCXXX").json()["branches"]],
+                             ["AAAAUSCC001", "AAAAUSCC123", "AAAAUSCC321"])
+            response = self.client.get("/v1/swift-codes/search?prefix=AAAAUSCC0")
+            self.assertEqual([code["swiftCode"] for code in response.json()["swiftCodes"]], ["AAAAUSCC001"])
+
+            self.client.post("/v1/swift-codes", json={
+                "address": "1 New Branch St",
+                "bankName": "Test Bank Branch 3",
+                "countryISO2": "US",
+                "countryName": "UNITED STATES",
+                "isHeadquarter": False,
+                "swiftCode": "AAAAUSCC002"
+            })
+            response = self.client.post("/v1/swift-codes/lookup", json={"swiftCodes": ["AAAAUSCC001", "AAAAUSCC002"]})
+            self.assertEqual(response.json()["missing"], [])
+            response = self.client.get("/v1/swift-codes/search?prefix=AAAAUSCC0")
+            self.assertEqual([code["swiftCode"] for code in response.json()["swiftCodes"]],
+                             ["AAAAUSCC001", "AAAAUSCC002"])
+        finally:
+            clear_snapshot()
+            clear_search_index()
+
+    def test_text_search(self):
+        """
+        Test the bank name and address text search endpoint.
+
+        Verifies that:
+        - The response status is 503 while the text index is not loaded
+        - Misspelled words match, and exact matches rank above partial ones
+        - The search can be restricted to the address
+        - Codes created through the API and rows added by a loader are found
+        """
+
+        self.assertEqual(self.client.get("/v1/swift-codes/search/text?q=bank").status_code, 503)
+
+        load_text_index(self.engine)
+        try:
+            response = self.client.get("/v1/swift-codes/search/text?q=tesst bank branch&limit=2")
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertEqual(data["query"], "tesst bank branch")
+            self.assertEqual([code["swiftCode"] for code in data["swiftCodes"]], ["AAAAUSCC123", "AAAAUSCC321"])
+            self.assertTrue(0.8 < data["swiftCodes"][0]["score"] < 1.0)
+            self.assertEqual(data["swiftCodes"][0]["bankName"], "Test Bank Branch 1")
+
+            response = self.client.get("/v1/swift-codes/search/text?q=other&field=address")
+            self.assertEqual([code["swiftCode"] for code in response.json()["swiftCodes"]], ["ZZYYCAWW123"])
+            response = self.client.get("/v1/swift-codes/search/text?q=branch&field=address")
+            self.assertEqual([code["swiftCode"] for code in response.json()["swiftCodes"]],
+                             ["AAAAUSCC123", "AAAAUSCC321"])
+
+            self.client.post("/v1/swift-codes", json={
+                "address": "1 Harbour Road",
+                "bankName": "Northern Savings Bank",
+                "countryISO2": "US",
+                "countryName": "UNITED STATES",
+                "isHeadquarter": True,
+                "swiftCode": "NNNNUSNYXXX"
+            })
+            bulk_load(self.engine, [{
+                "swift_code": "PPPPPLPWXXX", "address": "UL. MARSZALKOWSKA 1", "bank_name": "POLISH SAVINGS BANK",
+                "country_ISO2": "PL", "country_name": "POLAND", "is_headquarter": True}])
+            invalidate_versions()
+
+            response = self.client.get("/v1/swift-codes/search/text?q=savings")
+            self.assertEqual(sorted(code["swiftCode"] for code in response.json()["swiftCodes"]),
+                             ["NNNNUSNYXXX", "PPPPPLPWXXX"])
+            self.assertEqual(self.client.get("/v1/swift-codes/search/text?q=xyzzy").json()["swiftCodes"], [])
+        finally:
+            clear_text_index()
 
 if __name__ == "__main__":
     unittest.main()